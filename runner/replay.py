@@ -0,0 +1,282 @@
+"""
+기록된 요청(JSONL)을 로컬 서버에 재현하여 endpoint 별 응답시간과 쿼리 수를 측정합니다.
+
+JSONL 한 줄의 형식은 아래와 같으며, 서버의 REQUEST_CAPTURE_PATH 로 실제 요청을 같은 형식으로 기록할 수 있습니다.
+
+    {"method": "POST", "path": "/core/batch/", "headers": {"X-Current-Menu": "..."}, "body": [...]}
+
+서버의 QUERY_COUNT_HEADER 를 켜면 응답 헤더(X-Query-Count, X-Route)로 endpoint 별 쿼리 수를 집계합니다.
+
+사용 예:
+    # 측정 후 결과 저장
+    python runner/replay.py run --file runner/requests.jsonl --concurrency 8 --repeat 10 --output base.json
+    # 두 측정 결과 비교 (p95 가 10% 이상 느려지거나 쿼리 수가 늘면 regression 으로 표시, exit code 1)
+    python runner/replay.py compare base.json new.json --threshold 0.1
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+def load_requests(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values: List[float], p: float) -> Optional[float]:
+    """
+    nearest-rank 방식의 백분위수를 반환합니다.
+    """
+    if not values:
+        return None
+
+    values = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(values)))
+    return values[rank - 1]
+
+
+def send(base_url: str, record: Dict[str, Any], headers: Dict[str, str], timeout: float):
+    """
+    요청을 전송하고 (endpoint, 상태 코드, 소요시간(ms), 쿼리 수)를 반환합니다.
+    """
+
+    method = record.get("method", "GET").upper()
+    body = record.get("body")
+
+    request_headers = dict(record.get("headers") or {})
+    request_headers.update(headers)
+
+    # 같은 Idempotency-Key 를 다시 보내면 저장된 응답이 반환되므로, 요청마다 새로운 key 를 사용합니다.
+    for header in list(request_headers):
+        if header.lower() == IDEMPOTENCY_KEY_HEADER.lower():
+            request_headers[header] = str(uuid.uuid4())
+
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode()
+        request_headers["Content-Type"] = "application/json"
+
+    request = urllib.request.Request(
+        base_url.rstrip("/") + record["path"],
+        data=data,
+        headers=request_headers,
+        method=method,
+    )
+
+    started_at = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            status_code, response_headers = response.status, response.headers
+    except urllib.error.HTTPError as e:
+        e.read()
+        status_code, response_headers = e.code, e.headers
+    except (urllib.error.URLError, OSError):
+        status_code, response_headers = 0, {}
+    elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+    # 서버가 알려준 URL 패턴(X-Route)으로 endpoint 를 구분합니다.
+    route = response_headers.get("X-Route")
+    endpoint = "{} {}".format(
+        method, "/" + route if route is not None else record["path"].split("?")[0]
+    )
+
+    query_count = response_headers.get("X-Query-Count")
+    return (
+        record.get("name") or endpoint,
+        status_code,
+        elapsed_ms,
+        int(query_count) if query_count is not None else None,
+    )
+
+
+def summarize(elapsed: List[float], query_counts: List[int], errors: int) -> Dict[str, Any]:
+    return {
+        "count": len(elapsed),
+        "errors": errors,
+        "mean": round(sum(elapsed) / len(elapsed), 3) if elapsed else None,
+        "p50": percentile(elapsed, 50),
+        "p95": percentile(elapsed, 95),
+        "p99": percentile(elapsed, 99),
+        "queries": (
+            round(sum(query_counts) / len(query_counts), 2) if query_counts else None
+        ),
+    }
+
+
+def run(args) -> int:
+    records = load_requests(args.file) * args.repeat
+    headers = dict(header.split(":", 1) for header in args.header)
+    headers = {key.strip(): value.strip() for key, value in headers.items()}
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+
+        def send_all(records: List[Dict[str, Any]]) -> list:
+            return list(
+                executor.map(
+                    lambda record: send(args.base_url, record, headers, args.timeout),
+                    records,
+                )
+            )
+
+        # warmup 요청을 먼저 수행하고, 이후의 요청만으로 응답시간과 처리량을 측정합니다.
+        send_all(records[: args.warmup])
+
+        started_at = time.perf_counter()
+        results = send_all(records[args.warmup :])
+        elapsed_seconds = time.perf_counter() - started_at
+
+    elapsed_by_endpoint = defaultdict(list)
+    query_counts_by_endpoint = defaultdict(list)
+    errors_by_endpoint = defaultdict(int)
+    for endpoint, status_code, elapsed_ms, query_count in results:
+        elapsed_by_endpoint[endpoint].append(elapsed_ms)
+        if query_count is not None:
+            query_counts_by_endpoint[endpoint].append(query_count)
+        if not 200 <= status_code < 400:
+            errors_by_endpoint[endpoint] += 1
+
+    report = {
+        "concurrency": args.concurrency,
+        "elapsed_seconds": round(elapsed_seconds, 3),
+        "throughput": round(len(results) / elapsed_seconds, 2) if elapsed_seconds else None,
+        "total": summarize(
+            [elapsed_ms for _, _, elapsed_ms, _ in results],
+            [query_count for *_, query_count in results if query_count is not None],
+            sum(errors_by_endpoint.values()),
+        ),
+        "endpoints": {
+            endpoint: summarize(
+                elapsed_by_endpoint[endpoint],
+                query_counts_by_endpoint[endpoint],
+                errors_by_endpoint[endpoint],
+            )
+            for endpoint in sorted(elapsed_by_endpoint)
+        },
+    }
+
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return 0
+
+
+def format_value(value) -> str:
+    return "-" if value is None else f"{value:.2f}" if isinstance(value, float) else str(value)
+
+
+def print_report(report: Dict[str, Any]):
+    print(
+        f"{report['total']['count']} requests in {report['elapsed_seconds']}s "
+        f"({report['throughput']} req/s, concurrency {report['concurrency']})"
+    )
+
+    columns = ("count", "errors", "p50", "p95", "p99", "queries")
+    print("\t".join(("endpoint",) + columns))
+    for endpoint, stats in list(report["endpoints"].items()) + [("TOTAL", report["total"])]:
+        print("\t".join([endpoint] + [format_value(stats[column]) for column in columns]))
+
+
+def compare(args) -> int:
+    """
+    두 측정 결과의 endpoint 별 p50/p95/p99, 쿼리 수를 비교합니다. regression 이 있으면 1 을 반환합니다.
+    """
+
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    regressions = []
+    print("\t".join(("endpoint", "metric", "base", "new", "change")))
+    for endpoint in sorted(set(base["endpoints"]) | set(new["endpoints"])):
+        base_stats = base["endpoints"].get(endpoint)
+        new_stats = new["endpoints"].get(endpoint)
+        if base_stats is None or new_stats is None:
+            print(f"{endpoint}\t-\t-\t-\t{'added' if base_stats is None else 'removed'}")
+            continue
+
+        for metric in ("p50", "p95", "p99", "queries"):
+            base_value, new_value = base_stats[metric], new_stats[metric]
+            if base_value is None or new_value is None:
+                continue
+
+            change = (new_value - base_value) / base_value if base_value else 0.0
+            is_regression = (
+                new_value > base_value
+                if metric == "queries"
+                else metric == args.metric and change > args.threshold
+            )
+            if is_regression:
+                regressions.append((endpoint, metric))
+
+            print(
+                "\t".join(
+                    (
+                        endpoint,
+                        metric,
+                        format_value(base_value),
+                        format_value(new_value),
+                        f"{change:+.1%}" + (" REGRESSION" if is_regression else ""),
+                    )
+                )
+            )
+
+    if regressions:
+        print(f"{len(regressions)} regressions found.", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="JSONL 의 요청을 재현하여 측정합니다.")
+    run_parser.add_argument("--file", default="runner/requests.jsonl")
+    run_parser.add_argument("--base-url", default="http://localhost:8000")
+    run_parser.add_argument("--concurrency", type=int, default=1)
+    run_parser.add_argument("--repeat", type=int, default=1, help="전체 요청 반복 횟수")
+    run_parser.add_argument(
+        "--warmup", type=int, default=0, help="먼저 수행하고 집계에서 제외할 앞쪽 요청 수"
+    )
+    run_parser.add_argument("--timeout", type=float, default=30.0)
+    run_parser.add_argument(
+        "--header",
+        action="append",
+        default=[],
+        help='모든 요청에 추가할 헤더 (예: --header "Authorization: JWT <token>")',
+    )
+    run_parser.add_argument("--output", help="측정 결과를 저장할 JSON 파일 경로")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser("compare", help="두 측정 결과를 비교합니다.")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--metric", default="p95", choices=("p50", "p95", "p99"))
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="regression 으로 판단할 증가율"
+    )
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,8 +14,9 @@ import datetime
 import os
 
 from pathlib import Path
+from corsheaders.defaults import default_headers
 from environ import Env
-from typing import List
+from typing import Dict, List, Tuple
 
 env = Env()
 
@@ -82,6 +83,9 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "core.middleware.PatchHttpMethodMiddleware",
+    "core.middleware.ReplicaPinningMiddleware",
+    "core.middleware.QueryCountMiddleware",
+    "core.middleware.RequestCaptureMiddleware",
 ]
 
 ROOT_URLCONF = "backend.urls"
@@ -113,6 +117,12 @@ DATABASES = {
     "default": env.db(default=f"sqlite:///{BASE_DIR / '..' / 'db.sqlite3'}"),
 }
 
+# connection 을 유지할 시간(초). SQLite 에서는 connection 생성 시의 ATTACH/PRAGMA 를 요청마다 반복하지 않도록
+# 기본값을 60초로 하며, 그 외의 DB 는 Django 기본값(0, 요청마다 connection 생성)을 따릅니다.
+DATABASES["default"]["CONN_MAX_AGE"] = env.int(
+    "CONN_MAX_AGE", 60 if "sqlite3" in DATABASES["default"]["ENGINE"] else 0
+)
+
 # DATABASE_NAMES 환경변수 리스트에 지정된 이름에 대해서
 # default 데이터베이스 설정을 복제하여 NAME만 변경하여 적용토록 합니다.
 DATABASE_NAMES: List[str] = env.list("DATABASE_NAMES", default=[])
@@ -148,6 +158,156 @@ if DB_MULTI_JOIN:
 else:
     UNIQUE_DB_ENGINE = None
 
+# SQLite connection 생성 시 main 과 ATTACH 된 DB 에 적용할 PRAGMA (빈 문자열이면 적용하지 않습니다.)
+SQLITE_PRAGMAS = {
+    "journal_mode": env.str("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": env.str("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": env.str("SQLITE_CACHE_SIZE", "-64000"),
+    "mmap_size": env.str("SQLITE_MMAP_SIZE", "268435456"),
+    "temp_store": env.str("SQLITE_TEMP_STORE", "MEMORY"),
+    "busy_timeout": env.str("SQLITE_BUSY_TIMEOUT", "5000"),
+}
+
+# 캐시 설정 (예: memcached://127.0.0.1:11211) 지정하지 않으면 프로세스 메모리(locmem)를 사용합니다.
+CACHES = {"default": env.cache_url("CACHE_URL", default="locmemcache://")}
+
+# 읽기 전용 복제(Replica) DB 설정
+# DATABASE_REPLICA_URLS 의 각 URL 은 위의 DB 들을 같은 이름으로 복제하고 있는 서버를 가리킵니다.
+# (URL 의 NAME 은 사용하지 않습니다.) 각 DB alias 마다 "{db_alias}_replica{n}" alias 가 추가되며,
+# 조회(db_for_read) 시에 DATABASE_REPLICA_WEIGHTS 의 가중치에 따라 Replica 를 선택합니다.
+DATABASE_REPLICA_URLS: List[str] = env.list("DATABASE_REPLICA_URLS", default=[])
+DATABASE_REPLICA_WEIGHTS: List[int] = env.list(
+    "DATABASE_REPLICA_WEIGHTS", cast=int, default=[]
+)
+
+# primary db alias 별 (replica db alias, 가중치) 목록
+DATABASE_REPLICAS: Dict[str, List[Tuple[str, int]]] = {}
+PRIMARY_DB_ALIASES: List[str] = list(DATABASES)
+
+for replica_index, replica_url in enumerate(DATABASE_REPLICA_URLS, start=1):
+    replica_url_config = env.db_url_config(replica_url)
+    replica_weight = (
+        DATABASE_REPLICA_WEIGHTS[replica_index - 1]
+        if replica_index <= len(DATABASE_REPLICA_WEIGHTS)
+        else 1
+    )
+
+    for db_alias in PRIMARY_DB_ALIASES:
+        db_settings = DATABASES[db_alias]
+        replica_db_alias = f"{db_alias}_replica{replica_index}"
+        DATABASES[replica_db_alias] = dict(
+            db_settings,
+            **{
+                key: replica_url_config[key]
+                for key in ("ENGINE", "HOST", "PORT", "USER", "PASSWORD")
+                if key in replica_url_config
+            },
+            # 테스트 시에는 Replica 대신 primary DB 를 사용합니다.
+            TEST={"MIRROR": db_alias},
+        )
+        DATABASE_REPLICAS.setdefault(db_alias, []).append(
+            (replica_db_alias, replica_weight)
+        )
+
+REPLICA_DB_ALIASES: List[str] = [
+    replica_db_alias
+    for replicas in DATABASE_REPLICAS.values()
+    for replica_db_alias, _ in replicas
+]
+
+# 쓰기가 발생한 클라이언트는 아래 시간(초) 동안 Replica 대신 primary DB 에서 조회합니다. (read-your-writes)
+DATABASE_REPLICA_PIN_SECONDS = env.int("DATABASE_REPLICA_PIN_SECONDS", 5)
+DATABASE_REPLICA_PIN_COOKIE_NAME = "db_primary_pinned_until"
+
+# 쿼리 수행 중 접속 오류가 발생한 Replica 를 조회 대상에서 제외하는 시간(초)
+DATABASE_REPLICA_HEALTH_CHECK_INTERVAL = env.int(
+    "DATABASE_REPLICA_HEALTH_CHECK_INTERVAL", 10
+)
+
+# 멀티 DB JOIN 시 테이블명에 DB명을 붙이는 방식
+#  - regex : 생성된 SQL 문자열에서 테이블명을 치환합니다.
+#  - compiler : SQL Compiler 가 쿼리를 생성하는 시점에 테이블명에 DB명을 붙입니다.
+DB_MULTI_JOIN_MODE = env.str("DB_MULTI_JOIN_MODE", "regex")
+assert DB_MULTI_JOIN_MODE in (
+    "regex",
+    "compiler",
+), "DB_MULTI_JOIN_MODE 는 regex 또는 compiler 만 지정할 수 있습니다."
+
+# 프로세스 시작 시 DB 조회 대신 읽어들일 테이블 스냅샷 파일 경로
+# `python manage.py dump_db_schema_snapshot` 명령으로 생성합니다. 빈 문자열이면 사용하지 않습니다.
+DB_SCHEMA_SNAPSHOT_PATH = env.str(
+    "DB_SCHEMA_SNAPSHOT_PATH", str(BASE_DIR / ".." / "db_schema_snapshot.json")
+)
+
+# 스냅샷이 없을 때 DB 조회(introspection)를 동시에 수행할 최대 스레드 수와 전체 조회의 제한 시간(초)
+DB_INTROSPECTION_MAX_WORKERS = env.int("DB_INTROSPECTION_MAX_WORKERS", 8)
+DB_INTROSPECTION_TIMEOUT = env.float("DB_INTROSPECTION_TIMEOUT", 30.0)
+
+# CoreMixin.cross_db_prefetch_fields 로 다른 DB 의 FK 객체를 조회할 때 한 번에 조회할 최대 개수
+CROSS_DB_PREFETCH_CHUNK_SIZE = env.int("CROSS_DB_PREFETCH_CHUNK_SIZE", 500)
+
+# DATABASE_NAMES 의 DB 들에 같은 쿼리를 동시에 수행(fan_out)할 때의 최대 스레드 수
+FAN_OUT_MAX_WORKERS = env.int("FAN_OUT_MAX_WORKERS", 8)
+
+# CoreMixin 리스트 조회 시 cursor 페이지네이션(?cursor=)의 기본 page_size
+CURSOR_PAGE_SIZE = env.int("CURSOR_PAGE_SIZE", 100)
+
+# CoreMixin 리스트 조회 시 CoreHyperlinkedSerializer 를 compile 된 plan 으로 직렬화할지 여부 (core.read_plan)
+SERIALIZER_COMPILED_READ = env.bool("SERIALIZER_COMPILED_READ", True)
+
+# compile 된 직렬화 plan(core.read_plan)과 관계 객체 조회 계획(core.related_plan)을
+# (serializer, ?fields= 필드 구성)별로 각각 캐싱할 최대 개수 (0 이면 캐싱하지 않습니다.)
+READ_PLAN_CACHE_SIZE = env.int("READ_PLAN_CACHE_SIZE", 256)
+
+# 리스트 조회를 스트리밍(?stream=json|ndjson)할 때 한 번에 조회/직렬화할 행 수
+LIST_STREAM_CHUNK_SIZE = env.int("LIST_STREAM_CHUNK_SIZE", 2000)
+
+# 리스트 조회 시 (모델, 조건)별 count 를 캐싱할 시간(초). 0 이면 캐싱하지 않습니다.
+# 테이블에 쓰기가 발생하면 해당 테이블의 count 는 모두 무효화됩니다.
+COUNT_CACHE_TIMEOUT = env.int("COUNT_CACHE_TIMEOUT", 60)
+
+# count 를 캐싱할 CACHES alias (여러 프로세스로 구동 시 무효화가 공유되도록 공용 캐시를 지정해주세요.)
+COUNT_CACHE_ALIAS = env.str("COUNT_CACHE_ALIAS", "default")
+
+# DB 통계(MySQL information_schema/EXPLAIN, SQLite sqlite_stat1)로 추정한 행 수가 이 값 이상이면
+# 정확한 count 대신 추정값을 응답합니다. (count_estimated: true) 0 이면 추정하지 않습니다.
+COUNT_ESTIMATE_THRESHOLD = env.int("COUNT_ESTIMATE_THRESHOLD", 0)
+
+# batch 의 조회성 요청(GET)들을 동시에 수행할 때의 최대 스레드 수
+BATCH_READ_MAX_WORKERS = env.int("BATCH_READ_MAX_WORKERS", 8)
+
+# ASGI 배포의 async batch(core/batch/async/)에서 조회성 요청을 수행할 프로세스 공용 스레드 풀 크기
+# (스레드마다 DB connection 을 하나씩 사용하므로 DB 의 최대 connection 수를 고려해야 합니다.)
+BATCH_ASYNC_MAX_WORKERS = env.int("BATCH_ASYNC_MAX_WORKERS", 8)
+
+# batch 의 연속된 쓰기 요청을 bulk_create/bulk_update 로 저장할 때 한 번에 저장할 최대 개수
+BATCH_BULK_WRITE_CHUNK_SIZE = env.int("BATCH_BULK_WRITE_CHUNK_SIZE", 500)
+
+# 응답 헤더에 쿼리 수(X-Query-Count)와 URL 패턴(X-Route)을 추가할지 여부 (runner/replay.py 부하 측정용)
+QUERY_COUNT_HEADER = env.bool("QUERY_COUNT_HEADER", False)
+
+# 요청을 runner/replay.py 에서 재현할 수 있는 JSONL 형식으로 기록할 파일 경로 (빈 값이면 기록하지 않음)
+REQUEST_CAPTURE_PATH = env.str("REQUEST_CAPTURE_PATH", "")
+
+# Idempotency-Key 헤더로 요청된 쓰기 요청의 응답 저장소
+IDEMPOTENCY_STORE = env.str(
+    "IDEMPOTENCY_STORE", "core.idempotency.DatabaseIdempotencyStore"
+)
+
+# Idempotency-Key 로 저장된 응답의 보관 시간(초)
+IDEMPOTENCY_KEY_EXPIRE_SECONDS = env.int("IDEMPOTENCY_KEY_EXPIRE_SECONDS", 60 * 60 * 24)
+
+# 같은 Idempotency-Key 의 요청이 처리 중일 때, 처리가 끝나기를 기다리는 최대 시간(초)
+IDEMPOTENCY_WAIT_TIMEOUT = env.float("IDEMPOTENCY_WAIT_TIMEOUT", 30.0)
+
+# 처리 중인 Idempotency-Key 의 점유 시간(초). 처리 중에 프로세스가 종료되어도 이 시간이 지나면 재시도 요청이 key 를 이어받습니다.
+IDEMPOTENCY_LEASE_SECONDS = env.float(
+    "IDEMPOTENCY_LEASE_SECONDS", IDEMPOTENCY_WAIT_TIMEOUT + 30.0
+)
+
+# patch_sql 에서 치환한 SQL 문을 캐싱할 최대 개수 (0 이면 캐싱하지 않습니다.)
+PATCH_SQL_CACHE_SIZE = env.int("PATCH_SQL_CACHE_SIZE", 1024)
+
 # Database Router
 DATABASE_ROUTERS = [
     "core.routers.Router",
@@ -219,9 +379,8 @@ REST_FRAMEWORK = {
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
     ],
-    # FIXME: Pagination
-    # "DEFAULT_PAGINATION_CLASS": "core.pagination.PageNumberPagination",
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    # 전체 개수를 캐싱된 count 나 DB 통계의 추정값으로 구합니다. (COUNT_CACHE_TIMEOUT, COUNT_ESTIMATE_THRESHOLD)
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.PageNumberPagination",
     # FIXME: Renderer
     # "DEFAULT_RENDERER_CLASSES": ["core.renderers.JSONRenderer"],
     "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
@@ -230,6 +389,7 @@ REST_FRAMEWORK = {
     # "EXCEPTION_HANDLER": "core.views.custom_exception_handler",
     # "EXCEPTION_HANDLER": "rest_framework.views.exception_handler",
     "EXCEPTION_HANDLER": "core.views.custom_exception_handler",
+    # cursor 페이지네이션(?cursor=)의 page_size 최대값으로도 사용합니다.
     "PAGE_SIZE": env.int("PAGE_SIZE", 100000),
     "URL_FIELD_NAME": "permalink",
     "DATETIME_FORMAT": "%Y-%m-%d %H:%M:%S",
@@ -271,6 +431,8 @@ CORS_ALLOWED_ORIGINS = env.list(
     "CORS_ALLOWED_ORIGINS", default=["http://localhost:3000", "http://localhost:8080"]
 )
 CORS_ORIGIN_ALLOW_ALL = env.bool("CORS_ORIGIN_ALLOW_ALL", False)
+CORS_ALLOW_HEADERS = list(default_headers) + ["idempotency-key"]
+CORS_EXPOSE_HEADERS = ["Idempotent-Replayed"]
 
 # Reverse Proxy 대응
 USE_X_FORWARDED_IP = env.bool("USE_X_FORWARDED_IP", False)
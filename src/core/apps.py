@@ -6,4 +6,7 @@ class CoreConfig(AppConfig):
     name = "core"
 
     def ready(self):
+        # 쓰기 쿼리 수행 시(query_written)의 처리를 등록합니다.
+        from . import counts, replicas  # noqa: F401
+
         app_ready.send(sender=self.__class__)
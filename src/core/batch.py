@@ -0,0 +1,372 @@
+import asyncio
+import contextvars
+import json
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, ResolverMatch, resolve
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .query_count import count_queries
+
+# batch 에서 bulk 로 저장할 수 있는 ViewSet action
+BULK_WRITE_ACTIONS = ("create", "update", "partial_update")
+
+# 하위 요청에 복사하지 않는 WSGI environ 키
+EXCLUDED_META_KEYS = {
+    "CONTENT_LENGTH",
+    "CONTENT_TYPE",
+    "PATH_INFO",
+    "QUERY_STRING",
+    "REQUEST_METHOD",
+    "wsgi.input",
+}
+
+
+class BulkWriteFallback(Exception):
+    """
+    bulk 저장에 실패하여, 하위 요청을 하나씩 다시 수행해야 함을 나타냅니다.
+    """
+
+
+class BatchExecutor:
+    """
+    batch 의 하위 요청을 middleware/WSGI 를 거치지 않고 View 를 직접 호출하여 처리합니다.
+
+    - URL 은 batch 내에서 한 번만 resolve 합니다.
+    - 이미 파싱된 data 를 그대로 하위 요청의 request.data 로 사용합니다.
+    - batch 요청에서 인증된 사용자를 하위 요청에서도 그대로 사용합니다.
+    """
+
+    def __init__(self, request: Request):
+        self.request = request
+        self.http_request: HttpRequest = request._request
+        self.meta = {
+            key: value
+            for key, value in self.http_request.META.items()
+            if key not in EXCLUDED_META_KEYS
+        }
+        self._resolver_matches: Dict[str, ResolverMatch] = {}
+
+    def resolve(self, path: str) -> ResolverMatch:
+        resolver_match = self._resolver_matches.get(path)
+        if resolver_match is None:
+            resolver_match = self._resolver_matches[path] = resolve(path)
+        return resolver_match
+
+    def build_request(
+        self, method: str, url: str, data: Optional[Any]
+    ) -> Tuple[HttpRequest, ResolverMatch]:
+        """
+        하위 요청의 HttpRequest 를 생성합니다.
+        """
+
+        split_url = urlsplit(url)
+        resolver_match = self.resolve(split_url.path)
+
+        http_request = HttpRequest()
+        http_request.method = method
+        http_request.path = http_request.path_info = split_url.path
+        http_request.META = dict(
+            self.meta,
+            REQUEST_METHOD=method,
+            PATH_INFO=split_url.path,
+            QUERY_STRING=split_url.query,
+            CONTENT_TYPE="application/json",
+        )
+        http_request.GET = QueryDict(split_url.query)
+        http_request.COOKIES = self.http_request.COOKIES
+        http_request.resolver_match = resolver_match
+        for attr in ("session", "user"):
+            if hasattr(self.http_request, attr):
+                setattr(http_request, attr, getattr(self.http_request, attr))
+
+        # custom attribute. it is using in CoreMixin.dispatch.
+        http_request._batch_request = True
+        http_request._dont_enforce_csrf_checks = True
+
+        # batch 요청에서 인증된 사용자로 하위 요청을 인증합니다. (ForcedAuthentication)
+        http_request._force_auth_user = self.request.user
+        http_request._force_auth_token = self.request.auth
+
+        # CoreMixin View 는 파싱된 data 를 그대로 request.data 로 사용합니다. (CoreMixin.initialize_request)
+        # 그 외의 View 는 JSON body 를 파싱하도록 합니다.
+        if is_core_view(resolver_match):
+            http_request._batch_data = data
+        else:
+            body = json.dumps(data).encode()
+            http_request._body = body
+            http_request._stream = BytesIO(body)
+            http_request.META["CONTENT_LENGTH"] = str(len(body))
+
+        return http_request, resolver_match
+
+    def execute(self, method: str, url: str, data: Optional[Any] = None) -> Response:
+        try:
+            http_request, resolver_match = self.build_request(method, url, data)
+        except Resolver404:
+            return Response(None, status=status.HTTP_404_NOT_FOUND)
+
+        return resolver_match.func(
+            http_request, *resolver_match.args, **resolver_match.kwargs
+        )
+
+    def run(self, method: str, url: str, data: Optional[Any] = None) -> Dict[str, Any]:
+        """
+        하위 요청을 수행하고, 응답 상태/데이터와 소요시간(ms)을 반환합니다.
+        """
+
+        started_at = time.perf_counter()
+        response = self.execute(method, url, data)
+        return {
+            "status_code": response.status_code,
+            "data": getattr(response, "data", None),
+            "elapsed_ms": round((time.perf_counter() - started_at) * 1000, 3),
+        }
+
+    def get_bulk_key(self, method: str, url: str) -> Optional[Tuple]:
+        """
+        bulk 로 저장할 수 있는 하위 요청이면, 함께 저장할 수 있는 요청들이 공유하는 키를 반환합니다.
+        """
+
+        split_url = urlsplit(url)
+        try:
+            resolver_match = self.resolve(split_url.path)
+        except Resolver404:
+            return None
+
+        actions = getattr(resolver_match.func, "actions", None) or {}
+        action_name = actions.get(method.lower())
+        if action_name not in BULK_WRITE_ACTIONS or not is_core_view(resolver_match):
+            return None
+        if not resolver_match.func.cls.can_batch_bulk_write(action_name):
+            return None
+
+        return method, resolver_match.func, split_url.query
+
+    def group_bulk_runs(
+        self, sub_requests: Sequence[Tuple[str, str, Optional[Any]]]
+    ) -> Iterator[List[Tuple[str, str, Optional[Any]]]]:
+        """
+        같은 method 로 같은 ViewSet 에 연속으로 요청된 하위 요청들을 묶습니다.
+
+        같은 URL 을 수정하는 요청은 앞의 수정 결과에 의존하므로 같은 묶음에 넣지 않습니다.
+        """
+
+        run, run_key, run_paths = [], None, set()
+        for sub_request in sub_requests:
+            method, url, _ = sub_request
+            bulk_key = self.get_bulk_key(method, url)
+            path = urlsplit(url).path
+
+            if run and (
+                bulk_key is None
+                or bulk_key != run_key
+                or (method != "POST" and path in run_paths)
+            ):
+                yield run
+                run, run_paths = [], set()
+
+            run.append(sub_request)
+            run_key = bulk_key
+            run_paths.add(path)
+
+        if run:
+            yield run
+
+    def run_bulk(
+        self, sub_requests: Sequence[Tuple[str, str, Optional[Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        묶인 하위 요청들을 한 번의 View 호출로 검증 후 bulk_create/bulk_update 로 저장합니다.
+
+        각 하위 요청마다 응답을 생성하며, 소요시간은 전체 소요시간을 균등하게 나눈 값입니다.
+        검증 실패 등으로 bulk 저장을 할 수 없으면 BulkWriteFallback 을 발생시킵니다.
+        """
+
+        started_at = time.perf_counter()
+
+        method, url, _ = sub_requests[0]
+        http_request, resolver_match = self.build_request(
+            method, url, [data or {} for _, _, data in sub_requests]
+        )
+        http_request._batch_bulk_kwargs = [
+            self.resolve(urlsplit(url).path).kwargs for _, url, _ in sub_requests
+        ]
+
+        try:
+            # bulk 저장 중의 오류는 savepoint 로 되돌린 후 하나씩 다시 수행합니다.
+            with transaction.atomic():
+                response = resolver_match.func(
+                    http_request, *resolver_match.args, **resolver_match.kwargs
+                )
+                if response.status_code >= status.HTTP_400_BAD_REQUEST:
+                    raise BulkWriteFallback
+        except DatabaseError as e:
+            raise BulkWriteFallback from e
+
+        elapsed_ms = (time.perf_counter() - started_at) * 1000 / len(sub_requests)
+        return [
+            {
+                "status_code": response.status_code,
+                "data": data,
+                "elapsed_ms": round(elapsed_ms, 3),
+            }
+            for data in response.data
+        ]
+
+    def run_writes(
+        self, sub_requests: Sequence[Tuple[str, str, Optional[Any]]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        쓰기 하위 요청들을 순서대로 수행하고, 각 하위 요청의 응답을 반환합니다.
+
+        같은 ViewSet 에 대한 연속된 create/update 요청은 bulk 로 저장합니다.
+        """
+
+        for run in self.group_bulk_runs(sub_requests):
+            if len(run) > 1:
+                try:
+                    yield from self.run_bulk(run)
+                    continue
+                except BulkWriteFallback:
+                    pass
+
+            for sub_request in run:
+                yield self.run(*sub_request)
+
+    def run_parallel(
+        self,
+        sub_requests: Sequence[Tuple[str, str, Optional[Any]]],
+        max_workers: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        조회성 하위 요청들을 스레드에서 동시에 수행하고, 요청 순서대로 결과를 반환합니다.
+
+        각 스레드는 자신의 DB connection 을 사용하며, 수행 후 connection 을 정리합니다.
+        트랜잭션으로 묶지 않으므로 쓰기 요청에는 사용하지 않아야 합니다.
+        """
+
+        max_workers = max_workers or settings.BATCH_READ_MAX_WORKERS
+
+        self.prepare(sub_requests)
+
+        max_workers = max(1, min(max_workers, len(sub_requests)))
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="batch_read"
+        ) as executor:
+            # context 는 동시에 여러 스레드에서 진입할 수 없으므로 하위 요청마다 복사합니다.
+            contexts = [contextvars.copy_context() for _ in sub_requests]
+            return list(executor.map(self.run_isolated, contexts, sub_requests))
+
+    async def run_concurrently(
+        self,
+        sub_requests: Sequence[Tuple[str, str, Optional[Any]]],
+        executor: ThreadPoolExecutor,
+    ) -> List[Dict[str, Any]]:
+        """
+        조회성 하위 요청들을 각각 async task 로 executor 스레드에서 동시에 수행하고, 요청 순서대로 결과를 반환합니다.
+        """
+
+        self.prepare(sub_requests)
+
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    self.run_isolated,
+                    contextvars.copy_context(),
+                    sub_request,
+                )
+                for sub_request in sub_requests
+            )
+        )
+
+    def prepare(self, sub_requests: Sequence[Tuple[str, str, Optional[Any]]]):
+        """
+        resolve 결과를 스레드 간에 공유하도록 미리 resolve 합니다.
+        """
+        for _, url, _ in sub_requests:
+            try:
+                self.resolve(urlsplit(url).path)
+            except Resolver404:
+                pass
+
+    def run_counted(
+        self, sub_request: Tuple[str, str, Optional[Any]]
+    ) -> Dict[str, Any]:
+        # 요청의 쿼리 수 집계(QueryCountMiddleware)에 현재 스레드의 connection 에서 수행한 쿼리를 포함합니다.
+        with count_queries():
+            return self.run(*sub_request)
+
+    def run_isolated(
+        self, context: contextvars.Context, sub_request: Tuple[str, str, Optional[Any]]
+    ) -> Dict[str, Any]:
+        """
+        조회성 하위 요청을 현재 스레드의 DB connection 으로 수행하고, 수행 후 connection 을 정리합니다.
+        """
+        try:
+            # Replica 고정 등 요청 단위 상태(ContextVar)를 이어받으며, 하위 요청에서 변경한 상태는
+            # 복사된 context 에만 남으므로 같은 스레드에서 수행되는 다른 하위 요청으로 이어지지 않습니다.
+            return context.run(self.run_counted, sub_request)
+        except Exception:
+            traceback.print_exc()
+            return {
+                "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "data": None,
+                "elapsed_ms": None,
+            }
+        finally:
+            connections.close_all()
+
+
+@lru_cache(maxsize=None)
+def get_async_batch_executor() -> ThreadPoolExecutor:
+    """
+    async batch 의 조회성 하위 요청을 수행할 프로세스 공용 스레드 풀을 반환합니다.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.BATCH_ASYNC_MAX_WORKERS, thread_name_prefix="batch_async"
+    )
+
+
+def is_core_view(resolver_match: ResolverMatch) -> bool:
+    from .mixins import CoreMixin
+
+    view_class = getattr(resolver_match.func, "cls", None)
+    return view_class is not None and issubclass(view_class, CoreMixin)
+
+
+def get_batch_bulk_kwargs(request: Request) -> Optional[List[Dict[str, Any]]]:
+    """
+    batch 의 bulk 저장 요청이면, 묶인 각 하위 요청의 URL kwargs 를 반환합니다.
+    """
+    return getattr(request._request, "_batch_bulk_kwargs", None)
+
+
+def set_batch_data(request: Request):
+    """
+    batch 하위 요청이면, 파싱된 data 를 DRF Request 의 data 로 지정합니다.
+    """
+
+    http_request = request._request
+    if not hasattr(http_request, "_batch_data"):
+        return
+
+    data = http_request._batch_data
+    if data is None:
+        data = {}
+
+    request._data = request._full_data = data
+    request._files = http_request.FILES
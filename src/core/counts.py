@@ -0,0 +1,206 @@
+import hashlib
+import uuid
+from typing import Optional, Tuple, Type
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Model, QuerySet
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+
+from .models import PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME
+from .signals import query_written
+
+COUNT_VERSION_KEY = "core:count-version:{}"
+COUNT_KEY = "core:count:{}:{}:{}"
+
+
+def get_count_cache():
+    return caches[settings.COUNT_CACHE_ALIAS]
+
+
+def get_count_version(model: Type[Model]) -> str:
+    cache = get_count_cache()
+    version_key = COUNT_VERSION_KEY.format(model._meta.label_lower)
+
+    version = cache.get(version_key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(version_key, version, timeout=None):
+            version = cache.get(version_key, version)
+    return version
+
+
+def invalidate_counts(model: Type[Model], db_alias: str):
+    """
+    model 테이블의 캐싱된 count 를 모두 무효화합니다. (쓰기 쿼리가 수행된 후 호출됩니다.)
+
+    트랜잭션 안에서는 커밋 전에 다른 요청이 이전 상태의 count 를 캐싱할 수 있으므로, 커밋 시에 한 번 더 무효화합니다.
+    """
+
+    if not settings.COUNT_CACHE_TIMEOUT:
+        return
+
+    label = model._meta.label_lower
+    version_key = COUNT_VERSION_KEY.format(label)
+    cache = get_count_cache()
+    cache.set(version_key, uuid.uuid4().hex, timeout=None)
+
+    if connections[db_alias].in_atomic_block:
+        transaction.on_commit(
+            lambda: cache.set(version_key, uuid.uuid4().hex, timeout=None),
+            using=db_alias,
+        )
+
+
+@receiver(query_written, dispatch_uid="invalidate_written_counts")
+def invalidate_written_counts(sender, db_alias, **kwargs):
+    if sender is not None:
+        invalidate_counts(sender, db_alias)
+
+
+def get_count_key(queryset: QuerySet) -> str:
+    """
+    model 의 count 버전과 정렬을 제외한 쿼리(SQL, 파라미터)로 count 캐시 키를 생성합니다.
+
+    filter 의 순서나 표현이 달라도 같은 SQL 로 컴파일되면 같은 키를 사용합니다.
+    """
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha1(f"{queryset.db}\0{sql}\0{params!r}".encode()).hexdigest()
+    return COUNT_KEY.format(
+        queryset.model._meta.label_lower, get_count_version(queryset.model), digest
+    )
+
+
+def estimate_count(queryset: QuerySet) -> Optional[int]:
+    """
+    DB 통계로 추정한 행 수를 반환합니다. 추정할 수 없으면 None 을 반환합니다.
+
+    - MySQL : 조건이 없으면 information_schema.TABLES 의 TABLE_ROWS, 있으면 EXPLAIN 의 rows * filtered
+    - SQLite : 조건이 없을 때에만 sqlite_stat1 (ANALYZE 로 생성)
+    """
+
+    query = queryset.query
+    if query.is_sliced or query.distinct or query.combinator:
+        return None
+
+    db_table = queryset.model._meta.db_table
+    db_alias = PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME.get(db_table, queryset.db)
+    connection = connections[db_alias]
+
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == "mysql":
+                if not query.where:
+                    cursor.execute(
+                        "SELECT TABLE_ROWS FROM information_schema.TABLES"
+                        " WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s",
+                        [connection.settings_dict["NAME"], db_table],
+                    )
+                    row = cursor.fetchone()
+                    return None if row is None or row[0] is None else int(row[0])
+
+                compiler = queryset.order_by().query.get_compiler(using=db_alias)
+                try:
+                    sql, params = compiler.as_sql()
+                except EmptyResultSet:
+                    # pk__in=[] 과 같이 결과가 없는 조건
+                    return 0
+                cursor.execute(f"EXPLAIN {sql}", params)
+                columns = [column[0].lower() for column in cursor.description]
+                row = dict(zip(columns, cursor.fetchone()))
+                if row.get("rows") is None:
+                    return None
+                return int(row["rows"] * float(row.get("filtered") or 100) / 100)
+
+            if connection.vendor == "sqlite" and not query.where:
+                cursor.execute(
+                    "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [db_table]
+                )
+                row = cursor.fetchone()
+                return None if row is None else int(row[0].split()[0])
+    except DatabaseError:
+        # sqlite_stat1 이 없는 경우(ANALYZE 전) 등
+        return None
+
+    return None
+
+
+def get_count(queryset: QuerySet) -> Tuple[int, bool]:
+    """
+    (행 수, 추정값 여부)를 반환합니다.
+
+    COUNT_ESTIMATE_THRESHOLD 이상으로 추정되면 DB 통계의 추정값을,
+    아니면 COUNT_CACHE_TIMEOUT 초 동안 캐싱된 정확한 count 를 반환합니다.
+    """
+
+    if settings.COUNT_ESTIMATE_THRESHOLD:
+        estimated = estimate_count(queryset)
+        if estimated is not None and estimated >= settings.COUNT_ESTIMATE_THRESHOLD:
+            return estimated, True
+
+    if not settings.COUNT_CACHE_TIMEOUT:
+        return queryset.count(), False
+
+    try:
+        key = get_count_key(queryset)
+    except EmptyResultSet:
+        # pk__in=[] 과 같이 결과가 없는 조건은 SQL 로 컴파일되지 않습니다.
+        return 0, False
+
+    cache = get_count_cache()
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=settings.COUNT_CACHE_TIMEOUT)
+    return count, False
+
+
+class CountPaginator(Paginator):
+    """
+    get_count 로 전체 개수를 구하는 Paginator 입니다.
+
+    추정값이면 마지막 페이지를 추정값으로 자르지 않으며, 범위를 벗어난 페이지는 빈 페이지로 반환합니다.
+    """
+
+    @cached_property
+    def _count(self) -> Tuple[int, bool]:
+        if isinstance(self.object_list, QuerySet):
+            return get_count(self.object_list)
+        return len(self.object_list), False
+
+    @cached_property
+    def count(self) -> int:
+        return self._count[0]
+
+    @property
+    def count_estimated(self) -> bool:
+        return self._count[1]
+
+    def page(self, number):
+        if not self.count_estimated:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom : bottom + self.per_page], number, self
+        )
+
+    def validate_number(self, number):
+        if not self.count_estimated:
+            return super().validate_number(number)
+
+        # 추정값으로는 마지막 페이지를 알 수 없으므로 하한만 검사합니다.
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("페이지 번호는 정수여야 합니다.")
+        if number < 1:
+            raise EmptyPage("페이지 번호는 1 이상이어야 합니다.")
+        return number
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, router, transaction
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+# 저장된 응답을 재사용했을 때 응답에 추가하는 헤더
+IDEMPOTENT_REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Idempotency-Key 를 적용하는 쓰기 요청 method
+IDEMPOTENT_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+
+@dataclass
+class IdempotencyRecord:
+    fingerprint: str
+    # 처리 중이면 None
+    status_code: Optional[int] = None
+    # 응답 데이터(JSON 문자열)
+    content: Optional[str] = None
+
+    @property
+    def is_completed(self) -> bool:
+        return self.status_code is not None
+
+
+class IdempotencyError(Exception):
+    status_code = status.HTTP_409_CONFLICT
+    message = ""
+
+    def to_response(self) -> JsonResponse:
+        # core.views.custom_exception_handler 와 같은 형식으로 응답합니다.
+        return JsonResponse(
+            {"error": [{"message": self.message}]}, status=self.status_code
+        )
+
+
+class IdempotencyKeyInProgress(IdempotencyError):
+    status_code = status.HTTP_409_CONFLICT
+    message = "같은 Idempotency-Key 의 요청이 처리 중입니다."
+
+
+class IdempotencyKeyMismatch(IdempotencyError):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    message = "Idempotency-Key 가 다른 요청에 사용되었습니다."
+
+
+class BaseIdempotencyStore:
+    """
+    Idempotency-Key 별 처리 상태와 커밋된 응답을 저장합니다.
+
+    settings.IDEMPOTENCY_STORE 로 구현체를 지정하며, 아래 메소드를 구현해야 합니다.
+    """
+
+    def try_acquire(self, key: str, fingerprint: str, expired_at) -> bool:
+        """
+        key 를 expired_at 까지 처리 중 상태로 저장합니다. 만료되지 않은 key 가 있으면 False 를 반환합니다.
+
+        처리 중에 프로세스가 종료되어 점유 시간이 지난 key 는 이어받습니다.
+        """
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """
+        만료되지 않은 key 의 상태를 반환합니다.
+        """
+        raise NotImplementedError
+
+    def complete(self, key: str, status_code: int, content: str, expired_at):
+        """
+        key 의 처리 결과를 expired_at 까지 보관하도록 저장합니다. 요청의 트랜잭션 안에서 호출됩니다.
+        """
+        raise NotImplementedError
+
+    def release(self, key: str):
+        """
+        처리 결과가 저장되지 않은(처리 중인) key 를 삭제합니다.
+        """
+        raise NotImplementedError
+
+    def acquire(self, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        """
+        key 의 처리 권한을 얻으면 None 을, 이미 처리된 요청이면 저장된 결과를 반환합니다.
+
+        같은 key 의 요청이 처리 중이면 IDEMPOTENCY_WAIT_TIMEOUT 초까지 처리가 끝나기를 기다립니다.
+        처리 중인 key 는 IDEMPOTENCY_LEASE_SECONDS 초 동안만 점유합니다.
+        """
+
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        interval = 0.05
+
+        while True:
+            expired_at = timezone.now() + timedelta(
+                seconds=settings.IDEMPOTENCY_LEASE_SECONDS
+            )
+            if self.try_acquire(key, fingerprint, expired_at):
+                return None
+
+            record = self.get(key)
+            if record is not None:
+                if record.fingerprint != fingerprint:
+                    raise IdempotencyKeyMismatch
+                if record.is_completed:
+                    return record
+
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgress
+
+            time.sleep(interval)
+            interval = min(interval * 2, 0.5)
+
+
+class DatabaseIdempotencyStore(BaseIdempotencyStore):
+    """
+    IdempotencyKey 테이블에 저장합니다.
+
+    처리 결과는 요청의 트랜잭션 안에서 저장되므로, 커밋된 요청의 응답만 남습니다.
+    """
+
+    @property
+    def model(self):
+        from core.models import IdempotencyKey
+
+        return IdempotencyKey
+
+    @property
+    def queryset(self):
+        # Replica 지연이 없도록 항상 쓰기 DB 에서 조회합니다.
+        return self.model._default_manager.using(router.db_for_write(self.model))
+
+    def try_acquire(self, key, fingerprint, expired_at):
+        queryset = self.queryset
+        queryset.filter(key=key, expired_at__lte=timezone.now()).delete()
+
+        try:
+            with transaction.atomic(using=queryset.db):
+                queryset.create(key=key, fingerprint=fingerprint, expired_at=expired_at)
+        except IntegrityError:
+            return False
+
+        return True
+
+    def get(self, key):
+        instance = self.queryset.filter(key=key, expired_at__gt=timezone.now()).first()
+        if instance is None:
+            return None
+
+        return IdempotencyRecord(
+            fingerprint=instance.fingerprint,
+            status_code=instance.status_code,
+            content=instance.response_data,
+        )
+
+    def complete(self, key, status_code, content, expired_at):
+        self.queryset.filter(key=key).update(
+            status_code=status_code, response_data=content, expired_at=expired_at
+        )
+
+    def release(self, key):
+        self.queryset.filter(key=key, status_code__isnull=True).delete()
+
+    def purge_expired(self) -> int:
+        deleted, _ = self.queryset.filter(expired_at__lte=timezone.now()).delete()
+        return deleted
+
+
+@lru_cache(maxsize=None)
+def get_idempotency_store() -> BaseIdempotencyStore:
+    return import_string(settings.IDEMPOTENCY_STORE)()
+
+
+def get_fingerprint(request: HttpRequest, body: bytes) -> str:
+    """
+    요청 method, 경로, body, 인증 정보로 요청 지문을 생성합니다.
+
+    같은 key 가 다른 요청이나 다른 사용자에게 사용되는 것을 막습니다.
+    """
+
+    fingerprint = hashlib.sha256()
+    for value in (
+        request.method,
+        request.get_full_path(),
+        request.META.get("HTTP_AUTHORIZATION", ""),
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME, ""),
+    ):
+        fingerprint.update(value.encode())
+        fingerprint.update(b"\0")
+    fingerprint.update(body)
+
+    return fingerprint.hexdigest()
+
+
+def get_request_body(request: HttpRequest) -> bytes:
+    """
+    요청 지문 생성을 위한 body 를 반환합니다.
+
+    multipart 요청(파일 업로드)은 body 전체를 메모리로 읽지 않고(DATA_UPLOAD_MAX_MEMORY_SIZE 초과 시 오류),
+    파싱된 form 데이터와 업로드 파일의 내용으로 생성한 해시를 반환합니다.
+    """
+
+    if request.content_type != "multipart/form-data":
+        return request.body
+
+    if request.method != "POST":
+        # Django 는 POST 요청의 multipart body 만 파싱하므로 직접 파싱합니다.
+        # 파싱 결과는 rest_framework 의 Request 에서도 그대로 사용됩니다.
+        request._post, request._files = request.parse_file_upload(
+            request.META, request
+        )
+
+    digest = hashlib.sha256()
+    for name, values in sorted(request.POST.lists()):
+        for value in values:
+            digest.update(f"{name}\0{value}\0".encode())
+
+    for name, files in sorted(request.FILES.lists()):
+        for file in files:
+            digest.update(f"{name}\0{file.name}\0{file.size}\0".encode())
+            for chunk in file.chunks():
+                digest.update(chunk)
+            file.seek(0)
+
+    return digest.digest()
+
+
+def run_idempotent(
+    request: HttpRequest, get_body: Callable[[], bytes], func: Callable[[], Any]
+) -> HttpResponse:
+    """
+    Idempotency-Key 헤더가 있으면 같은 key 의 요청에는 저장된 응답을 반환합니다.
+
+    get_body 는 요청 지문 생성을 위한 body 를 반환하며, 헤더가 있을 때에만 호출됩니다.
+
+    func 의 응답이 성공(2xx)이면 응답을 func 의 트랜잭션과 함께 커밋하고,
+    실패하면 key 를 삭제하여 재시도 시 다시 수행되도록 합니다.
+    """
+
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if not key:
+        return func()
+
+    store = get_idempotency_store()
+
+    try:
+        record = store.acquire(key, get_fingerprint(request, get_body()))
+    except IdempotencyError as e:
+        return e.to_response()
+
+    if record is not None:
+        response = HttpResponse(
+            record.content,
+            status=record.status_code,
+            content_type="application/json",
+        )
+        response[IDEMPOTENT_REPLAYED_HEADER] = "true"
+        return response
+
+    completed = False
+    try:
+        with transaction.atomic():
+            response = func()
+
+            is_stored = (
+                response.status_code < status.HTTP_400_BAD_REQUEST
+                and not response.streaming
+            )
+            if is_stored:
+                store.complete(
+                    key,
+                    response.status_code,
+                    json.dumps(
+                        getattr(response, "data", None),
+                        cls=JSONEncoder,
+                        ensure_ascii=False,
+                        separators=(",", ":"),
+                    ),
+                    timezone.now()
+                    + timedelta(seconds=settings.IDEMPOTENCY_KEY_EXPIRE_SECONDS),
+                )
+
+        # 트랜잭션이 커밋된 후에만 처리가 완료된 것으로 봅니다. (커밋에 실패하면 key 를 삭제합니다.)
+        completed = is_stored
+        return response
+    finally:
+        if not completed:
+            store.release(key)
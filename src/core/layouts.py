@@ -0,0 +1,44 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 리스트 응답의 results 형식
+# - rows : columns 헤더 + 행 별 값 배열 [[v1, v2, ...], ...]
+# - columns : columns 헤더 + 컬럼 별 값 배열 [[행1의 v1, 행2의 v1, ...], ...]
+LAYOUT_ROWS = "rows"
+LAYOUT_COLUMNS = "columns"
+LAYOUTS = (LAYOUT_ROWS, LAYOUT_COLUMNS)
+
+
+def records_to_rows(
+    records: Iterable[Dict[str, Any]]
+) -> Tuple[List[str], List[List[Any]]]:
+    """
+    dict 리스트를 (컬럼명 목록, 행 별 값 배열)로 변환합니다.
+
+    행마다 key 가 다를 수 있으므로(flatten 된 중첩 필드 등), 모든 행의 key 를 처음 나온 순서대로 컬럼으로 사용합니다.
+    """
+    records = list(records)
+
+    columns: Dict[str, None] = {}
+    for record in records:
+        columns.update(dict.fromkeys(record))
+
+    column_list = list(columns)
+    rows = [[record.get(name) for name in column_list] for record in records]
+    return column_list, rows
+
+
+def get_layout_data(
+    columns: List[str], rows: List[List[Any]], layout: Optional[str]
+) -> Dict[str, Any]:
+    """
+    {columns, results} 를 반환합니다. layout 이 columns 이면 results 를 컬럼 별 배열로 변환합니다.
+    """
+    if layout == LAYOUT_COLUMNS:
+        if rows:
+            results = [list(values) for values in zip(*rows)]
+        else:
+            results = [[] for _ in columns]
+    else:
+        results = rows
+
+    return dict(columns=columns, results=results)
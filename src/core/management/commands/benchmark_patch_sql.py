@@ -0,0 +1,98 @@
+import re
+import timeit
+from typing import Dict
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.models.patched_sql_compiler import PatchSQL
+
+
+class LoopPatchSQL:
+    """
+    테이블마다 re.sub 를 수행하던 기존 방식의 치환기입니다. 비교 기준으로만 사용합니다.
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.patterns = [
+            (re.compile(re.escape(table_name), re.IGNORECASE), table_name_with_db_name)
+            for table_name, table_name_with_db_name in mapping.items()
+        ]
+
+    def __call__(self, sql: str) -> str:
+        for pattern, table_name_with_db_name in self.patterns:
+            sql = pattern.sub(table_name_with_db_name, sql)
+        return sql
+
+
+class Command(BaseCommand):
+    help = "patch_sql 의 테이블명 치환 성능을 기존 테이블별 re.sub 방식과 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10, 100, 1000, 5000],
+            help="비교할 테이블 수 목록",
+        )
+        parser.add_argument(
+            "--number",
+            type=int,
+            default=100,
+            help="테이블 수별 반복 실행 횟수",
+        )
+
+    def handle(self, *args, **options):
+        quote_name = connection.ops.quote_name
+        number = options["number"]
+
+        self.stdout.write(
+            f"{'tables':>8} {'loop(ms)':>12} {'single(ms)':>12} {'speedup':>10}"
+            f" {'cached(ms)':>12}"
+        )
+
+        for size in options["sizes"]:
+            mapping = {
+                quote_name(f"TABLE_{i}"): f"{quote_name('db')}.{quote_name(f'TABLE_{i}')}"
+                for i in range(size)
+            }
+            sql = self.make_sql(quote_name, size)
+
+            loop_patch_sql = LoopPatchSQL(mapping)
+            single_patch_sql = PatchSQL(mapping, cache_size=0)
+            cached_patch_sql = PatchSQL(mapping)
+
+            # 패턴 compile 과 첫 치환 결과의 캐싱을 측정에서 제외합니다.
+            loop_patch_sql(sql)
+            single_patch_sql(sql)
+            cached_patch_sql(sql)
+
+            loop_ms = timeit.timeit(lambda: loop_patch_sql(sql), number=number)
+            single_ms = timeit.timeit(lambda: single_patch_sql(sql), number=number)
+            cached_ms = timeit.timeit(lambda: cached_patch_sql(sql), number=number)
+            loop_ms = loop_ms * 1000 / number
+            single_ms = single_ms * 1000 / number
+            cached_ms = cached_ms * 1000 / number
+
+            self.stdout.write(
+                f"{size:>8} {loop_ms:>12.4f} {single_ms:>12.4f} {loop_ms / single_ms:>9.1f}x"
+                f" {cached_ms:>12.4f}"
+            )
+
+    @staticmethod
+    def make_sql(quote_name, size: int) -> str:
+        """
+        3개 테이블을 JOIN 하는 SELECT 문을 생성합니다.
+        """
+        first, middle, last = (
+            quote_name(f"TABLE_{i}") for i in (0, size // 2, size - 1)
+        )
+        column = quote_name("ID")
+        return (
+            f"SELECT {first}.{column}, {middle}.{column}, {last}.{column} "
+            f"FROM {first} "
+            f"INNER JOIN {middle} ON ({first}.{column} = {middle}.{column}) "
+            f"LEFT OUTER JOIN {last} ON ({middle}.{column} = {last}.{column}) "
+            f"WHERE {first}.{column} = %s"
+        )
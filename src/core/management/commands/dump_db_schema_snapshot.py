@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models.patched_sql_compiler import scan_db_tables
+from core.schema_snapshot import dump_schema_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "DB 를 직접 조회하여 table 별 db alias 와 db명을 붙인 table source 를 스냅샷 파일로 저장합니다. "
+        "프로세스 시작 시 스냅샷 파일이 유효하면 DB 조회를 생략합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default=settings.DB_SCHEMA_SNAPSHOT_PATH,
+            help="스냅샷 파일 경로 (기본값: settings.DB_SCHEMA_SNAPSHOT_PATH)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path:
+            raise CommandError("스냅샷 파일 경로가 지정되지 않았습니다.")
+
+        started_at = time.perf_counter()
+        db_alias_by_table_name, db_tables_mapping = scan_db_tables()
+        elapsed = time.perf_counter() - started_at
+
+        dump_schema_snapshot(path, db_alias_by_table_name, db_tables_mapping)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(db_tables_mapping)} db tables scanned in {elapsed:.3f}s "
+                f"and saved to {path}."
+            )
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.idempotency import get_idempotency_store
+
+
+class Command(BaseCommand):
+    help = "만료된 Idempotency-Key 와 저장된 응답을 삭제합니다."
+
+    def handle(self, *args, **options):
+        store = get_idempotency_store()
+        if not hasattr(store, "purge_expired"):
+            raise CommandError(
+                f"{store.__class__.__name__} 는 만료된 key 삭제를 지원하지 않습니다."
+            )
+
+        deleted = store.purge_expired()
+
+        self.stdout.write(self.style.SUCCESS(f"{deleted} idempotency keys purged."))
@@ -1,8 +1,21 @@
+import json
+import logging
+import re
+import time
+from threading import Lock
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed, RequestDataTooBig
 from django.core.handlers.wsgi import WSGIRequest
 from rest_framework import exceptions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.query_count import QueryCounter, count_queries
+from core.replicas import begin_request, end_request, has_written
+
+logger = logging.getLogger(__name__)
+
 ALLOWED_HTTP_METHOD_NAMES = ["GET", "POST"]
 
 
@@ -43,3 +56,134 @@ class PatchHttpMethodMiddleware:
 
         response = self.get_response(request)
         return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    쓰기가 발생한 클라이언트는 DATABASE_REPLICA_PIN_SECONDS 동안 primary DB 에서 조회하도록 합니다.
+
+    쓰기 발생 시 쿠키에 primary DB 고정 만료시각을 기록하고, 이후 요청에서 이를 확인합니다.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request: WSGIRequest) -> Response:
+        try:
+            pinned_until = float(
+                request.COOKIES.get(settings.DATABASE_REPLICA_PIN_COOKIE_NAME, 0)
+            )
+        except ValueError:
+            pinned_until = 0
+
+        tokens = begin_request(primary_pinned=time.time() < pinned_until)
+        try:
+            response = self.get_response(request)
+
+            if has_written():
+                pin_seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+                response.set_cookie(
+                    settings.DATABASE_REPLICA_PIN_COOKIE_NAME,
+                    str(time.time() + pin_seconds),
+                    max_age=pin_seconds,
+                    httponly=True,
+                )
+        finally:
+            end_request(tokens)
+
+        return response
+
+
+class QueryCountMiddleware:
+    """
+    응답 헤더에 요청 처리 중 수행된 쿼리 수(X-Query-Count)와 URL 패턴(X-Route)을 추가합니다.
+
+    runner/replay.py 로 endpoint 별 쿼리 수를 집계할 때 사용합니다. (QUERY_COUNT_HEADER)
+
+    batch 의 조회 스레드에서 수행된 쿼리도 포함합니다. (core.query_count)
+    스트리밍 응답은 헤더를 보낸 후에도 쿼리가 수행되므로, 헤더에는 응답 시작 전까지의 쿼리 수를 추가하고
+    응답이 끝나면 전체 쿼리 수를 로그로 기록합니다.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_COUNT_HEADER:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request: WSGIRequest) -> Response:
+        counter = QueryCounter()
+        with count_queries(counter):
+            response = self.get_response(request)
+
+        response["X-Query-Count"] = str(counter.count)
+        if request.resolver_match is not None:
+            # Router 의 정규식 URL 패턴(^...$)은 경로 형태로 정리합니다.
+            response["X-Route"] = re.sub(r"[\^$]", "", request.resolver_match.route)
+
+        if response.streaming:
+            response.streaming_content = self.count_streamed_queries(
+                response.streaming_content, counter, request.path
+            )
+
+        return response
+
+    def count_streamed_queries(self, streaming_content, counter, path):
+        try:
+            with count_queries(counter):
+                yield from streaming_content
+        finally:
+            logger.info("%s streamed response: %d queries", path, counter.count)
+
+
+class RequestCaptureMiddleware:
+    """
+    요청을 runner/replay.py 에서 재현할 수 있는 JSONL 형식으로 REQUEST_CAPTURE_PATH 에 기록합니다.
+
+    인증 정보(Authorization, Cookie)는 기록하지 않으며, JSON 이 아닌 body 는 기록하지 않습니다.
+    Idempotency-Key 도 기록하지 않습니다. 재현 시 같은 key 를 보내면 저장된 응답이 반환되어 측정이 왜곡됩니다.
+    """
+
+    # 기록할 요청 헤더
+    CAPTURE_HEADERS = ("X-Current-Menu", "X-Http-Method")
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_CAPTURE_PATH:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+        self.lock = Lock()
+
+    def get_body(self, request: WSGIRequest):
+        if request.content_type != "application/json":
+            return None
+
+        try:
+            return json.loads(request.body or b"null")
+        except (RequestDataTooBig, ValueError):
+            return None
+
+    def __call__(self, request: WSGIRequest) -> Response:
+        record = {
+            "method": request.method,
+            "path": request.get_full_path(),
+            "headers": {
+                header: request.headers[header]
+                for header in self.CAPTURE_HEADERS
+                if header in request.headers
+            },
+            "body": self.get_body(request),
+        }
+
+        response = self.get_response(request)
+
+        record["status_code"] = response.status_code
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self.lock:
+            with open(settings.REQUEST_CAPTURE_PATH, "a", encoding="utf-8") as f:
+                f.write(line)
+
+        return response
@@ -1,6 +1,34 @@
-from django.db import transaction
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Model, prefetch_related_objects
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.mixins import CreateModelMixin, UpdateModelMixin
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import HyperlinkedIdentityField
 from rest_framework.response import Response
-from .serializers import get_columns_from_serializer
+from rest_framework.utils.mediatypes import _MediaType
+from .batch import get_batch_bulk_kwargs, set_batch_data
+from .idempotency import IDEMPOTENT_METHODS, get_request_body, run_idempotent
+from .layouts import LAYOUTS, get_layout_data, records_to_rows
+from .models.abstract import TimeStampModel
+from .pagination import KeysetPagination
+from .prefetch import prefetch_foreign_keys
+from .read_plan import ReadPlan, get_concrete_field, get_read_plan
+from .related_plan import RelatedPlan, get_related_plan
+from .serializers import (
+    CoreHyperlinkedSerializer,
+    CoreListSerializer,
+    get_columns_from_serializer,
+)
+from .streaming import (
+    STREAM_JSON,
+    STREAM_NDJSON,
+    chunked_iterator,
+    get_streaming_response,
+)
 from rest_framework.decorators import action
 
 
@@ -11,14 +39,193 @@ class CoreMixin:
 
     lookup_value_regex = r"[^.]+"
 
+    # 리스트 조회 시 다른 DB 의 FK 객체를 일괄 조회할 lookup 목록 (예: ["common_cd_key"])
+    # settings.DB_MULTI_JOIN 이 False 여서 select_related 로 JOIN 할 수 없을 때 사용합니다.
+    cross_db_prefetch_fields: List[str] = []
+
+    # 조회 요청 시 get_queryset() 에 적용할 select_related/prefetch_related 계획 (core.related_plan)
+    # None 이면 serializer 의 관계 필드들로부터 자동으로 생성합니다.
+    related_plan: Optional[RelatedPlan] = None
+
+    # batch 에서 연속된 쓰기 요청(create/update)을 bulk_create/bulk_update 로 한 번에 저장할지 여부
+    # None 이면 Model.save() 나 perform_create()/perform_update() 등을 재정의하지 않은 경우에만 사용합니다.
+    batch_bulk_write: Optional[bool] = None
+
+    # ?stream=json|ndjson 으로 요청하면 페이지네이션 없이 전체 결과를 chunk 단위로 조회/직렬화하여 스트리밍합니다.
+    stream_query_param = "stream"
+
+    # ?layout=rows|columns 또는 Accept: application/json; layout=rows|columns 로 요청하면
+    # results 를 dict 리스트 대신 columns 헤더 + 행(또는 컬럼) 별 값 배열로 응답합니다. (core.layouts)
+    layout_query_param = "layout"
+
+    # ?fields=a,b 로 조회(GET)하면 지정한 필드(와 permalink)만 직렬화하고, 해당 컬럼만 DB 에서 조회합니다.
+    fields_query_param = "fields"
+
+    # ?cursor= 로 요청하면 pagination_class 대신 사용할 cursor 페이지네이션 (None 이면 사용하지 않습니다.)
+    cursor_pagination_class = KeysetPagination
+
     def dispatch(self, request, *args, **kwargs):
         # batch를 통한 요청
         if getattr(request, "_batch_request", False):
             return super().dispatch(request, *args, **kwargs)
 
-        # 일반적인 요청 : ATOMIC_REQUESTS를 설정한 효과
-        with transaction.atomic():
-            return super().dispatch(request, *args, **kwargs)
+        def dispatch():
+            # 일반적인 요청 : ATOMIC_REQUESTS를 설정한 효과
+            with transaction.atomic():
+                return super(CoreMixin, self).dispatch(request, *args, **kwargs)
+
+        # 쓰기 요청 : Idempotency-Key 헤더가 있으면 재시도 시 저장된 응답을 반환합니다.
+        if request.method in IDEMPOTENT_METHODS:
+            return run_idempotent(request, lambda: get_request_body(request), dispatch)
+
+        return dispatch()
+
+    def initialize_request(self, request, *args, **kwargs):
+        request = super().initialize_request(request, *args, **kwargs)
+
+        # batch 를 통한 요청 : 이미 파싱된 data 를 다시 파싱하지 않습니다.
+        set_batch_data(request)
+
+        return request
+
+    @classmethod
+    def can_batch_bulk_write(cls, action_name: str) -> bool:
+        """
+        batch 의 연속된 action_name(create/update/partial_update) 요청을 bulk 로 저장할 수 있는지 반환합니다.
+        """
+        if cls.batch_bulk_write is not None:
+            return cls.batch_bulk_write
+
+        serializer_class = cls.serializer_class
+        if serializer_class is None or not issubclass(
+            serializer_class, CoreHyperlinkedSerializer
+        ):
+            return False
+        if getattr(serializer_class.Meta, "list_serializer_class", None) is not (
+            CoreListSerializer
+        ):
+            return False
+
+        model = serializer_class.Meta.model
+        if model._meta.many_to_many or model.save not in (
+            Model.save,
+            TimeStampModel.save,
+        ):
+            return False
+
+        if action_name == "create":
+            # bulk_create 후에 자동 증가 기본키를 받아올 수 없으면 permalink 를 생성할 수 없습니다.
+            db_features = connections[router.db_for_write(model)].features
+            if model._meta.auto_field and not db_features.can_return_rows_from_bulk_insert:
+                return False
+
+            return (
+                cls.create is CoreMixin.create
+                and cls.perform_create is CreateModelMixin.perform_create
+            )
+
+        return (
+            cls.update is CoreMixin.update
+            and cls.partial_update is UpdateModelMixin.partial_update
+            and cls.perform_update is UpdateModelMixin.perform_update
+        )
+
+    def create(self, request, *args, **kwargs):
+        if get_batch_bulk_kwargs(request) is not None:
+            return self.batch_bulk_create(request)
+
+        return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        bulk_kwargs = get_batch_bulk_kwargs(request)
+        if bulk_kwargs is not None:
+            return self.batch_bulk_update(
+                request, bulk_kwargs, partial=kwargs.pop("partial", False)
+            )
+
+        return super().update(request, *args, **kwargs)
+
+    def batch_bulk_create(self, request):
+        """
+        batch 의 연속된 create 요청들의 데이터(request.data 리스트)를 bulk_create 로 저장합니다.
+        """
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def batch_bulk_update(self, request, bulk_kwargs, partial=False):
+        """
+        batch 의 연속된 update 요청들의 데이터(request.data 리스트)를 bulk_update 로 저장합니다.
+
+        bulk_kwargs 는 각 요청의 URL kwargs 이며, 대상 instance 는 한 번의 쿼리로 조회합니다.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        opts = queryset.model._meta
+        lookup_field = opts.pk if self.lookup_field == "pk" else opts.get_field(
+            self.lookup_field
+        )
+
+        lookup_values = [
+            lookup_field.to_python(kwargs[lookup_url_kwarg]) for kwargs in bulk_kwargs
+        ]
+        instances_by_value = queryset.in_bulk(
+            lookup_values, field_name=lookup_field.name
+        )
+
+        instances = []
+        for lookup_value in lookup_values:
+            instance = instances_by_value.get(lookup_value)
+            if instance is None:
+                return Response(None, status=status.HTTP_404_NOT_FOUND)
+
+            self.check_object_permissions(request, instance)
+            instances.append(instance)
+
+        serializer = self.get_serializer(
+            instances, data=request.data, many=True, partial=partial
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # 조회 요청 : 직렬화할 관계 객체를 함께 조회하여, 행 수와 관계없이 일정한 횟수의 쿼리로 응답합니다.
+        if self.request is not None and self.request.method in SAFE_METHODS:
+            queryset = self.get_related_plan().apply(queryset)
+
+        return queryset
+
+    def get_related_plan(self) -> RelatedPlan:
+        """
+        직렬화할 관계 객체의 조회 계획을 반환합니다.
+
+        related_plan 이 지정되지 않았으면 serializer 클래스(와 ?fields=)별로 한 번만 생성합니다.
+        """
+        if self.related_plan is not None:
+            return self.related_plan
+
+        field_names = None
+        if self.request is not None and self.request.method in SAFE_METHODS:
+            field_names = self.get_requested_fields(self.request)
+
+        return get_related_plan(self.get_serializer_class(), field_names)
+
+    @property
+    def paginator(self):
+        if (
+            not hasattr(self, "_paginator")
+            and self.cursor_pagination_class is not None
+            and self.cursor_pagination_class.is_requested(self.request)
+        ):
+            self._paginator = self.cursor_pagination_class()
+
+        return super().paginator
 
     def list(self, request, *args, **kwargs):
         """
@@ -31,10 +238,30 @@ class CoreMixin:
 
         queryset = self.filter_queryset(base_queryset)
 
+        # ?fields= 로 요청한 필드의 컬럼만 조회합니다.
+        serializer = self.get_serializer()
+        queryset = self.get_sparse_queryset(queryset, serializer)
+
+        # compile 된 직렬화 plan 을 사용할 수 있으면 필요한 컬럼만 조회합니다. (core.read_plan)
+        read_plan = get_read_plan(serializer)
+        if read_plan is not None:
+            queryset = read_plan.prepare(queryset)
+
+        layout = self.get_layout(request)
+
+        stream_format = self.get_stream_format(request)
+        if stream_format is not None:
+            if layout is not None:
+                raise ParseError(
+                    f"{self.stream_query_param} 와 {self.layout_query_param} 는 함께 사용할 수 없습니다."
+                )
+            return self.stream_list(queryset, stream_format, serializer, read_plan)
+
         page = self.paginate_queryset(queryset)
 
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
+            # {columns, results} 또는 {results}
+            data = self.serialize_page(page, serializer, read_plan, layout)
 
             # FIXME: 조회시 meta colums가 필요할까?
             # columns = get_columns_from_serializer(serializer)
@@ -43,15 +270,229 @@ class CoreMixin:
             # list_data에서 조작된 FK URL 문자열을 회복
             # cleaned_list_data = [self.clean_fk_url(row_data) for row_data in list_data]
 
+            # cursor 페이지네이션 : {count, count_estimated, next, results}
+            if isinstance(self.paginator, KeysetPagination):
+                response = self.paginator.get_paginated_response(data.pop("results"))
+                response.data.update(data)
+                return response
+
             response_dict = dict(
                 count=self.paginator.page.paginator.count,
-                results=serializer.data,
+                # count 가 DB 통계의 추정값인지 여부 (core.counts.get_count)
+                count_estimated=getattr(
+                    self.paginator.page.paginator, "count_estimated", False
+                ),
+                **data,
             )
 
             return Response(response_dict)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        if layout is not None:
+            return Response(self.serialize_page(queryset, serializer, read_plan, layout))
+
+        return Response(self.serialize_list(queryset, serializer, read_plan))
+
+    def serialize_list(
+        self, rows, serializer, read_plan: Optional[ReadPlan] = None
+    ) -> list:
+        """
+        rows 를 직렬화합니다. read_plan 이 있으면 DRF 대신 compile 된 plan 으로 직렬화합니다.
+        """
+        if read_plan is None:
+            return self.get_serializer(self.prefetch_cross_db(rows), many=True).data
+
+        # values_list 로 조회한 행은 FK 값으로 URL 을 생성하므로, FK 객체를 조회하지 않습니다.
+        if not read_plan.values_only:
+            rows = self.prefetch_cross_db(rows)
+
+        return read_plan.to_representations(rows, serializer)
+
+    def serialize_page(
+        self, rows, serializer, read_plan: Optional[ReadPlan], layout: Optional[str]
+    ) -> dict:
+        """
+        rows 를 layout 형식으로 직렬화하여 {columns, results} 를 반환합니다. layout 이 None 이면 {results} 를 반환합니다.
+        """
+        if layout is None:
+            return dict(results=self.serialize_list(rows, serializer, read_plan))
+
+        # values_list 로 조회한 행은 dict 를 생성하지 않고 값 배열로 직렬화합니다.
+        if read_plan is not None and read_plan.values_only:
+            columns, values = read_plan.to_rows(rows, serializer)
+        else:
+            columns, values = records_to_rows(
+                self.serialize_list(rows, serializer, read_plan)
+            )
+
+        return get_layout_data(columns, values, layout)
+
+    def get_layout(self, request) -> Optional[str]:
+        """
+        results 의 형식(rows, columns)을 반환합니다. 기본 형식(dict 리스트)이면 None 을 반환합니다.
+
+        query parameter 가 없으면 Accept 헤더의 layout 파라미터를 사용합니다.
+        """
+        value = request.query_params.get(self.layout_query_param)
+        if value is None:
+            accepted_media_type = getattr(request, "accepted_media_type", None)
+            value = _MediaType(accepted_media_type).params.get(self.layout_query_param)
+        if value is None:
+            return None
+
+        if value not in LAYOUTS:
+            raise ParseError(
+                f"{self.layout_query_param} 는 {' 또는 '.join(LAYOUTS)} 이어야 합니다."
+            )
+        return value
+
+    def get_stream_format(self, request) -> Optional[str]:
+        """
+        스트리밍 응답 형식을 반환합니다. 스트리밍 요청이 아니면 None 을 반환합니다.
+
+        batch 의 하위 요청은 응답 데이터를 모아야 하므로 스트리밍하지 않습니다.
+        """
+        value = request.query_params.get(self.stream_query_param)
+        if value is None or getattr(request._request, "_batch_request", False):
+            return None
+
+        if value in (STREAM_NDJSON, "1", "true"):
+            return STREAM_NDJSON
+        if value == STREAM_JSON:
+            return STREAM_JSON
+
+        raise ParseError(
+            f"{self.stream_query_param} 는 {STREAM_JSON} 또는 {STREAM_NDJSON} 이어야 합니다."
+        )
+
+    def stream_list(
+        self,
+        queryset,
+        stream_format: str,
+        serializer,
+        read_plan: Optional[ReadPlan] = None,
+    ):
+        """
+        queryset 을 LIST_STREAM_CHUNK_SIZE 개씩 조회(.iterator)하고 직렬화하여 JSON 배열 또는 NDJSON 으로 스트리밍합니다.
+
+        조회한 chunk 만 메모리에 유지하므로, 결과의 크기와 관계없이 일정한 메모리로 응답합니다.
+        (server-side cursor 를 지원하는 DB 는 cursor 로 조회합니다.)
+        """
+
+        chunk_size = settings.LIST_STREAM_CHUNK_SIZE
+        prefetch_lookups = queryset._prefetch_related_lookups
+
+        def iter_chunks():
+            for rows in chunked_iterator(
+                queryset.iterator(chunk_size=chunk_size), chunk_size
+            ):
+                # .iterator() 는 prefetch_related 를 수행하지 않으므로 chunk 별로 조회합니다.
+                if prefetch_lookups:
+                    prefetch_related_objects(rows, *prefetch_lookups)
+
+                if read_plan is not None:
+                    yield self.serialize_list(rows, serializer, read_plan)
+                else:
+                    yield [
+                        serializer.to_representation(instance)
+                        for instance in self.prefetch_cross_db(rows)
+                    ]
+
+        return get_streaming_response(iter_chunks(), stream_format)
+
+    def prefetch_cross_db(self, instances):
+        """
+        cross_db_prefetch_fields 와 related_plan 의 cross_db_prefetch 에 지정된 FK 객체들을 대상 DB 에서 일괄 조회합니다.
+        """
+        lookups = [
+            *self.cross_db_prefetch_fields,
+            *self.get_related_plan().cross_db_prefetch,
+        ]
+        if not lookups:
+            return instances
+
+        return prefetch_foreign_keys(instances, lookups)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+
+        # 조회 요청이면 ?fields= 로 지정한 필드만 남깁니다.
+        if self.request is not None and self.request.method in SAFE_METHODS:
+            self.trim_serializer_fields(serializer)
+
+        return serializer
+
+    def get_requested_fields(self, request) -> Optional[List[str]]:
+        """
+        ?fields= 로 요청한 필드명 목록을 반환합니다. 요청하지 않았으면 None 을 반환합니다.
+        """
+        value = request.query_params.get(self.fields_query_param)
+        if value is None:
+            return None
+
+        return [name.strip() for name in value.split(",") if name.strip()]
+
+    def trim_serializer_fields(self, serializer):
+        """
+        serializer 의 필드를 ?fields= 로 요청한 필드와 permalink 로 줄입니다.
+
+        serializer 에 없는 필드를 요청하면 ParseError 를 발생시킵니다.
+        """
+        requested_fields = self.get_requested_fields(self.request)
+        if requested_fields is None:
+            return
+
+        # many=True 이면 ListSerializer 의 child 필드를 줄입니다.
+        serializer = getattr(serializer, "child", serializer)
+        serializer_fields = serializer.fields
+
+        unknown_fields = [name for name in requested_fields if name not in serializer_fields]
+        if unknown_fields:
+            raise ParseError(f"{', '.join(unknown_fields)}: 조회할 수 없는 필드입니다.")
+
+        keep_fields = set(requested_fields)
+        keep_fields.add(getattr(serializer, "url_field_name", None))
+        for field_name in list(serializer_fields):
+            if field_name not in keep_fields:
+                del serializer_fields[field_name]
+
+    def get_sparse_queryset(self, queryset, serializer):
+        """
+        ?fields= 로 필드를 줄인 serializer 가 사용하는 컬럼만 조회(.only)하는 queryset 을 반환합니다.
+
+        모델 필드가 아닌 source(property, SerializerMethodField 등)가 있으면 필요한 컬럼을 알 수 없으므로
+        queryset 을 그대로 반환합니다.
+        """
+        if self.get_requested_fields(self.request) is None:
+            return queryset
+
+        opts = queryset.model._meta
+        field_names = {opts.pk.name}
+        for field in getattr(serializer, "child", serializer)._readable_fields:
+            if isinstance(field, HyperlinkedIdentityField):
+                source = field.lookup_field
+            elif len(field.source_attrs) == 1:
+                source = field.source_attrs[0]
+            else:
+                return queryset
+
+            model_field = opts.pk if source == "pk" else get_concrete_field(opts, source)
+            if model_field is None:
+                return queryset
+            field_names.add(model_field.name)
+
+        # select_related 로 JOIN 하는 FK 는 지연 로딩할 수 없습니다.
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            field_names.update(select_related)
+        elif select_related:
+            # 인자 없는 select_related() 는 null 이 아닌 모든 FK 를 JOIN 합니다.
+            field_names.update(
+                field.name
+                for field in opts.concrete_fields
+                if field.is_relation and not field.null
+            )
+
+        return queryset.only(*field_names)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
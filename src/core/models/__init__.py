@@ -1,2 +1,4 @@
 from .patched_sql_compiler import PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME  # run patch
 from .abstract import TimeStampModel
+from .fanout import CoreQuerySet, FanOutQuerySet
+from .idempotency import IdempotencyKey
@@ -1,7 +1,11 @@
 from django.db import models
 
+from .fanout import CoreQuerySet
+
 
 class TimeStampModel(models.Model):
+    objects = CoreQuerySet.as_manager()
+
     insert_user_id = models.CharField(
         db_column="INS_USER_ID",
         max_length=20,
@@ -42,3 +46,13 @@ class TimeStampModel(models.Model):
 
     class Meta:
         abstract = True
+
+    def before_save(self):
+        """
+        저장 전에 기본키 등의 값을 채웁니다. save() 와 batch 의 bulk_create/bulk_update 전에 호출됩니다.
+        """
+
+    def save(self, *args, **kwargs):
+        self.before_save()
+
+        return super().save(*args, **kwargs)
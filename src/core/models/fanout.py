@@ -0,0 +1,203 @@
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import NotSupportedError, connections
+from django.db.models import Count, Max, Min, QuerySet, Sum
+
+from .patched_sql_compiler import use_connection_tables
+
+
+def get_fan_out_db_aliases() -> List[str]:
+    """
+    DATABASE_NAMES 로 복제된 DB alias 목록을 반환합니다. 지정되지 않았으면 default 만 사용합니다.
+    """
+    return list(settings.DATABASE_NAMES) or ["default"]
+
+
+class OrderingValue:
+    """
+    여러 DB 의 조회 결과를 병합 정렬할 때 사용할 정렬 키입니다.
+
+    DB 와 같이 NULL 은 오름차순에서 가장 앞에 위치합니다.
+    """
+
+    __slots__ = ("value", "descending")
+
+    def __init__(self, value, descending: bool):
+        self.value = value
+        self.descending = descending
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        if self.descending:
+            return OrderingValue(other.value, False) < OrderingValue(self.value, False)
+        if self.value is None:
+            return other.value is not None
+        if other.value is None:
+            return False
+        return self.value < other.value
+
+
+class FanOutQuerySet:
+    """
+    같은 스키마를 가진 여러 DB(DATABASE_NAMES)에 같은 쿼리를 스레드로 동시에 수행하고, 결과를 병합합니다.
+
+    >>> qs = SystemCommonCodeMaster.objects.filter(use_yn="Y").fan_out()
+    >>> qs.count()  # DB 별 count 의 합
+    >>> qs.order_by("common_cd").page(1, 100)  # ordering 기준으로 병합 정렬 후 페이징
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet,
+        db_aliases: Optional[Iterable[str]] = None,
+        max_workers: Optional[int] = None,
+    ):
+        self.queryset = queryset
+        self.db_aliases = list(db_aliases or get_fan_out_db_aliases())
+        self.max_workers = max_workers or settings.FAN_OUT_MAX_WORKERS
+
+    def _clone(self, queryset: QuerySet) -> "FanOutQuerySet":
+        return self.__class__(queryset, self.db_aliases, self.max_workers)
+
+    def filter(self, *args, **kwargs) -> "FanOutQuerySet":
+        return self._clone(self.queryset.filter(*args, **kwargs))
+
+    def exclude(self, *args, **kwargs) -> "FanOutQuerySet":
+        return self._clone(self.queryset.exclude(*args, **kwargs))
+
+    def order_by(self, *field_names) -> "FanOutQuerySet":
+        return self._clone(self.queryset.order_by(*field_names))
+
+    def run(self, func: Callable[[QuerySet], Any]) -> Dict[str, Any]:
+        """
+        각 db alias 의 QuerySet 에 func 을 동시에 수행하고, db alias 별 결과를 반환합니다.
+        """
+
+        def run_on(db_alias: str):
+            with use_connection_tables():
+                try:
+                    return func(self.queryset.using(db_alias))
+                finally:
+                    # 스레드마다 생성된 connection 을 정리합니다.
+                    connections[db_alias].close()
+
+        max_workers = max(1, min(self.max_workers, len(self.db_aliases)))
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fan_out"
+        ) as executor:
+            return dict(zip(self.db_aliases, executor.map(run_on, self.db_aliases)))
+
+    def count(self) -> int:
+        return sum(self.run(lambda queryset: queryset.count()).values())
+
+    def aggregate(self, **kwargs) -> Dict[str, Any]:
+        """
+        DB 별 집계 결과를 병합합니다. Count/Sum 은 합계, Min/Max 는 최소/최대값을 반환합니다.
+        """
+
+        for name, expression in kwargs.items():
+            if not isinstance(expression, (Count, Sum, Min, Max)):
+                raise NotSupportedError(
+                    f"{name}: fan_out 에서는 Count/Sum/Min/Max 집계만 지원합니다."
+                )
+
+        results = list(self.run(lambda queryset: queryset.aggregate(**kwargs)).values())
+
+        merged = {}
+        for name, expression in kwargs.items():
+            values = [result[name] for result in results if result[name] is not None]
+            if not values:
+                merged[name] = 0 if isinstance(expression, Count) else None
+            elif isinstance(expression, (Count, Sum)):
+                merged[name] = sum(values)
+            elif isinstance(expression, Min):
+                merged[name] = min(values)
+            else:
+                merged[name] = max(values)
+        return merged
+
+    def get_sort_key(self) -> Optional[Callable[[Any], tuple]]:
+        """
+        QuerySet 의 ordering(order_by 또는 Meta.ordering)으로 병합 정렬 키 함수를 생성합니다.
+        """
+
+        query = self.queryset.query
+        opts = self.queryset.model._meta
+        ordering = query.order_by or (opts.ordering if query.default_ordering else ())
+        if not ordering:
+            return None
+
+        keys = []
+        for field_name in ordering:
+            if not isinstance(field_name, str) or "__" in field_name or "?" in field_name:
+                raise NotSupportedError(
+                    f"{field_name}: fan_out 병합 정렬은 모델 필드명으로만 가능합니다."
+                )
+
+            descending = field_name.startswith("-")
+            field_name = field_name.lstrip("-")
+            field = opts.pk if field_name == "pk" else opts.get_field(field_name)
+            keys.append((field_name, field.attname, descending))
+
+        def sort_key(row) -> tuple:
+            if isinstance(row, dict):
+                return tuple(
+                    OrderingValue(row.get(field_name, row.get(attname)), descending)
+                    for field_name, attname, descending in keys
+                )
+            return tuple(
+                OrderingValue(getattr(row, attname), descending)
+                for field_name, attname, descending in keys
+            )
+
+        return sort_key
+
+    def merge(self, results: Iterable[List[Any]]) -> Iterable[Any]:
+        sort_key = self.get_sort_key()
+        if sort_key is None:
+            return (row for rows in results for row in rows)
+        return heapq.merge(*results, key=sort_key)
+
+    def __iter__(self):
+        return iter(self.merge(self.run(list).values()))
+
+    def page(self, page_number: int, page_size: int) -> Dict[str, Any]:
+        """
+        병합 정렬된 결과에서 page_number 페이지를 반환합니다.
+
+        각 DB 에서는 해당 페이지까지의 행만 조회하므로, 앞쪽 페이지일수록 적게 조회합니다.
+        """
+
+        offset = (page_number - 1) * page_size
+
+        def fetch(queryset: QuerySet):
+            return queryset.count(), list(queryset[: offset + page_size])
+
+        results = list(self.run(fetch).values())
+
+        return {
+            "count": sum(count for count, _ in results),
+            "results": list(
+                islice(
+                    self.merge(rows for _, rows in results), offset, offset + page_size
+                )
+            ),
+        }
+
+
+class FanOutQuerySetMixin:
+    def fan_out(self, db_aliases: Optional[Iterable[str]] = None) -> FanOutQuerySet:
+        """
+        DATABASE_NAMES 의 모든 DB 에 현재 쿼리를 수행하는 FanOutQuerySet 을 반환합니다.
+        """
+        return FanOutQuerySet(self, db_aliases)
+
+
+class CoreQuerySet(FanOutQuerySetMixin, QuerySet):
+    pass
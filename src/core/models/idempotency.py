@@ -0,0 +1,44 @@
+from django.db import models
+
+
+class IdempotencyKey(models.Model):
+    """
+    Idempotency-Key 헤더로 요청된 쓰기 요청의 처리 상태와 커밋된 응답을 저장합니다.
+    """
+
+    key = models.CharField(
+        db_column="IDEMPOTENCY_KEY",
+        primary_key=True,
+        max_length=255,
+        verbose_name="멱등키",
+    )
+    fingerprint = models.CharField(
+        db_column="FINGERPRINT",
+        max_length=64,
+        verbose_name="요청지문(method/path/body/인증정보 해시)",
+    )
+    status_code = models.PositiveSmallIntegerField(
+        db_column="STATUS_CODE",
+        null=True,
+        verbose_name="응답상태코드(처리중이면 NULL)",
+    )
+    response_data = models.TextField(
+        db_column="RESPONSE_DATA",
+        null=True,
+        verbose_name="응답데이터(JSON)",
+    )
+    created_at = models.DateTimeField(
+        db_column="CREATED_DT",
+        auto_now_add=True,
+        verbose_name="입력일시",
+    )
+    expired_at = models.DateTimeField(
+        db_column="EXPIRED_DT",
+        db_index=True,
+        verbose_name="만료일시",
+    )
+
+    class Meta:
+        db_alias = "default"
+        db_table = "CORE_IDEMPOTENCY_KEY"
+        verbose_name = "멱등키"
@@ -1,13 +1,20 @@
 import re
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import cached_property
-from typing import Dict
+from threading import Lock
+from typing import Dict, Iterable, Optional, Pattern, Set, Tuple
 
 from django.apps import apps
 from django.conf import settings
-from django.core.exceptions import ImproperlyConfigured
-from django.db import connections
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db import OperationalError, connections
 from django.db.backends.signals import connection_created
+from django.db.models.sql.datastructures import BaseTable, Join
 from django.db.models.sql.compiler import (
     SQLCompiler,
     # FIXME: 이 객체를 통해서는 as_sql 오버라이딩이 되지 않습니다. sql_server 객체를 직접 임포트하여 처리합니다.
@@ -22,8 +29,11 @@ from django.db.models.sql.compiler import (
 #     SQLInsertCompiler,
 # )  # FIXME: 왜 장고 compiler로는 as_sql 오버라이딩이 안 될까요?
 
-from core.signals import app_ready
-from core.utils import add_meta_attr_to_model
+from core.replicas import get_primary_db_alias, replica_selector
+from core.schema_snapshot import load_schema_snapshot
+from core.signals import app_ready, query_written
+from core.sqlite import apply_pragmas, attach_databases
+from core.utils import LRUCache, add_meta_attr_to_model
 
 
 add_meta_attr_to_model("db_alias")
@@ -37,101 +47,561 @@ _DB_TABLES_MAPPING: Dict[str, str] = {}
 PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME: Dict[str, str] = {}
 
 
-def handle_app_ready(**kwargs):
-    # 프로세스 단위로 전역변수 형태로 _DB_TABLES_MAPPING 을 조사합니다.
-    global _DB_TABLES_MAPPING
-
-    if not _DB_TABLES_MAPPING:
-        db_alias_dict_on_model_meta: Dict[str, str] = {
-            model_cls._meta.db_table: model_cls._meta.db_alias
-            for model_cls in apps.get_models()
-            if hasattr(model_cls._meta, "db_table")
-            and hasattr(model_cls._meta, "db_alias")
-        }
+def scan_db_alias(
+    db_alias: str,
+    db_alias_dict_on_model_meta: Dict[str, str],
+    db_name_dict: Dict[str, str],
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    하나의 db alias 에 대해 DB 를 직접 조회(introspection)하여,
+    table 별 db alias 와 db명을 붙인 table source 를 생성합니다.
+
+    별도 스레드에서 호출되므로, 조회 후에 해당 스레드의 connection 을 닫습니다.
+    """
+
+    db_alias_by_table_name: Dict[str, str] = {}
+    db_tables_mapping: Dict[str, str] = {}
+
+    db_settings = settings.DATABASES[db_alias]
+    connection = connections[db_alias]
+    quote_name = connection.ops.quote_name
+    is_sqlserver = "pyodbc" in db_settings["ENGINE"]
+    is_sqlite = "sqlite" in db_settings["ENGINE"]
+
+    try:
+        table_names = connection.introspection.table_names()
+
+        # view 목록을 획득하는 API 는 장고에서 지원하고 있지 않기에, 직접 쿼리를 통해 목록을 조회합니다.
+        if is_sqlserver:
+            with connection.cursor() as cursor:
+                # https://docs.microsoft.com/ko-kr/sql/relational-databases/system-compatibility-views/sys-sysobjects-transact-sql?view=sql-server-ver15
+                #  xtype : V (뷰), U (사용자 테이블), SQ (서비스 큐) 등
+                cursor.execute("SELECT name FROM sys.sysobjects WHERE xtype = 'V';")
+                view_names = [row[0] for row in cursor.fetchall()]
+        else:
+            # 다른 DB 엔진에 대해서는 구현되어 있지 않습니다.
+            view_names = []
+    finally:
+        connection.close()
+
+    for table_name in table_names + view_names:
+        current_db_alias = db_alias_dict_on_model_meta.get(table_name, db_alias)
+
+        db_alias_by_table_name[table_name] = current_db_alias
+
+        if is_sqlite:
+            db_name = current_db_alias
+        else:
+            try:
+                db_name = (
+                    current_db_alias
+                    if db_name_dict["default"] == current_db_alias
+                    else db_name_dict[current_db_alias]
+                )
+            except KeyError:
+                raise ImproperlyConfigured(
+                    f"{current_db_alias} 데이터베이스 설정이 누락되었습니다."
+                )
+
+        quoted_db_name = quote_name(db_name)
+        quoted_table_name = quote_name(table_name)
+
+        if is_sqlserver:
+            db_tables_mapping[
+                quoted_table_name
+            ] = f"{quoted_db_name}.{quote_name('dbo')}.{quoted_table_name}"
+        else:
+            db_tables_mapping[quoted_table_name] = f"{quoted_db_name}.{quoted_table_name}"
+
+    return db_alias_by_table_name, db_tables_mapping
+
+
+def scan_db_tables() -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    settings.PRIMARY_DB_ALIASES 의 각 DB 를 스레드 풀에서 동시에 조회하여,
+    table 별 db alias 와 db명을 붙인 table source 를 생성합니다.
+
+    조회 결과는 settings.PRIMARY_DB_ALIASES 순서대로 병합하므로, 순차 조회와 같은 결과를 얻습니다.
+    (여러 Databases 에 중복된 table_name 이 있으면 뒤에 선언된 alias 가 우선하며,
+    모델의 Meta.db_alias 가 지정된 table 은 항상 Meta.db_alias 를 따릅니다.)
+
+    :return: (PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME, _DB_TABLES_MAPPING) 에 반영할 dict
+    """
 
-        db_name_dict = {
-            db_alias: db_settings["NAME"]
-            for db_alias, db_settings in settings.DATABASES.items()
+    db_alias_by_table_name: Dict[str, str] = {}
+    db_tables_mapping: Dict[str, str] = {}
+
+    db_alias_dict_on_model_meta: Dict[str, str] = {
+        model_cls._meta.db_table: model_cls._meta.db_alias
+        for model_cls in apps.get_models()
+        if hasattr(model_cls._meta, "db_table") and hasattr(model_cls._meta, "db_alias")
+    }
+
+    # Replica 는 primary DB 와 같은 테이블을 가지므로 조회하지 않습니다.
+    db_name_dict = {
+        db_alias: settings.DATABASES[db_alias]["NAME"]
+        for db_alias in settings.PRIMARY_DB_ALIASES
+    }
+
+    max_workers = max(1, min(settings.DB_INTROSPECTION_MAX_WORKERS, len(db_name_dict)))
+    timeout = settings.DB_INTROSPECTION_TIMEOUT
+
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="scan_db_alias"
+    )
+    try:
+        future_by_db_alias = {
+            db_alias: executor.submit(
+                scan_db_alias, db_alias, db_alias_dict_on_model_meta, db_name_dict
+            )
+            for db_alias in settings.PRIMARY_DB_ALIASES
         }
 
-        # 여러 Databases에 걸쳐서 중복된 이름의 table_name이 존재할 수 있습니다.
-        for db_alias, db_settings in settings.DATABASES.items():
-            connection = connections[db_alias]
-            quote_name = connection.ops.quote_name
-            is_sqlserver = "pyodbc" in db_settings["ENGINE"]
-            is_sqlite = "sqlite" in db_settings["ENGINE"]
-
-            table_names = connection.introspection.table_names()
-
-            # view 목록을 획득하는 API 는 장고에서 지원하고 있지 않기에, 직접 쿼리를 통해 목록을 조회합니다.
-            if is_sqlserver:
-                with connection.cursor() as cursor:
-                    # https://docs.microsoft.com/ko-kr/sql/relational-databases/system-compatibility-views/sys-sysobjects-transact-sql?view=sql-server-ver15
-                    #  xtype : V (뷰), U (사용자 테이블), SQ (서비스 큐) 등
-                    cursor.execute("SELECT name FROM sys.sysobjects WHERE xtype = 'V';")
-                    view_names = [row[0] for row in cursor.fetchall()]
-            else:
-                # 다른 DB 엔진에 대해서는 구현되어 있지 않습니다.
-                view_names = []
-
-            for table_name in map(lambda s: s, table_names + view_names):
-                current_db_alias = db_alias_dict_on_model_meta.get(table_name, db_alias)
-
-                PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME[table_name] = current_db_alias
-
-                if is_sqlite:
-                    db_name = current_db_alias
-                else:
-                    try:
-                        db_name = (
-                            current_db_alias
-                            if db_name_dict["default"] == current_db_alias
-                            else db_name_dict[current_db_alias]
-                        )
-                    except KeyError:
-                        raise ImproperlyConfigured(
-                            f"{current_db_alias} 데이터베이스 설정이 누락되었습니다."
-                        )
-
-                quoted_db_name = quote_name(db_name)
-                quoted_table_name = quote_name(table_name)
-
-                if is_sqlserver:
-                    _DB_TABLES_MAPPING[
-                        quoted_table_name
-                    ] = f"{quoted_db_name}.{quote_name('dbo')}.{quoted_table_name}"
-                else:
-                    _DB_TABLES_MAPPING[
-                        quoted_table_name
-                    ] = f"{quoted_db_name}.{quoted_table_name}"
+        # 대기열에서 기다린 시간을 포함하여, 전체 조회를 하나의 제한 시간으로 기다립니다.
+        _, not_done = wait(future_by_db_alias.values(), timeout=timeout)
+        if not_done:
+            db_aliases = [
+                db_alias
+                for db_alias, future in future_by_db_alias.items()
+                if future in not_done
+            ]
+            raise ImproperlyConfigured(
+                f"{', '.join(db_aliases)} 데이터베이스 조회가 {timeout}초 내에 완료되지 않았습니다."
+            )
+
+        for future in future_by_db_alias.values():
+            alias_result, mapping_result = future.result()
+            db_alias_by_table_name.update(alias_result)
+            db_tables_mapping.update(mapping_result)
+    finally:
+        # 응답이 없는 조회 스레드의 종료를 기다리지 않고, 대기 중인 조회는 취소합니다.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return db_alias_by_table_name, db_tables_mapping
+
+
+def handle_app_ready(**kwargs):
+    """
+    프로세스 단위로 전역변수 형태로 _DB_TABLES_MAPPING 을 조사합니다.
+
+    DB_SCHEMA_SNAPSHOT_PATH 에 유효한 스냅샷 파일이 있으면 이를 사용하고,
+    스냅샷이 없거나 오래된 경우에만 DB 를 직접 조회합니다.
+    """
+
+    if _DB_TABLES_MAPPING:
+        return
+
+    started_at = time.perf_counter()
+
+    snapshot = load_schema_snapshot(settings.DB_SCHEMA_SNAPSHOT_PATH)
+    if snapshot is not None:
+        source = "snapshot"
+        db_alias_by_table_name, db_tables_mapping = snapshot
+    else:
+        source = "introspection"
+        db_alias_by_table_name, db_tables_mapping = scan_db_tables()
+
+    PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME.update(db_alias_by_table_name)
+    _DB_TABLES_MAPPING.update(db_tables_mapping)
+
+    patch_sql.reset()
+
+    print(
+        f"loaded {len(_DB_TABLES_MAPPING)} db tables from {source} "
+        f"in {time.perf_counter() - started_at:.3f}s.",
+        file=sys.stderr,
+    )
 
 
 app_ready.connect(handle_app_ready, dispatch_uid="handle_app_ready")
 
 
 class PatchSQL:
+    """
+    SQL 문자열 내의 quoted table name 을 _DB_TABLES_MAPPING 의 db_name.table_name 으로 치환합니다.
+
+    quote 문자로 감싸진 식별자를 하나의 정규표현식으로 한 번만 스캔하고, 매칭된 식별자를
+    dict 에서 조회하여 치환합니다. 테이블마다 re.sub 를 수행하지 않으므로
+    비용은 테이블 수와 무관하게 SQL 길이에만 비례합니다. 작은따옴표 문자열 리터럴 안은 치환하지 않습니다.
+
+    ORM 이 생성하는 SQL 문의 종류는 많지 않으므로, 치환 결과를 원본 SQL 문자열을 키로 하여
+    크기가 제한된 LRU 캐시에 보관합니다. 캐시 현황은 patch_sql.cache.info() 로 확인합니다.
+    """
+
+    def __init__(
+        self, mapping: Optional[Dict[str, str]] = None, cache_size: Optional[int] = None
+    ):
+        # mapping 을 지정하지 않으면 프로세스 전역의 _DB_TABLES_MAPPING 을 참조합니다.
+        self._mapping = mapping
+
+        if cache_size is None:
+            cache_size = settings.PATCH_SQL_CACHE_SIZE
+        self.cache = LRUCache(cache_size)
+
+    @property
+    def mapping(self) -> Dict[str, str]:
+        return _DB_TABLES_MAPPING if self._mapping is None else self._mapping
+
     @cached_property
-    def patterns(self):
-        patterns_ = []
-        for table_name, table_name_with_db_name in _DB_TABLES_MAPPING.items():
-            pattern = re.compile(re.escape(table_name), re.IGNORECASE)
-            patterns_.append((pattern, table_name_with_db_name))
-        return patterns_
+    def replacements(self) -> Dict[str, str]:
+        # 기존 동작과 같이 대소문자를 구분하지 않고 매칭합니다.
+        replacements_ = {}
+        for table_name, table_name_with_db_name in self.mapping.items():
+            replacements_.setdefault(table_name.lower(), table_name_with_db_name)
+        return replacements_
+
+    @cached_property
+    def pattern(self) -> Optional[Pattern]:
+        # DB 엔진별 quote 문자 쌍 ("", ``, [] 등)으로 감싸진 식별자를 매칭합니다.
+        quote_pairs = sorted(
+            {(table_name[0], table_name[-1]) for table_name in self.mapping}
+        )
+        if not quote_pairs:
+            return None
+
+        alternatives = [
+            f"{re.escape(open_quote)}[^{re.escape(close_quote)}]+{re.escape(close_quote)}"
+            for open_quote, close_quote in quote_pairs
+        ]
+        # 문자열 리터럴 안의 quote 문자가 식별자의 quote 로 짝지어지지 않도록 리터럴을 먼저 매칭하여 건너뜁니다.
+        if all(open_quote != "'" for open_quote, _ in quote_pairs):
+            alternatives.insert(0, "'(?:[^']|'')*'")
+        return re.compile("|".join(alternatives))
+
+    def reset(self):
+        """
+        mapping 이 변경되었을 때, 캐싱된 패턴과 치환 결과를 초기화합니다.
+        """
+        self.__dict__.pop("replacements", None)
+        self.__dict__.pop("pattern", None)
+        self.cache.clear()
+
+    def _replace(self, match) -> str:
+        quoted_name = match.group(0)
+        if quoted_name[0] == "'":
+            return quoted_name
+        return self.replacements.get(quoted_name.lower(), quoted_name)
+
+    def rewrite(self, sql: str) -> str:
+        pattern = self.pattern
+        if pattern is None:
+            return sql
+        return pattern.sub(self._replace, sql)
 
     def __call__(self, sql: str) -> str:
-        for pattern, table_name_with_db_name in self.patterns:
-            sql = pattern.sub(table_name_with_db_name, sql)
-        return sql
+        patched_sql = self.cache.get(sql)
+        if patched_sql is None:
+            patched_sql = self.rewrite(sql)
+            self.cache.set(sql, patched_sql)
+        return patched_sql
 
 
 patch_sql = PatchSQL()
 
 
+def is_compiler_mode() -> bool:
+    """
+    SQL Compiler 단계에서 테이블명에 DB명을 붙이는 모드인지 여부를 반환합니다.
+    """
+    return settings.DB_MULTI_JOIN_MODE == "compiler"
+
+
+#
+# Route queries by the db aliases they touch
+#
+
+
+# 컴파일 중인 쿼리가 참조하는 table 목록입니다. None 이면 table 을 수집하고 있지 않습니다.
+_touched_tables: ContextVar[Optional[Set[str]]] = ContextVar(
+    "touched_tables", default=None
+)
+
+
+# fan_out 과 같이 지정된 connection(QuerySet.using)의 테이블에서 그대로 수행하는 중인지 여부
+_using_connection_tables: ContextVar[bool] = ContextVar(
+    "using_connection_tables", default=False
+)
+
+
+def is_collecting_tables() -> bool:
+    return _touched_tables.get() is not None
+
+
+def is_using_connection_tables() -> bool:
+    return _using_connection_tables.get()
+
+
+def is_qualifying_tables() -> bool:
+    """
+    테이블명에 DB명을 붙여야 하는지 여부를 반환합니다.
+
+    fan_out 이나 하나의 db alias 만 참조하여 해당 alias 의 connection 에서 수행하는 쿼리는 DB명을 붙이지 않습니다.
+    """
+    return not is_using_connection_tables()
+
+
+@contextmanager
+def use_connection_tables():
+    """
+    블록 안의 쿼리는 DB명을 붙이거나 다른 connection 으로 라우팅하지 않고,
+    지정된 connection(QuerySet.using)의 테이블에서 그대로 수행합니다.
+
+    DATABASE_NAMES 로 복제된 같은 스키마의 DB 들에 같은 쿼리를 수행할 때 사용합니다.
+    """
+    token = _using_connection_tables.set(True)
+    try:
+        yield
+    finally:
+        _using_connection_tables.reset(token)
+
+
+class QueryRouteStats:
+    """
+    DB_MULTI_JOIN 시에 쿼리가 수행된 경로별 횟수를 집계합니다.
+
+     - single : 하나의 db alias 만 참조하여, DB명을 붙이지 않고 해당 alias 의 connection 에서 수행
+     - multi : 여러 db alias 를 참조하거나 트랜잭션 중이어서, DB명을 붙여 기존 connection 에서 수행
+    """
+
+    def __init__(self):
+        self._counter = Counter()
+        self._lock = Lock()
+
+    def add(self, route: str):
+        with self._lock:
+            self._counter[route] += 1
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {"single": self._counter["single"], "multi": self._counter["multi"]}
+
+
+query_route_stats = QueryRouteStats()
+
+
+def route_to_db_alias(compiler, db_alias: str) -> bool:
+    """
+    하나의 db alias 만 참조하는 쿼리를 해당 db alias 의 connection 에서 수행하도록 합니다.
+
+    :return: 해당 db alias 의 connection 에서 수행하면 True
+    """
+
+    current_db_alias = compiler.connection.alias
+    primary_db_alias = get_primary_db_alias(current_db_alias)
+
+    if primary_db_alias == db_alias:
+        return True
+
+    # 조회 쿼리가 db_for_read 에 의해 default connection 으로 라우팅된 경우에만 connection 을 전환합니다.
+    # 쓰기 쿼리나 select_for_update, 트랜잭션 중의 쿼리는 같은 트랜잭션에서 수행되도록(read-your-writes)
+    # 기존 connection 에서 수행합니다.
+    if (
+        primary_db_alias != "default"
+        or isinstance(compiler, (SQLInsertCompiler, SQLUpdateCompiler, SQLDeleteCompiler))
+        or compiler.query.select_for_update
+        or compiler.connection.in_atomic_block
+    ):
+        return False
+
+    if current_db_alias != primary_db_alias:
+        # default Replica 에서 조회하던 쿼리는 대상 db alias 의 Replica 에서 조회합니다.
+        db_alias = replica_selector.select(db_alias)
+
+    compiler.connection = connections[db_alias]
+    return True
+
+
+def get_db_aliases(table_names: Iterable[str]) -> Set[str]:
+    return {
+        PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME.get(table_name, "default")
+        for table_name in table_names
+    }
+
+
+def add_select_related_tables(
+    tables: Set[str], opts, select_related, max_depth: int, depth: int = 1
+):
+    """
+    select_related 로 JOIN 할 table 들을 tables 에 추가합니다.
+
+    select_related() 와 같이 필드를 지정하지 않으면, Django 와 같이 null 이 아닌 FK 를 max_depth 까지 따라갑니다.
+    """
+
+    if isinstance(select_related, dict):
+        fields = []
+        for field_name, next_select_related in select_related.items():
+            try:
+                fields.append((opts.get_field(field_name), next_select_related))
+            except FieldDoesNotExist:
+                continue
+    elif depth <= max_depth:
+        fields = [
+            (field, True)
+            for field in opts.fields
+            if field.is_relation and not field.null
+        ]
+    else:
+        return
+
+    for field, next_select_related in fields:
+        if not field.is_relation or field.related_model is None:
+            continue
+
+        related_opts = field.related_model._meta
+        tables.add(related_opts.db_table)
+        add_select_related_tables(
+            tables, related_opts, next_select_related, max_depth, depth + 1
+        )
+
+
+def get_query_tables(query) -> Set[str]:
+    """
+    컴파일 전에 query 가 참조하는 table 들을 조사합니다. (alias_map, extra_tables, select_related)
+
+    서브쿼리 등 컴파일 중에 추가되는 table 은 컴파일하면서 수집합니다.
+    """
+
+    tables = set(query.extra_tables)
+    tables.update(
+        join.table_name
+        for alias, join in query.alias_map.items()
+        if query.alias_refcount[alias]
+    )
+
+    if query.model is not None:
+        opts = query.get_meta()
+        tables.add(opts.db_table)
+        if query.select_related:
+            add_select_related_tables(
+                tables, opts, query.select_related, query.max_depth
+            )
+
+    return tables
+
+
+def compile_collecting_tables(
+    compiler, as_sql, touched_tables: Set[str], *args, **kwargs
+):
+    """
+    서브쿼리를 포함하여 컴파일 중에 참조하는 table 을 touched_tables 에 수집합니다.
+    """
+    token = _touched_tables.set(touched_tables)
+    try:
+        return as_sql(compiler, *args, **kwargs)
+    finally:
+        _touched_tables.reset(token)
+
+
+def route_query(compiler, as_sql, *args, **kwargs):
+    """
+    DB_MULTI_JOIN 시에 쿼리가 참조하는 table 들의 db alias 를 조사합니다.
+
+    컴파일 전에 조사한 table 들이 하나의 db alias 에 속하면, 해당 alias 의 connection 에서 DB명 치환 없이 컴파일합니다.
+    컴파일 중에 다른 db alias 의 table(서브쿼리 등)이 확인되거나, 여러 db alias 를 참조하거나,
+    connection 을 전환할 수 없으면 DB명을 붙여 기존 connection 에서 수행합니다.
+    """
+
+    # 서브쿼리는 바깥 쿼리에서 함께 조사합니다.
+    if (
+        not settings.DB_MULTI_JOIN
+        or is_collecting_tables()
+        or is_using_connection_tables()
+    ):
+        return as_sql(compiler, *args, **kwargs)
+
+    tables = get_query_tables(compiler.query)
+    db_aliases = get_db_aliases(tables)
+
+    if len(db_aliases) == 1:
+        connection = compiler.connection
+        if route_to_db_alias(compiler, next(iter(db_aliases))):
+            touched_tables = set(tables)
+            with use_connection_tables():
+                result = compile_collecting_tables(
+                    compiler, as_sql, touched_tables, *args, **kwargs
+                )
+
+            if get_db_aliases(touched_tables) == db_aliases:
+                query_route_stats.add("single")
+                return result
+
+            # 다른 db alias 의 table 을 참조하므로, DB명을 붙여 다시 컴파일합니다.
+            compiler.connection = connection
+
+    result = compile_collecting_tables(compiler, as_sql, set(), *args, **kwargs)
+    query_route_stats.add("multi")
+    return result
+
+
+#
+# Qualify table names in FROM/JOIN/UPDATE/DELETE for compiler mode
+#
+
+
+def qualify_table_name(quoted_table_name: str) -> str:
+    return patch_sql.replacements.get(quoted_table_name.lower(), quoted_table_name)
+
+
+def qualify_table_prefix(sql: str, prefix: str, quoted_table_name: str) -> str:
+    """
+    sql 이 `prefix + quoted_table_name` 으로 시작하면, 해당 테이블명만 db_name.table_name 으로 교체합니다.
+
+    compiler 모드에서 Django 가 테이블명을 생성하는 위치(FROM/JOIN, UPDATE, DELETE FROM, INSERT INTO)에만
+    DB명을 붙이므로, 테이블명과 같은 이름의 컬럼이나 alias 는 치환되지 않습니다.
+    """
+
+    table_sql = prefix + quoted_table_name
+    if not sql.startswith(table_sql):
+        return sql
+    return prefix + qualify_table_name(quoted_table_name) + sql[len(table_sql) :]
+
+
+def is_qualifying_in_compiler() -> bool:
+    return is_compiler_mode() and is_qualifying_tables()
+
+
+def patched_as_sql_in_base_table(self, compiler, connection):
+    sql, params = orig_as_sql_in_base_table(self, compiler, connection)
+    if not is_qualifying_in_compiler():
+        return sql, params
+
+    quoted_table_name = compiler.quote_name_unless_alias(self.table_name)
+    return qualify_table_prefix(sql, "", quoted_table_name), params
+
+
+orig_as_sql_in_base_table = BaseTable.as_sql
+BaseTable.as_sql = patched_as_sql_in_base_table
+print("patched as_sql member function in BaseTable class.", file=sys.stderr)
+
+
+def patched_as_sql_in_join(self, compiler, connection):
+    sql, params = orig_as_sql_in_join(self, compiler, connection)
+    if not is_qualifying_in_compiler():
+        return sql, params
+
+    quoted_table_name = compiler.quote_name_unless_alias(self.table_name)
+    return qualify_table_prefix(sql, f"{self.join_type} ", quoted_table_name), params
+
+
+orig_as_sql_in_join = Join.as_sql
+Join.as_sql = patched_as_sql_in_join
+print("patched as_sql member function in Join class.", file=sys.stderr)
+
+
 #
 # Patch SQLCompiler Query for select
 #
 
 
+def patched_as_sql_in_compiler(self, *args, **kwargs):
+    return route_query(self, orig_as_sql_in_compiler, *args, **kwargs)
+
+
+orig_as_sql_in_compiler = SQLCompiler.as_sql
+SQLCompiler.as_sql = patched_as_sql_in_compiler
+print("patched as_sql member function in SQLCompiler class.", file=sys.stderr)
+
+
 def patched_get_from_clause(self):
     """
     SQL from 절에서 table_name 문자열을 db_name.table_name 문자열로 변환하여,
@@ -142,6 +612,20 @@ def patched_get_from_clause(self):
 
     from_, f_params = orig_get_from_clause(self)
 
+    # 쿼리가 참조하는 table 을 수집합니다.
+    touched_tables = _touched_tables.get()
+    if touched_tables is not None:
+        touched_tables.update(
+            join.table_name
+            for alias, join in self.query.alias_map.items()
+            if self.query.alias_refcount[alias]
+        )
+        touched_tables.update(self.query.extra_tables)
+
+    # compiler 모드에서는 BaseTable/Join 에서 이미 DB명을 붙였습니다.
+    if not is_qualifying_tables() or is_compiler_mode():
+        return from_, f_params
+
     from_with_db_name = []
     for chunk in from_:
         chunk = patch_sql(chunk)
@@ -160,9 +644,30 @@ print("patched get_from_clause member function in SQLCompiler class.", file=sys.
 #
 
 
+def as_sql_in_insert_compiler(self):
+    if not is_qualifying_tables():
+        return orig_as_sql_in_insert_compiler(self)
+
+    if not is_compiler_mode():
+        return [
+            (patch_sql(sql), params)
+            for sql, params in orig_as_sql_in_insert_compiler(self)
+        ]
+
+    # 문장 맨 앞의 "INSERT INTO table_name" 부분만 DB명이 붙은 테이블명으로 교체합니다.
+    insert_statement = self.connection.ops.insert_statement(
+        ignore_conflicts=self.query.ignore_conflicts
+    )
+    quoted_table_name = self.connection.ops.quote_name(self.query.get_meta().db_table)
+
+    return [
+        (qualify_table_prefix(sql, f"{insert_statement} ", quoted_table_name), params)
+        for sql, params in orig_as_sql_in_insert_compiler(self)
+    ]
+
+
 def patched_as_sql_in_insert_compiler(self):
-    for sql, params in orig_as_sql_in_insert_compiler(self):
-        yield patch_sql(sql), params
+    return route_query(self, as_sql_in_insert_compiler)
 
 
 orig_as_sql_in_insert_compiler = SQLInsertCompiler.as_sql
@@ -175,11 +680,23 @@ print("patched as_sql member function in SQLInsertCompiler class.", file=sys.std
 #
 
 
-def patched_as_sql_in_update_compiler(self):
+def as_sql_in_update_compiler(self):
     sql, args = orig_as_sql_in_update_compiler(self)
+    if not is_qualifying_tables():
+        return sql, args
+
+    if is_compiler_mode():
+        # "UPDATE table_name SET" 의 테이블명만 교체합니다. (FROM 절의 서브쿼리는 BaseTable/Join 에서 처리)
+        quoted_table_name = self.quote_name_unless_alias(self.query.base_table)
+        return qualify_table_prefix(sql, "UPDATE ", quoted_table_name), args
+
     return patch_sql(sql), args
 
 
+def patched_as_sql_in_update_compiler(self):
+    return route_query(self, as_sql_in_update_compiler)
+
+
 orig_as_sql_in_update_compiler = SQLUpdateCompiler.as_sql
 SQLUpdateCompiler.as_sql = patched_as_sql_in_update_compiler
 print("patched as_sql member function in SQLUpdateCompiler class.", file=sys.stderr)
@@ -192,6 +709,14 @@ print("patched as_sql member function in SQLUpdateCompiler class.", file=sys.std
 
 def patched_as_sql_in_delete_compiler(self, query):
     sql, args = orig_as_sql_in_delete_compiler(self, query)
+    if not is_qualifying_tables():
+        return sql, args
+
+    if is_compiler_mode():
+        # "DELETE FROM table_name" 의 테이블명만 교체합니다.
+        quoted_table_name = self.quote_name_unless_alias(query.base_table)
+        return qualify_table_prefix(sql, "DELETE FROM ", quoted_table_name), args
+
     return patch_sql(sql), args
 
 
@@ -200,6 +725,18 @@ SQLDeleteCompiler._as_sql = patched_as_sql_in_delete_compiler
 print("patched _as_sql member function in SQLDeleteCompiler class.", file=sys.stderr)
 
 
+def patched_route_as_sql_in_delete_compiler(self):
+    return route_query(self, orig_route_as_sql_in_delete_compiler)
+
+
+orig_route_as_sql_in_delete_compiler = SQLDeleteCompiler.as_sql
+SQLDeleteCompiler.as_sql = patched_route_as_sql_in_delete_compiler
+print(
+    "patched as_sql member function in SQLDeleteCompiler class for routing.",
+    file=sys.stderr,
+)
+
+
 #
 # Patch SQLAggregateCompiler Query for aggregate
 #
@@ -207,6 +744,8 @@ print("patched _as_sql member function in SQLDeleteCompiler class.", file=sys.st
 
 def patched_as_sql_in_aggregate_compiler(self, query):
     sql, args = orig_as_sql_in_aggregate_compiler(self, query)
+    if is_compiler_mode():
+        return sql, args
     return patch_sql(sql), args
 
 
@@ -215,6 +754,59 @@ SQLAggregateCompiler._as_sql = patched_as_sql_in_aggregate_compiler
 print("patched as_sql member function in SQLAggregateCompiler class.", file=sys.stderr)
 
 
+def patched_route_as_sql_in_aggregate_compiler(self, *args, **kwargs):
+    # 서브쿼리의 from 절은 SQLCompiler 에서 치환되므로, 라우팅만 수행합니다.
+    return route_query(self, orig_as_sql_in_aggregate_compiler, *args, **kwargs)
+
+
+SQLAggregateCompiler.as_sql = patched_route_as_sql_in_aggregate_compiler
+print(
+    "patched as_sql member function in SQLAggregateCompiler class for routing.",
+    file=sys.stderr,
+)
+
+
+#
+# Patch SQLCompiler execute_sql for replica health and written queries
+#
+
+
+def send_query_written(compiler):
+    query_written.send(sender=compiler.query.model, db_alias=compiler.connection.alias)
+
+
+def patched_execute_sql_in_compiler(self, *args, **kwargs):
+    try:
+        result = orig_execute_sql_in_compiler(self, *args, **kwargs)
+    except OperationalError:
+        # 접속 오류가 발생한 Replica 는 일정 시간 동안 조회 대상에서 제외합니다.
+        replica_selector.mark_unhealthy(self.connection.alias)
+        raise
+
+    # SQLUpdateCompiler 는 SQLCompiler.execute_sql 로 수행되며, SQLDeleteCompiler 는 이를 그대로 사용합니다.
+    if isinstance(self, (SQLUpdateCompiler, SQLDeleteCompiler)):
+        send_query_written(self)
+    return result
+
+
+orig_execute_sql_in_compiler = SQLCompiler.execute_sql
+SQLCompiler.execute_sql = patched_execute_sql_in_compiler
+print("patched execute_sql member function in SQLCompiler class.", file=sys.stderr)
+
+
+def patched_execute_sql_in_insert_compiler(self, *args, **kwargs):
+    result = orig_execute_sql_in_insert_compiler(self, *args, **kwargs)
+    send_query_written(self)
+    return result
+
+
+orig_execute_sql_in_insert_compiler = SQLInsertCompiler.execute_sql
+SQLInsertCompiler.execute_sql = patched_execute_sql_in_insert_compiler
+print(
+    "patched execute_sql member function in SQLInsertCompiler class.", file=sys.stderr
+)
+
+
 #
 # Make DB_TABLES_MAPPING Global Variable
 #
@@ -223,16 +815,31 @@ print("patched as_sql member function in SQLAggregateCompiler class.", file=sys.
 def make_DB_TABLES_MAPPING(sender, connection, **kwargs):
     """
     SQLite 에서의 Multi Database 에서의 SQL JOIN 수행을 위해서, ATTACH 를 통해 db alias 를 지정합니다.
+
+    connection 당 한 번만 ATTACH 하며, CONN_MAX_AGE 로 connection 을 유지하면 요청마다 반복되지 않습니다.
     """
 
-    if "sqlite" in settings.UNIQUE_DB_ENGINE:
-        with connection.cursor() as cursor:
-            for db_alias, db_settings in settings.DATABASES.items():
-                # SQLite 에서의 Multi Database 에서의 SQL JOIN 수행을 위해서
-                # ATTACH 를 통해 db alias 를 지정합니다.
-                sql = f"""ATTACH DATABASE '{db_settings['NAME']}' AS '{db_alias}'"""
-                cursor.execute(sql)
+    if "sqlite" in settings.UNIQUE_DB_ENGINE and connection.vendor == "sqlite":
+        attach_databases(
+            connection,
+            {
+                db_alias: settings.DATABASES[db_alias]["NAME"]
+                for db_alias in settings.PRIMARY_DB_ALIASES
+            },
+        )
+
+
+def apply_sqlite_profile(sender, connection, **kwargs):
+    """
+    SQLite connection 생성 시 WAL 등의 PRAGMA 를 main 과 ATTACH 된 DB 에 적용합니다.
+    """
+
+    if connection.vendor == "sqlite":
+        apply_pragmas(connection)
 
 
 if settings.DB_MULTI_JOIN:
     connection_created.connect(make_DB_TABLES_MAPPING)
+
+# ATTACH 된 DB 에도 PRAGMA 가 적용되도록, make_DB_TABLES_MAPPING 보다 나중에 연결합니다.
+connection_created.connect(apply_sqlite_profile)
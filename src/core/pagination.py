@@ -0,0 +1,321 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Field, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .counts import CountPaginator, get_count
+
+# (attname 또는 관계 모델 컬럼의 `FK__컬럼` 경로, 내림차순 여부, nullable 여부)
+OrderingKey = Tuple[str, bool, bool]
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """
+    전체 개수를 캐싱된 count 나 DB 통계의 추정값으로 구합니다. (core.counts.get_count)
+    """
+
+    django_paginator_class = CountPaginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    정렬 기준(order_by 또는 Meta.ordering) + 기본키로 마지막 행 다음부터 조회하는 cursor 페이지네이션입니다.
+
+    OFFSET 없이 `WHERE (정렬 컬럼) > (마지막 행의 값)` 으로 조회하므로, 뒤쪽 페이지도 첫 페이지와 같은 비용으로 조회합니다.
+    ?cursor= 로 요청하면 사용하며, 응답의 next 를 다음 요청의 cursor 로 전달합니다. (마지막 페이지이면 null)
+
+    >>> GET /system/common_code/system_common_code_master/?cursor=&page_size=100
+    >>> {"count": 1234, "count_estimated": false, "next": "eyJvIjog...", "results": [...]}
+
+    ?count=false 로 요청하면 count 를 조회하지 않습니다. (null)
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    count_query_param = "count"
+    invalid_cursor_message = "cursor 가 올바르지 않습니다."
+
+    def __init__(self):
+        self.count: Optional[int] = None
+        self.count_estimated: Optional[bool] = None
+        self.next_cursor: Optional[str] = None
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        return request is not None and cls.cursor_query_param in request.query_params
+
+    def get_page_size(self, request) -> int:
+        page_size = request.query_params.get(self.page_size_query_param)
+        if page_size is None:
+            return settings.CURSOR_PAGE_SIZE
+
+        try:
+            page_size = int(page_size)
+        except ValueError:
+            raise ParseError(f"{self.page_size_query_param} 는 정수여야 합니다.")
+
+        return max(1, min(page_size, api_settings.PAGE_SIZE))
+
+    def get_ordering_keys(self, queryset: QuerySet) -> List[OrderingKey]:
+        """
+        QuerySet 의 정렬 기준을 (attname, 내림차순 여부, nullable 여부) 목록으로 반환합니다.
+
+        행을 유일하게 정렬하도록 기본키가 없으면 마지막에 추가합니다.
+        """
+
+        query = queryset.query
+        opts = queryset.model._meta
+        ordering = query.order_by or (opts.ordering if query.default_ordering else ())
+
+        keys = []
+        for field_name in ordering:
+            for key in self.resolve_ordering(opts, field_name):
+                if key[0] not in (k[0] for k in keys):
+                    keys.append(key)
+
+        if opts.pk.attname not in (key[0] for key in keys):
+            keys.append((opts.pk.attname, False, False))
+
+        return keys
+
+    def resolve_ordering(
+        self, opts, field_name, descending=False, path=(), nullable=False
+    ) -> List[OrderingKey]:
+        """
+        정렬 기준 항목을 정렬 키 목록으로 변환합니다.
+
+        Django 와 같이 FK 는 관계 모델의 Meta.ordering 으로 정렬하며, 이 경우 `FK__컬럼` 경로를 키로 사용합니다.
+        관계 모델에 Meta.ordering 이 없거나 `FK_id` 로 정렬하면 FK 컬럼으로 정렬합니다.
+        """
+
+        if not isinstance(field_name, str) or "__" in field_name or "?" in field_name:
+            raise ParseError(
+                f"{field_name}: cursor 페이지네이션은 모델 필드명으로만 정렬할 수 있습니다."
+            )
+
+        descending = descending != field_name.startswith("-")
+        field_name = field_name.lstrip("-")
+        try:
+            field: Field = opts.pk if field_name == "pk" else opts.get_field(field_name)
+        except FieldDoesNotExist:
+            raise ParseError(f"{field_name}: 정렬할 수 없는 필드입니다.")
+        if not field.concrete:
+            raise ParseError(f"{field_name}: 정렬할 수 없는 필드입니다.")
+
+        nullable = nullable or field.null
+        if (
+            not field.is_relation
+            or field_name in ("pk", field.attname)
+            or not field.related_model._meta.ordering
+        ):
+            return [(LOOKUP_SEP.join((*path, field.attname)), descending, nullable)]
+
+        keys = []
+        for related_name in field.related_model._meta.ordering:
+            keys += self.resolve_ordering(
+                field.related_model._meta,
+                related_name,
+                descending,
+                (*path, field.name),
+                nullable,
+            )
+        return keys
+
+    def get_key_field(self, queryset: QuerySet, attname: str) -> Field:
+        """
+        정렬 키(attname 또는 `FK__컬럼` 경로)의 모델 필드를 반환합니다.
+        """
+
+        *relations, attname = attname.split(LOOKUP_SEP)
+        opts = queryset.model._meta
+        for name in relations:
+            opts = opts.get_field(name).related_model._meta
+        return next(field for field in opts.concrete_fields if field.attname == attname)
+
+    @staticmethod
+    def get_key_alias(attname: str) -> str:
+        # 모델 instance 로 조회할 때 관계 모델의 정렬 컬럼 값을 조회할 annotation 이름
+        return "cursor_" + attname.replace(LOOKUP_SEP, "_")
+
+    def get_order_by(self, keys: List[OrderingKey]) -> list:
+        # DB 마다 다른 NULL 정렬 위치를 오름차순에서 가장 앞, 내림차순에서 가장 뒤로 고정합니다.
+        order_by = []
+        for attname, descending, nullable in keys:
+            if not nullable:
+                order_by.append(("-" if descending else "") + attname)
+            elif descending:
+                order_by.append(F(attname).desc(nulls_last=True))
+            else:
+                order_by.append(F(attname).asc(nulls_first=True))
+        return order_by
+
+    def get_keyset_filter(self, keys: List[OrderingKey], values: List[Any]) -> Q:
+        """
+        정렬 순서에서 values 다음에 위치하는 행들의 조건을 반환합니다.
+
+        (a, b, pk) > (x, y, z) 는 `a > x OR (a = x AND b > y) OR (a = x AND b = y AND pk > z)` 로 조회합니다.
+        """
+
+        condition = Q(pk__in=[])
+        equals = Q()
+        for (attname, descending, nullable), value in zip(keys, values):
+            if value is None:
+                after = None if descending else Q(**{f"{attname}__isnull": False})
+            elif descending:
+                after = Q(**{f"{attname}__lt": value})
+                if nullable:
+                    after |= Q(**{f"{attname}__isnull": True})
+            else:
+                after = Q(**{f"{attname}__gt": value})
+
+            if after is not None:
+                condition |= equals & after
+
+            equals &= (
+                Q(**{f"{attname}__isnull": True})
+                if value is None
+                else Q(**{attname: value})
+            )
+
+        # 첫 번째 정렬 컬럼의 범위 조건을 추가하여 index 를 사용하도록 합니다.
+        attname, descending, nullable = keys[0]
+        if values[0] is not None and not nullable:
+            condition &= Q(**{f"{attname}__{'lte' if descending else 'gte'}": values[0]})
+
+        return condition
+
+    def encode_cursor(
+        self, keys: List[OrderingKey], row, row_fields: Optional[List[str]] = None
+    ) -> str:
+        """
+        마지막 행(모델 instance 또는 values_list 의 tuple)의 정렬 컬럼 값으로 cursor 를 생성합니다.
+        """
+        if row_fields is None:
+            values = [
+                getattr(
+                    row,
+                    self.get_key_alias(attname) if LOOKUP_SEP in attname else attname,
+                )
+                for attname, _, _ in keys
+            ]
+        else:
+            values = [row[row_fields.index(attname)] for attname, _, _ in keys]
+
+        cursor = {
+            "o": [("-" if descending else "") + attname for attname, descending, _ in keys],
+            "v": values,
+        }
+        return (
+            base64.urlsafe_b64encode(
+                json.dumps(cursor, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+            )
+            .decode()
+            .rstrip("=")
+        )
+
+    def decode_cursor(self, queryset: QuerySet, keys: List[OrderingKey], encoded: str):
+        """
+        cursor 의 마지막 행의 값들을 반환합니다. 정렬 기준이 다른 cursor 는 거부합니다.
+        """
+
+        try:
+            cursor = json.loads(
+                base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode()
+            )
+            ordering = [
+                ("-" if descending else "") + attname for attname, descending, _ in keys
+            ]
+            if cursor["o"] != ordering or len(cursor["v"]) != len(keys):
+                raise NotFound(self.invalid_cursor_message)
+
+            return [
+                None
+                if value is None
+                else self.get_key_field(queryset, attname).to_python(value)
+                for (attname, _, _), value in zip(keys, cursor["v"])
+            ]
+        except (
+            binascii.Error,
+            UnicodeDecodeError,
+            ValueError,
+            TypeError,
+            KeyError,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None):
+        page_size = self.get_page_size(request)
+        keys = self.get_ordering_keys(queryset)
+
+        if request.query_params.get(self.count_query_param, "").lower() not in (
+            "0",
+            "false",
+        ):
+            self.count, self.count_estimated = get_count(queryset)
+
+        queryset = queryset.order_by(*self.get_order_by(keys))
+
+        # values_list 로 조회하면 cursor 를 생성할 정렬 컬럼을 함께 조회합니다.
+        row_fields = None
+        if queryset._fields is not None:
+            row_fields = list(queryset._fields)
+            missing = [attname for attname, _, _ in keys if attname not in row_fields]
+            if missing:
+                row_fields += missing
+                queryset = queryset.values_list(*row_fields)
+        else:
+            # .only() 로 조회하면 정렬 컬럼을 함께 조회합니다. (마지막 행의 cursor 생성 시 추가 쿼리 방지)
+            field_names, defer = queryset.query.deferred_loading
+            if not defer:
+                fields_by_attname = {
+                    field.attname: field for field in queryset.model._meta.concrete_fields
+                }
+                queryset = queryset.only(
+                    *field_names,
+                    *(
+                        fields_by_attname[attname].name
+                        for attname, _, _ in keys
+                        if LOOKUP_SEP not in attname
+                    ),
+                )
+            # 관계 모델의 정렬 컬럼은 관계 객체를 조회하지 않도록 annotation 으로 함께 조회합니다.
+            related_keys = [attname for attname, _, _ in keys if LOOKUP_SEP in attname]
+            if related_keys:
+                queryset = queryset.annotate(
+                    **{self.get_key_alias(attname): F(attname) for attname in related_keys}
+                )
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            values = self.decode_cursor(queryset, keys, encoded)
+            queryset = queryset.filter(self.get_keyset_filter(keys, values))
+
+        # 다음 페이지가 있는지 확인하기 위해 한 행을 더 조회합니다.
+        page = list(queryset[: page_size + 1])
+        if len(page) > page_size:
+            page = page[:page_size]
+            self.next_cursor = self.encode_cursor(keys, page[-1], row_fields)
+
+        return page
+
+    def get_paginated_response(self, data):
+        return Response(
+            dict(
+                count=self.count,
+                count_estimated=self.count_estimated,
+                next=self.next_cursor,
+                results=data,
+            )
+        )
@@ -0,0 +1,107 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import router
+from django.db.models import Model
+
+
+def chunked(values: Sequence[Any], chunk_size: int) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(values), chunk_size):
+        yield values[start : start + chunk_size]
+
+
+def prefetch_foreign_key(
+    instances: List[Model], field_name: str, chunk_size: Optional[int] = None
+) -> List[Model]:
+    """
+    instances 의 FK(field_name) 객체를 대상 모델의 db alias 에서 일괄 조회하여 캐싱합니다.
+
+    FK 값들을 chunk_size 단위로 `WHERE pk IN (...)` 조회하고, 조회 결과를 FK 값을 키로 하는
+    dict 로 만들어 각 instance 에 연결(hash join)합니다. 이미 캐싱된 instance 는 건너뜁니다.
+
+    :return: 조회된 FK 객체 목록
+    """
+
+    if not instances:
+        return []
+
+    chunk_size = chunk_size or settings.CROSS_DB_PREFETCH_CHUNK_SIZE
+
+    field = instances[0]._meta.get_field(field_name)
+    if not (field.many_to_one or field.one_to_one) or not field.concrete:
+        raise ImproperlyConfigured(
+            f"{instances[0].__class__.__name__}.{field_name} 은 ForeignKey 필드가 아닙니다."
+        )
+
+    # FK 값별 instance 목록
+    instances_by_key: Dict[Any, List[Model]] = defaultdict(list)
+    for instance in instances:
+        key = getattr(instance, field.attname)
+        if key is not None and not field.is_cached(instance):
+            instances_by_key[key].append(instance)
+
+    if not instances_by_key:
+        return []
+
+    related_model = field.related_model
+    target_field = field.target_field
+    db_alias = router.db_for_read(related_model)
+    queryset = related_model._base_manager.using(db_alias)
+
+    related_by_key: Dict[Any, Model] = {}
+    for keys in chunked(list(instances_by_key), chunk_size):
+        for related_instance in queryset.filter(**{f"{target_field.name}__in": keys}):
+            related_by_key[getattr(related_instance, target_field.attname)] = related_instance
+
+    for key, related_instance in related_by_key.items():
+        for instance in instances_by_key[key]:
+            field.set_cached_value(instance, related_instance)
+
+    return list(related_by_key.values())
+
+
+def prefetch_foreign_keys(
+    instances: Iterable[Model], lookups: Iterable[str], chunk_size: Optional[int] = None
+) -> List[Model]:
+    """
+    다른 DB 에 있는 FK 객체들을 lookup 별로 일괄 조회합니다.
+
+    settings.DB_MULTI_JOIN 이 False 일 때, 직렬화 중에 행마다 FK 조회 쿼리가 발생하지 않도록 합니다.
+    lookup 은 "fk__fk" 형태로 여러 단계의 FK 를 지정할 수 있습니다.
+
+    >>> prefetch_foreign_keys(details, ["common_cd_key"])
+
+    :return: FK 객체가 캐싱된 instance 목록
+    """
+
+    instances = list(instances)
+
+    # 같은 FK 를 공유하는 lookup 은 한 번만 조회합니다.
+    rest_lookups_by_field_name: Dict[str, List[str]] = defaultdict(list)
+    for lookup in lookups:
+        field_name, _, rest_lookup = lookup.partition("__")
+        rest_lookups = rest_lookups_by_field_name[field_name]
+        if rest_lookup:
+            rest_lookups.append(rest_lookup)
+
+    if not instances:
+        return instances
+
+    for field_name, rest_lookups in rest_lookups_by_field_name.items():
+        prefetch_foreign_key(instances, field_name, chunk_size)
+
+        if rest_lookups:
+            field = instances[0]._meta.get_field(field_name)
+            related_instances = {
+                id(related_instance): related_instance
+                for related_instance in (
+                    field.get_cached_value(instance, default=None)
+                    for instance in instances
+                )
+                if related_instance is not None
+            }
+            prefetch_foreign_keys(related_instances.values(), rest_lookups, chunk_size)
+
+    return instances
@@ -0,0 +1,57 @@
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Optional
+
+from django.db import connections
+
+
+class QueryCounter:
+    """
+    DB connection 의 execute_wrapper 로 설치되어 수행된 쿼리 수를 집계합니다.
+
+    batch 의 조회 스레드 등 여러 스레드의 connection 에 함께 설치될 수 있습니다.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._lock = Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+# 현재 요청의 QueryCounter (QueryCountMiddleware). 하위 요청을 수행하는 스레드는 복사된 context 로 이어받습니다.
+_query_counter: ContextVar[Optional[QueryCounter]] = ContextVar(
+    "query_counter", default=None
+)
+
+
+def get_query_counter() -> Optional[QueryCounter]:
+    return _query_counter.get()
+
+
+@contextmanager
+def count_queries(counter: Optional[QueryCounter] = None):
+    """
+    블록 안에서 현재 스레드의 connection 으로 수행되는 쿼리를 counter 로 집계합니다.
+
+    counter 를 지정하지 않으면 현재 context 의 QueryCounter 를 사용하며, 없으면 집계하지 않습니다.
+    """
+
+    if counter is None:
+        counter = _query_counter.get()
+    if counter is None:
+        yield counter
+        return
+
+    token = _query_counter.set(counter)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            yield counter
+    finally:
+        _query_counter.reset(token)
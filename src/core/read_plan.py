@@ -0,0 +1,369 @@
+from collections.abc import Mapping
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import QuerySet
+from flatten_dict import flatten, reducers
+from rest_framework import fields
+from rest_framework.fields import SkipField
+from rest_framework.relations import (
+    HyperlinkedIdentityField,
+    HyperlinkedRelatedField,
+    PKOnlyObject,
+    RelatedField,
+)
+
+from .utils import LRUCache
+
+# 직렬화 단계의 종류
+VALUE = "value"  # 모델 필드 값
+URL = "url"  # permalink (HyperlinkedIdentityField)
+FK_URL = "fk_url"  # FK URL (HyperlinkedRelatedField)
+FALLBACK = "fallback"  # DRF 필드로 직렬화
+
+# DB 에서 조회한 값을 그대로 응답하는 (DRF 필드, 모델 필드) 조합 : CharField 의 str(value), IntegerField 의 int(value)
+IDENTITY_FIELD_TYPES = (
+    (fields.CharField.to_representation, (models.CharField, models.TextField)),
+    (fields.IntegerField.to_representation, (models.IntegerField,)),
+)
+
+# dict 가 아닌 값으로 직렬화하는 DRF 필드 : 그 외의 필드는 CoreHyperlinkedSerializer 와 같이 flatten 하도록 FALLBACK 으로 직렬화합니다.
+SCALAR_FIELD_TYPES = (
+    fields.BooleanField,
+    fields.CharField,
+    fields.ChoiceField,
+    fields.DateField,
+    fields.DateTimeField,
+    fields.DecimalField,
+    fields.DurationField,
+    fields.FloatField,
+    fields.IntegerField,
+    fields.TimeField,
+    fields.UUIDField,
+)
+SCALAR_REPRESENTATIONS = {
+    field_type.to_representation for field_type in SCALAR_FIELD_TYPES
+}
+
+flatten_reducer = reducers.make_reducer(delimiter="__")
+
+# DRF 필드가 SkipField 를 발생시켜 응답에서 제외할 값
+SKIP = object()
+
+
+class LookupObject:
+    """
+    permalink 생성 시 모델 instance 대신 사용하는 객체입니다. (pk 와 lookup_field 값만 가집니다.)
+    """
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class ReadPlan:
+    """
+    CoreHyperlinkedSerializer 의 리스트 조회용 직렬화 계획입니다.
+
+    serializer 클래스(와 필드 구성)마다 한 번 compile 하며, 각 필드를 아래 단계로 직렬화합니다.
+
+    - 모델 필드 : DB 에서 조회한 값에 DRF 필드의 to_representation 만 수행 (str/int 값은 그대로 사용)
+    - permalink, FK URL : 기본키/FK 값으로 DRF 필드의 get_url 만 수행 (FK 객체를 조회하지 않습니다.)
+    - 그 외의 필드 : DRF 필드로 직렬화하고, 중첩된 dict 는 flatten 합니다.
+
+    모든 필드를 compile 하면 모델 instance 대신 .values_list() 로 필요한 컬럼만 조회합니다.
+    """
+
+    def __init__(self, model, steps: List[Tuple[str, str, Any]]):
+        self.model = model
+        self.steps = steps
+        self.values_only = all(kind != FALLBACK for kind, _, _ in steps)
+
+        self.columns: List[str] = []
+        if self.values_only:
+            for kind, _, column in steps:
+                if kind == VALUE:
+                    attnames = column[:1]
+                elif kind == FK_URL:
+                    attnames = (column,)
+                else:
+                    attnames = column
+
+                for attname in attnames:
+                    if attname not in self.columns:
+                        self.columns.append(attname)
+
+    def prepare(self, queryset: QuerySet) -> QuerySet:
+        """
+        values_only 이면 plan 의 컬럼만 조회하는 values_list QuerySet 을 반환합니다.
+        """
+        if not self.values_only:
+            return queryset
+        # FK 값으로 URL 을 생성하므로 관계 객체를 JOIN/prefetch 하지 않습니다.
+        return (
+            queryset.select_related(None)
+            .prefetch_related(None)
+            .values_list(*self.columns)
+        )
+
+    def bind(self, serializer) -> List[Tuple[str, Callable[[Any], Any], bool]]:
+        """
+        serializer 의 필드로 각 단계의 (필드명, getter, flatten 여부) 목록을 생성합니다.
+        """
+
+        request = serializer.context.get("request")
+        format = serializer.context.get("format")
+        serializer_fields = serializer.fields
+
+        getters = []
+        for kind, field_name, column in self.steps:
+            field = serializer_fields[field_name]
+
+            if kind == FALLBACK:
+                getters.append((field_name, self.get_fallback_getter(field), True))
+            elif kind == VALUE:
+                getters.append((field_name, self.get_value_getter(field, column), False))
+            elif kind == FK_URL:
+                getters.append(
+                    (
+                        field_name,
+                        self.get_fk_url_getter(field, column, request, format),
+                        False,
+                    )
+                )
+            else:
+                getters.append(
+                    (
+                        field_name,
+                        self.get_url_getter(field, column, request, format),
+                        False,
+                    )
+                )
+
+        return getters
+
+    def get_value_getter(self, field, column: Tuple[str, bool]):
+        to_representation = field.to_representation
+        attname, is_identity = column
+
+        if self.values_only:
+            index = self.columns.index(attname)
+            if is_identity:
+                return itemgetter(index)
+
+            def get_value(row):
+                value = row[index]
+                return None if value is None else to_representation(value)
+
+        else:
+
+            def get_value(instance):
+                value = getattr(instance, attname)
+                if value is None or is_identity:
+                    return value
+                return to_representation(value)
+
+        return get_value
+
+    def get_fk_url_getter(self, field, attname: str, request, format):
+        get_url = field.get_url
+        view_name = field.view_name
+        index = self.columns.index(attname) if self.values_only else None
+
+        def get_fk_url(row):
+            value = row[index] if index is not None else getattr(row, attname)
+            if value is None:
+                return None
+            return get_url(PKOnlyObject(pk=value), view_name, request, format)
+
+        return get_fk_url
+
+    def get_url_getter(self, field, column: Tuple[str, str], request, format):
+        get_url = field.get_url
+        view_name = field.view_name
+        pk_attname, lookup_attname = column
+
+        if not self.values_only:
+            return lambda instance: get_url(instance, view_name, request, format)
+
+        pk_index = self.columns.index(pk_attname)
+        lookup_index = self.columns.index(lookup_attname)
+        lookup_field = field.lookup_field
+
+        def get_url_from_row(row):
+            return get_url(
+                LookupObject(**{"pk": row[pk_index], lookup_field: row[lookup_index]}),
+                view_name,
+                request,
+                format,
+            )
+
+        return get_url_from_row
+
+    def get_fallback_getter(self, field):
+        def get_fallback(instance):
+            # DRF Serializer.to_representation 과 같이 직렬화합니다.
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                return SKIP
+
+            check_for_none = (
+                attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            )
+            if check_for_none is None:
+                return None
+            return field.to_representation(attribute)
+
+        return get_fallback
+
+    def to_representations(self, rows, serializer) -> List[Dict[str, Any]]:
+        """
+        rows(values_list 의 tuple 또는 모델 instance)를 CoreHyperlinkedSerializer 와 같은 결과로 직렬화합니다.
+        """
+
+        getters = self.bind(serializer)
+
+        if self.values_only:
+            return [{name: getter(row) for name, getter, _ in getters} for row in rows]
+
+        data_list = []
+        for row in rows:
+            data = {}
+            for name, getter, is_fallback in getters:
+                value = getter(row)
+                if value is SKIP:
+                    continue
+                if is_fallback and isinstance(value, Mapping):
+                    data.update(flatten({name: value}, reducer=flatten_reducer))
+                else:
+                    data[name] = value
+            data_list.append(data)
+        return data_list
+
+    def to_rows(self, rows, serializer) -> Tuple[List[str], List[List[Any]]]:
+        """
+        values_only 인 plan 으로 rows(values_list 의 tuple)를 (컬럼명 목록, 행 별 값 배열)로 직렬화합니다.
+
+        dict 를 생성하지 않고 to_representations 와 같은 순서의 값 배열을 생성합니다.
+        """
+
+        assert self.values_only, "values_only 인 plan 만 값 배열로 직렬화할 수 있습니다."
+
+        getters = self.bind(serializer)
+        columns = [name for name, _, _ in getters]
+        functions = [getter for _, getter, _ in getters]
+        return columns, [[getter(row) for getter in functions] for row in rows]
+
+
+def get_is_identity(field, model_field) -> bool:
+    to_representation = type(field).to_representation
+    return any(
+        to_representation is drf_to_representation
+        and isinstance(model_field, model_field_types)
+        for drf_to_representation, model_field_types in IDENTITY_FIELD_TYPES
+    )
+
+
+def compile_field(serializer, field) -> Tuple[str, Any]:
+    """
+    필드의 직렬화 단계 종류와 조회할 컬럼(attname)을 반환합니다. compile 할 수 없으면 FALLBACK 을 반환합니다.
+    """
+
+    opts = serializer.Meta.model._meta
+    field_type = type(field)
+
+    if isinstance(field, HyperlinkedIdentityField):
+        if field_type.to_representation is not HyperlinkedRelatedField.to_representation:
+            return FALLBACK, None
+
+        if field.lookup_field == "pk":
+            return URL, (opts.pk.attname, opts.pk.attname)
+
+        lookup_field = get_concrete_field(opts, field.lookup_field)
+        if lookup_field is None or lookup_field.is_relation:
+            return FALLBACK, None
+        return URL, (opts.pk.attname, lookup_field.attname)
+
+    if len(field.source_attrs) != 1:
+        return FALLBACK, None
+    model_field = get_concrete_field(opts, field.source_attrs[0])
+    if model_field is None:
+        return FALLBACK, None
+
+    if isinstance(field, HyperlinkedRelatedField):
+        if (
+            model_field.many_to_one
+            and field.lookup_field == "pk"
+            and field_type.get_attribute is RelatedField.get_attribute
+            and field_type.to_representation is HyperlinkedRelatedField.to_representation
+        ):
+            return FK_URL, model_field.attname
+        return FALLBACK, None
+
+    if (
+        isinstance(field, RelatedField)
+        or model_field.is_relation
+        or field_type.get_attribute is not fields.Field.get_attribute
+        or field_type.to_representation not in SCALAR_REPRESENTATIONS
+    ):
+        return FALLBACK, None
+
+    return VALUE, (model_field.attname, get_is_identity(field, model_field))
+
+
+def get_concrete_field(opts, field_name: str):
+    try:
+        model_field = opts.get_field(field_name)
+    except FieldDoesNotExist:
+        return None
+    return model_field if getattr(model_field, "concrete", False) else None
+
+
+# (serializer 클래스, 필드 구성)별 ReadPlan. ?fields= 로 필드 구성이 다양해질 수 있으므로 개수를 제한합니다.
+_read_plans = LRUCache(settings.READ_PLAN_CACHE_SIZE)
+_missing = object()
+
+
+def get_read_plan(serializer) -> Optional[ReadPlan]:
+    """
+    serializer 의 ReadPlan 을 반환합니다. compile 된 plan 을 사용할 수 없으면 None 을 반환합니다.
+
+    plan 은 serializer 클래스와 필드 구성별로 compile 하여 READ_PLAN_CACHE_SIZE 개까지 캐싱합니다.
+    """
+
+    from .serializers import CoreHyperlinkedSerializer
+
+    if not settings.SERIALIZER_COMPILED_READ:
+        return None
+
+    serializer_class = type(serializer)
+    if (
+        not isinstance(serializer, CoreHyperlinkedSerializer)
+        or not serializer_class.compiled_read
+        or serializer_class.to_representation
+        is not CoreHyperlinkedSerializer.to_representation
+    ):
+        return None
+
+    readable_fields = list(serializer._readable_fields)
+    key = (serializer_class, tuple(field.field_name for field in readable_fields))
+
+    plan = _read_plans.get(key, _missing)
+    if plan is not _missing:
+        return plan
+
+    steps = []
+    for field in readable_fields:
+        kind, column = compile_field(serializer, field)
+        steps.append((kind, field.field_name, column))
+
+    # 모든 필드를 DRF 로 직렬화해야 하면 plan 을 사용하지 않습니다.
+    plan = None
+    if any(kind != FALLBACK for kind, _, _ in steps):
+        plan = ReadPlan(serializer.Meta.model, steps)
+
+    _read_plans.set(key, plan)
+    return plan
@@ -0,0 +1,217 @@
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework.relations import HyperlinkedIdentityField, RelatedField
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from .models import PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME
+from .utils import LRUCache
+
+
+@dataclass(frozen=True)
+class RelatedPlan:
+    """
+    serializer 가 참조하는 관계 객체를 조회하는 계획입니다.
+
+    - select_related : 같은 쿼리에서 JOIN 으로 조회할 FK (one-to-one 포함)
+    - prefetch_related : 별도의 쿼리로 일괄 조회할 ManyToMany, 역참조 관계
+    - cross_db_prefetch : DB_MULTI_JOIN 이 False 일 때 다른 DB 에 있어 JOIN 할 수 없는 FK (core.prefetch)
+    """
+
+    select_related: Tuple[str, ...] = ()
+    prefetch_related: Tuple[str, ...] = ()
+    cross_db_prefetch: Tuple[str, ...] = ()
+
+    def apply(self, queryset: QuerySet) -> QuerySet:
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+def get_db_alias(model) -> str:
+    return PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME.get(model._meta.db_table, "default")
+
+
+# 관계 객체의 조회 방법
+SELECT = "select"  # select_related
+PREFETCH = "prefetch"  # prefetch_related
+CROSS_DB = "cross_db"  # core.prefetch.prefetch_foreign_keys
+
+
+class RelatedPlanBuilder:
+    """
+    serializer 의 필드를 순회하며 RelatedPlan 을 생성합니다.
+    """
+
+    def __init__(self, model):
+        self.db_alias = get_db_alias(model)
+        self.lookups: Dict[str, List[str]] = {SELECT: [], PREFETCH: [], CROSS_DB: []}
+
+    def build(self) -> RelatedPlan:
+        return RelatedPlan(
+            select_related=tuple(dict.fromkeys(self.lookups[SELECT])),
+            prefetch_related=tuple(dict.fromkeys(self.lookups[PREFETCH])),
+            cross_db_prefetch=tuple(dict.fromkeys(self.lookups[CROSS_DB])),
+        )
+
+    def add_serializer(
+        self,
+        serializer,
+        model,
+        prefix: List[str],
+        mode: str = SELECT,
+        field_names: Optional[Iterable[str]] = None,
+    ):
+        if field_names is not None:
+            field_names = set(field_names)
+
+        for field in serializer._readable_fields:
+            if field_names is not None and field.field_name not in field_names:
+                continue
+            if isinstance(field, HyperlinkedIdentityField):
+                continue
+
+            if field.source == "*":
+                # 같은 instance 를 직렬화하는 중첩 serializer
+                if is_single_serializer(field):
+                    self.add_serializer(field, model, prefix, mode)
+                continue
+
+            self.add_field(field, model, prefix, mode)
+
+    def add_field(self, field, model, prefix: List[str], mode: str):
+        source_attrs = field.source_attrs
+
+        # FK 의 기본키만 사용하는 필드(HyperlinkedRelatedField 등)는 FK 객체를 조회하지 않습니다.
+        if isinstance(field, RelatedField) and field.use_pk_only_optimization():
+            source_attrs = source_attrs[:-1]
+
+        path: List[str] = []
+        for attr in source_attrs:
+            model_field = get_relation_field(model, attr)
+            if model_field is None or model_field.related_model is None:
+                # GenericForeignKey 등은 조회 계획에서 제외합니다.
+                break
+
+            related_model = model_field.related_model
+            if model_field.many_to_many or model_field.one_to_many:
+                # ManyToMany, 역참조 : 별도의 쿼리로 일괄 조회합니다.
+                self.add_lookup(prefix + path, mode)
+                lookup = prefix + path + [attr]
+                self.add_lookup(lookup, PREFETCH)
+
+                if isinstance(field, ListSerializer):
+                    self.add_serializer(field.child, related_model, lookup, PREFETCH)
+                return
+
+            if mode == SELECT and not settings.DB_MULTI_JOIN:
+                # 다른 DB 의 테이블은 JOIN 할 수 없으므로, 대상 DB 에서 일괄 조회합니다.
+                if get_db_alias(related_model) != self.db_alias:
+                    self.add_lookup(prefix + path, mode)
+                    mode = CROSS_DB if model_field.concrete else PREFETCH
+
+            path.append(attr)
+            model = related_model
+        else:
+            # source 가 모두 관계 필드이면 중첩 serializer 의 필드도 함께 조회합니다.
+            if is_single_serializer(field):
+                self.add_serializer(field, model, prefix + path, mode)
+
+        self.add_lookup(prefix + path, mode)
+
+    def add_lookup(self, lookup: List[str], mode: str):
+        if lookup:
+            self.lookups[mode].append("__".join(lookup))
+
+
+def get_relation_field(model, attr: str):
+    """
+    모델의 attr 관계 필드를 반환합니다. 역참조는 accessor 명(예: detail_set)으로도 찾습니다.
+
+    관계 필드가 아니면(property 등 모델 필드가 아닌 source) None 을 반환합니다.
+    """
+    opts = model._meta
+    try:
+        field = opts.get_field(attr)
+    except FieldDoesNotExist:
+        field = next(
+            (
+                related_object
+                for related_object in opts.related_objects
+                if related_object.get_accessor_name() == attr
+            ),
+            None,
+        )
+
+    return field if field is not None and field.is_relation else None
+
+
+def is_single_serializer(field) -> bool:
+    return isinstance(field, BaseSerializer) and not isinstance(field, ListSerializer)
+
+
+# serializer 클래스별 관계 객체를 조회하는 필드명
+_relation_field_names: Dict[type, FrozenSet[str]] = {}
+_relation_field_names_lock = Lock()
+
+# (serializer 클래스, 관계 필드 구성, DB_MULTI_JOIN)별 RelatedPlan. ?fields= 로 구성이 다양해질 수 있으므로 개수를 제한합니다.
+_related_plans = LRUCache(settings.READ_PLAN_CACHE_SIZE)
+
+
+def get_relation_field_names(serializer_class, model) -> FrozenSet[str]:
+    """
+    serializer_class 의 필드 중 관계 객체를 조회해야 하는 필드명을 반환합니다.
+    """
+
+    try:
+        return _relation_field_names[serializer_class]
+    except KeyError:
+        pass
+
+    serializer = serializer_class()
+    field_names = set()
+    for field in serializer._readable_fields:
+        builder = RelatedPlanBuilder(model)
+        builder.add_serializer(serializer, model, [], field_names=[field.field_name])
+        if any(builder.lookups.values()):
+            field_names.add(field.field_name)
+
+    with _relation_field_names_lock:
+        return _relation_field_names.setdefault(
+            serializer_class, frozenset(field_names)
+        )
+
+
+def get_related_plan(
+    serializer_class, field_names: Optional[Iterable[str]] = None
+) -> RelatedPlan:
+    """
+    serializer_class 의 (field_names 로 줄인) 필드들이 참조하는 관계 객체의 RelatedPlan 을 반환합니다.
+
+    plan 은 요청한 필드 중 관계 객체를 조회하는 필드의 구성별로 생성하여 READ_PLAN_CACHE_SIZE 개까지 캐싱합니다.
+    serializer 에 없는 필드명은 무시합니다.
+    """
+
+    model = getattr(getattr(serializer_class, "Meta", None), "model", None)
+    if model is None:
+        return RelatedPlan()
+
+    if field_names is not None:
+        relation_field_names = get_relation_field_names(serializer_class, model)
+        field_names = tuple(sorted(relation_field_names.intersection(field_names)))
+    key = (serializer_class, field_names, settings.DB_MULTI_JOIN)
+
+    plan = _related_plans.get(key)
+    if plan is None:
+        builder = RelatedPlanBuilder(model)
+        builder.add_serializer(serializer_class(), model, [], field_names=field_names)
+        plan = builder.build()
+        _related_plans.set(key, plan)
+
+    return plan
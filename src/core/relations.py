@@ -0,0 +1,23 @@
+from rest_framework import relations
+
+from .reverse import reverse
+
+
+class CoreHyperlinkedRelatedField(relations.HyperlinkedRelatedField):
+    """
+    FK URL 을 core.reverse.reverse 로 생성합니다.
+    """
+
+    def __init__(self, view_name=None, **kwargs):
+        super().__init__(view_name, **kwargs)
+        self.reverse = reverse
+
+
+class CoreHyperlinkedIdentityField(relations.HyperlinkedIdentityField):
+    """
+    permalink 를 core.reverse.reverse 로 생성합니다.
+    """
+
+    def __init__(self, view_name=None, **kwargs):
+        super().__init__(view_name, **kwargs)
+        self.reverse = reverse
@@ -0,0 +1,120 @@
+import random
+import time
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.dispatch import receiver
+
+from .signals import query_written
+
+# 현재 요청(context)에서 Replica 대신 primary DB 를 사용해야 하는지 여부
+_primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+# 현재 요청(context)에서 쓰기가 발생했는지 여부. 요청 밖(management command 등)에서는 None 으로 기록하지 않습니다.
+_has_written: ContextVar[Optional[bool]] = ContextVar("has_written", default=None)
+
+
+def begin_request(primary_pinned: bool):
+    """
+    요청 시작 시 read-your-writes 상태를 초기화합니다. end_request 에 넘길 토큰을 반환합니다.
+    """
+    return _primary_pinned.set(primary_pinned), _has_written.set(False)
+
+
+def end_request(tokens):
+    primary_pinned_token, has_written_token = tokens
+    _primary_pinned.reset(primary_pinned_token)
+    _has_written.reset(has_written_token)
+
+
+def mark_written():
+    """
+    쓰기가 발생했음을 기록합니다. 이후 같은 요청에서의 조회는 primary DB 에서 수행됩니다.
+
+    begin_request 로 시작한 요청 안에서만 기록합니다.
+    """
+    if _has_written.get() is not None:
+        _has_written.set(True)
+
+
+@receiver(query_written, dispatch_uid="mark_written")
+def handle_query_written(sender, **kwargs):
+    mark_written()
+
+
+def has_written() -> bool:
+    return bool(_has_written.get())
+
+
+def get_primary_db_alias(db_alias: str) -> str:
+    """
+    Replica db alias 이면 primary db alias 를, 아니면 그대로 반환합니다.
+    """
+    for primary_db_alias, replicas in settings.DATABASE_REPLICAS.items():
+        for replica_db_alias, _ in replicas:
+            if replica_db_alias == db_alias:
+                return primary_db_alias
+    return db_alias
+
+
+def is_primary_pinned() -> bool:
+    return _primary_pinned.get() or has_written()
+
+
+class ReplicaSelector:
+    """
+    primary db alias 에 대한 Replica 를 상태(health)와 가중치(weight)에 따라 선택합니다.
+
+    요청 처리 중에 Replica 에 접속하여 상태를 확인하지 않습니다. 대신 쿼리 수행 중 접속 오류
+    (OperationalError)가 발생한 Replica 를 프로세스 단위로 DATABASE_REPLICA_HEALTH_CHECK_INTERVAL 초 동안
+    선택에서 제외하고, 이후 다시 선택될 때 상태를 확인합니다.
+    """
+
+    def __init__(self):
+        # replica db alias -> 선택에서 제외하는 만료 시각
+        self._unhealthy_until: Dict[str, float] = {}
+        self._lock = Lock()
+
+    def is_healthy(self, db_alias: str) -> bool:
+        unhealthy_until = self._unhealthy_until.get(db_alias)
+        return unhealthy_until is None or time.monotonic() >= unhealthy_until
+
+    def mark_unhealthy(self, db_alias: str):
+        if db_alias not in settings.REPLICA_DB_ALIASES:
+            return
+
+        with self._lock:
+            self._unhealthy_until[db_alias] = (
+                time.monotonic() + settings.DATABASE_REPLICA_HEALTH_CHECK_INTERVAL
+            )
+
+    def reset(self):
+        with self._lock:
+            self._unhealthy_until.clear()
+
+    def select(self, db_alias: str) -> str:
+        """
+        조회에 사용할 db alias 를 반환합니다.
+
+        쓰기가 발생한 요청이거나 정상 상태의 Replica 가 없으면 primary db alias 를 반환합니다.
+        """
+
+        replicas = settings.DATABASE_REPLICAS.get(db_alias)
+        if not replicas or is_primary_pinned():
+            return db_alias
+
+        candidates = [
+            (replica_db_alias, weight)
+            for replica_db_alias, weight in replicas
+            if weight > 0 and self.is_healthy(replica_db_alias)
+        ]
+        if not candidates:
+            return db_alias
+
+        replica_db_aliases, weights = zip(*candidates)
+        return random.choices(replica_db_aliases, weights=weights)[0]
+
+
+replica_selector = ReplicaSelector()
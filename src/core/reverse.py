@@ -0,0 +1,139 @@
+import re
+from functools import lru_cache
+from typing import Any, Optional
+from urllib.parse import quote
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_resolver, get_script_prefix, get_urlconf
+from django.utils.http import RFC3986_SUBDELIMS
+from django.utils.translation import get_language
+from rest_framework.reverse import reverse as drf_reverse
+from rest_framework.settings import api_settings
+
+# django.urls.reverse 가 quote 하지 않는 문자 (RFC 3986 pchar)
+URL_SAFE_CHARS = RFC3986_SUBDELIMS + "/~:@"
+
+
+class URLTemplate:
+    """
+    URL 인자가 하나인 URL 패턴의 앞/뒤 문자열을 미리 quote 해두고, 인자 값만 quote 하여 URL 을 생성합니다.
+
+    django.urls.reverse 와 같이 URL 패턴(정규식)에 맞지 않는 값이면 None 을 반환합니다.
+    """
+
+    def __init__(self, prefix: str, result: str, kwarg: str, pattern: str, converter):
+        before, after = result.split(f"%({kwarg})s")
+        before, after = before.replace("%%", "%"), after.replace("%%", "%")
+
+        self.before = prefix + before
+        self.after = after
+        self.quoted_before = quote(self.before, safe=URL_SAFE_CHARS)
+        self.quoted_after = quote(self.after, safe=URL_SAFE_CHARS)
+        self.regex = re.compile("^%s%s" % (re.escape(prefix), pattern))
+        self.converter = converter
+
+    def build(self, value: Any) -> Optional[str]:
+        if self.converter is not None:
+            try:
+                text = self.converter.to_url(value)
+            except ValueError:
+                return None
+        else:
+            text = str(value)
+
+        if not self.regex.search(self.before + text + self.after):
+            return None
+
+        url = self.quoted_before + quote(text, safe=URL_SAFE_CHARS) + self.quoted_after
+        # scheme 이 생략된 URL(//...)은 django.urls.reverse 가 escape 하므로 위임합니다.
+        return None if url.startswith("//") else url
+
+
+@lru_cache(maxsize=None)
+def get_url_template(
+    urlconf, script_prefix: str, language: str, viewname: str, kwarg: str
+) -> Optional[URLTemplate]:
+    """
+    django.urls.reverse(viewname, kwargs={kwarg: ...}) 가 사용할 URL 패턴의 URLTemplate 을 반환합니다.
+
+    namespace 가 있거나, 기본값(defaults)이 있는 등 URLTemplate 으로 생성할 수 없는 패턴이면 None 을 반환합니다.
+    """
+
+    if ":" in viewname:
+        return None
+
+    resolver = get_resolver(urlconf)
+    for possibility, pattern, defaults, converters in resolver.reverse_dict.getlist(
+        viewname
+    ):
+        for result, params in possibility:
+            # django.urls.reverse 가 처음으로 인자를 대입해볼 패턴을 사용합니다.
+            if {kwarg}.symmetric_difference(params).difference(defaults):
+                continue
+            if defaults or result.count(f"%({kwarg})s") != 1:
+                return None
+
+            return URLTemplate(
+                script_prefix, result, kwarg, pattern, converters.get(kwarg)
+            )
+
+    return None
+
+
+@receiver(setting_changed)
+def clear_url_templates(*, setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        get_url_template.cache_clear()
+
+
+def get_scheme_host(request) -> str:
+    """
+    request 의 scheme://host 를 반환합니다. 요청마다 한 번만 생성합니다.
+    """
+    http_request = getattr(request, "_request", request)
+    scheme_host = getattr(http_request, "_core_scheme_host", None)
+    if scheme_host is None:
+        scheme_host = request.build_absolute_uri("/")[:-1]
+        http_request._core_scheme_host = scheme_host
+    return scheme_host
+
+
+def reverse(viewname, args=None, kwargs=None, request=None, format=None, **extra):
+    """
+    rest_framework.reverse.reverse 와 같은 URL 을 생성합니다.
+
+    URL 인자가 하나이면 view name 의 URL 패턴을 (urlconf, script prefix)별로 한 번만 조회하고,
+    인자 값을 quote 하여 붙이는 방식으로 생성합니다. 그 외의 경우는 rest_framework 의 reverse 를 사용합니다.
+    """
+
+    if (
+        args
+        or extra
+        or format is not None
+        or not kwargs
+        or len(kwargs) != 1
+        or getattr(request, "versioning_scheme", None) is not None
+        or (
+            request is not None
+            and api_settings.URL_FORMAT_OVERRIDE
+            and api_settings.URL_FORMAT_OVERRIDE in request.GET
+        )
+    ):
+        return drf_reverse(viewname, args, kwargs, request, format, **extra)
+
+    ((kwarg, value),) = kwargs.items()
+    template = get_url_template(
+        get_urlconf(), get_script_prefix(), get_language(), viewname, kwarg
+    )
+    url = template.build(value) if template is not None else None
+    if url is None:
+        return drf_reverse(viewname, args, kwargs, request, format, **extra)
+
+    if request is None:
+        return url
+
+    # HttpRequest.build_absolute_uri 에서 urljoin 으로 처리하는 경로는 그대로 위임합니다.
+    if "/./" in url or "/../" in url:
+        return request.build_absolute_uri(url)
+    return get_scheme_host(request) + url
@@ -5,6 +5,7 @@ from django.conf import settings
 from django.db.models import Model
 
 from core.models import PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME
+from core.replicas import replica_selector
 
 
 class Router:
@@ -30,6 +31,10 @@ class Router:
         다중 DB 간의 JOIN을 지원할 때에는 default connection을 통해서
         쿼리가 수행되도록 합니다.
 
+        DATABASE_REPLICAS 가 설정된 경우에는 primary DB 대신 Replica 에서 조회합니다.
+        다중 DB 간의 JOIN 시에는 모든 DB를 복제하고 있는 Replica 서버의 default Replica 를 사용합니다.
+        단, 쓰기가 발생한 요청/클라이언트는 primary DB 에서 조회합니다. (read-your-writes)
+
         :param model_cls: 장고 모델 클래스
         :param hints:
 
@@ -37,9 +42,11 @@ class Router:
         """
 
         if settings.DB_MULTI_JOIN:
-            return "default"
+            db_alias = "default"
+        else:
+            db_alias = self._get_pre_scanned_db_alias(model_cls)
 
-        return self._get_pre_scanned_db_alias(model_cls)
+        return replica_selector.select(db_alias)
 
     def db_for_write(self, model_cls: Type[Model], **hints) -> str:
         """
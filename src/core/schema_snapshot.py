@@ -0,0 +1,103 @@
+import hashlib
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+
+# 스냅샷 파일 포맷이 바뀌면 버전을 올려서, 이전 포맷의 파일을 오래된 스냅샷으로 취급합니다.
+SCHEMA_SNAPSHOT_VERSION = 1
+
+
+def get_schema_fingerprint() -> str:
+    """
+    DB 접속 설정과 모델의 db_table/db_alias 조합으로 fingerprint 를 생성합니다.
+
+    둘 중 하나라도 바뀌면 스냅샷은 오래된 것으로 판단합니다.
+    """
+
+    databases = [
+        [
+            db_alias,
+            db_settings.get("ENGINE"),
+            db_settings.get("NAME"),
+            db_settings.get("HOST"),
+            db_settings.get("PORT"),
+        ]
+        for db_alias, db_settings in settings.DATABASES.items()
+    ]
+    models = [
+        [model_cls._meta.db_table, getattr(model_cls._meta, "db_alias", None)]
+        for model_cls in apps.get_models()
+    ]
+
+    source = json.dumps(
+        {"databases": sorted(databases), "models": sorted(models, key=str)},
+        default=str,
+    )
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def dump_schema_snapshot(
+    path,
+    db_alias_by_table_name: Dict[str, str],
+    db_tables_mapping: Dict[str, str],
+):
+    """
+    table 별 db alias 와 db명을 붙인 table source 를 스냅샷 파일로 저장합니다.
+    """
+
+    snapshot = {
+        "version": SCHEMA_SNAPSHOT_VERSION,
+        "fingerprint": get_schema_fingerprint(),
+        "created_at": datetime.now().isoformat(),
+        "PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME": db_alias_by_table_name,
+        "DB_TABLES_MAPPING": db_tables_mapping,
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # 저장 도중에 다른 프로세스가 읽더라도 깨진 파일을 읽지 않도록, 임시 파일에 쓴 뒤 교체합니다.
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(path)
+
+
+def load_schema_snapshot(path) -> Optional[Tuple[Dict[str, str], Dict[str, str]]]:
+    """
+    스냅샷 파일을 읽어들입니다. 파일이 없거나 오래된 경우 None 을 반환합니다.
+
+    :return: (PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME, _DB_TABLES_MAPPING) 에 반영할 dict
+    """
+
+    if not path:
+        return None
+
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    try:
+        with path.open(encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"failed to read db schema snapshot {path}: {e}", file=sys.stderr)
+        return None
+
+    if snapshot.get("version") != SCHEMA_SNAPSHOT_VERSION:
+        print(f"db schema snapshot {path} has an old version.", file=sys.stderr)
+        return None
+
+    if snapshot.get("fingerprint") != get_schema_fingerprint():
+        print(f"db schema snapshot {path} is stale.", file=sys.stderr)
+        return None
+
+    return (
+        snapshot["PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME"],
+        snapshot["DB_TABLES_MAPPING"],
+    )
@@ -1,14 +1,97 @@
 from core.utils import get_client_ip
+from django.conf import settings
 from django.db import models
 from flatten_dict import flatten, reducers
 from rest_framework import fields, serializers
 from rest_framework.request import Request
+from .relations import CoreHyperlinkedIdentityField, CoreHyperlinkedRelatedField
 from .rules import get_rules
 
 
+class CoreListSerializer(serializers.ListSerializer):
+    """
+    다수의 데이터를 검증 후 bulk_create/bulk_update 로 저장합니다.
+
+    batch 에서 같은 ViewSet 에 대한 연속된 쓰기 요청을 한 번에 저장할 때 사용합니다.
+    Model.save() 대신 Model.before_save() 만 호출되며, ManyToMany 필드는 저장하지 않습니다.
+    """
+
+    def to_internal_value(self, data):
+        if self.instance is None:
+            return super().to_internal_value(data)
+
+        # 각 데이터를 대응하는 instance 기준으로 검증합니다. (unique 검증 등)
+        self.child._bulk_instances = iter(self.instance)
+        try:
+            return super().to_internal_value(data)
+        finally:
+            del self.child._bulk_instances
+            self.child.instance = None
+
+    def save(self, **kwargs):
+        kwargs.update(self.child.get_system_field_values(is_create=self.instance is None))
+        return super().save(**kwargs)
+
+    def create(self, validated_data):
+        model_class = self.child.Meta.model
+
+        instances = [model_class(**attrs) for attrs in validated_data]
+        for instance in instances:
+            if hasattr(instance, "before_save"):
+                instance.before_save()
+
+        return model_class._default_manager.bulk_create(
+            instances, batch_size=settings.BATCH_BULK_WRITE_CHUNK_SIZE
+        )
+
+    def update(self, instances, validated_data):
+        model_class = self.child.Meta.model
+        opts = model_class._meta
+
+        field_names = set()
+        for instance, attrs in zip(instances, validated_data):
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+                field_names.add(attr)
+
+            if hasattr(instance, "before_save"):
+                instance.before_save()
+
+            # bulk_update 는 auto_now 필드를 갱신하지 않습니다.
+            for field in opts.concrete_fields:
+                if getattr(field, "auto_now", False):
+                    field.pre_save(instance, add=False)
+                    field_names.add(field.name)
+
+        field_names.discard(opts.pk.name)
+        if field_names:
+            model_class._default_manager.bulk_update(
+                instances,
+                sorted(field_names),
+                batch_size=settings.BATCH_BULK_WRITE_CHUNK_SIZE,
+            )
+
+        return instances
+
+
 class CoreHyperlinkedSerializer(serializers.HyperlinkedModelSerializer):
     url_field_name = "permalink"
 
+    # permalink, FK URL 을 URL 패턴 캐시로 생성합니다. (core.reverse)
+    serializer_related_field = CoreHyperlinkedRelatedField
+    serializer_url_field = CoreHyperlinkedIdentityField
+
+    # 리스트 조회 시 compile 된 직렬화 plan(core.read_plan)을 사용할지 여부
+    compiled_read = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # many=True 로 생성 시 CoreListSerializer 를 사용합니다.
+        meta = cls.__dict__.get("Meta")
+        if meta is not None and not hasattr(meta, "list_serializer_class"):
+            meta.list_serializer_class = CoreListSerializer
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -45,28 +128,43 @@ class CoreHyperlinkedSerializer(serializers.HyperlinkedModelSerializer):
         return CustomSerializer
 
     # Override
-    def save(self, *args, **kwargs):
+    def run_validation(self, data=fields.empty):
+        # CoreListSerializer 로 다수의 instance 를 수정할 때, 대응하는 instance 를 지정합니다.
+        bulk_instances = getattr(self, "_bulk_instances", None)
+        if bulk_instances is not None:
+            self.instance = next(bulk_instances)
+
+        return super().run_validation(data)
+
+    def get_system_field_values(self, is_create):
         """
-        Serializer를 통한 저장시 시스템 필드 정보를 request 객체로부터 받아와 저장토록 합니다.
+        request 객체로부터 저장할 시스템 필드(입력/수정 사용자 아이디, IP) 정보를 생성합니다.
         """
+        values = {}
+
         request: Request = self.context.get("request", None)
         if request is not None:
             ip = get_client_ip(request)
-            ip_field_name = (
-                "insert_user_ip" if self.instance is None else "update_user_ip"
-            )
+            ip_field_name = "insert_user_ip" if is_create else "update_user_ip"
 
             user_id = request.user.pk
-            user_id_field_name = (
-                "insert_user_id" if self.instance is None else "update_user_id"
-            )
+            user_id_field_name = "insert_user_id" if is_create else "update_user_id"
 
             # 관련 모델에 ip_field_name 필드가 있을 때에만 ip_field_name 필드에 대한 DB 저장을 시도합니다.
             field_names = {field.name for field in self.Meta.model._meta.get_fields()}
             if ip_field_name in field_names:
-                kwargs.update({ip_field_name: ip})
+                values.update({ip_field_name: ip})
             if user_id_field_name in field_names:
-                kwargs.update({user_id_field_name: user_id})
+                values.update({user_id_field_name: user_id})
+
+        return values
+
+    # Override
+    def save(self, *args, **kwargs):
+        """
+        Serializer를 통한 저장시 시스템 필드 정보를 request 객체로부터 받아와 저장토록 합니다.
+        """
+        kwargs.update(self.get_system_field_values(is_create=self.instance is None))
 
         return super().save(*args, **kwargs)
 
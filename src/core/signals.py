@@ -2,3 +2,6 @@ import django.dispatch
 
 
 app_ready = django.dispatch.Signal()
+
+# INSERT/UPDATE/DELETE 쿼리가 수행된 후 발생합니다. (sender : 모델 클래스, db_alias : 쿼리를 수행한 db alias)
+query_written = django.dispatch.Signal()
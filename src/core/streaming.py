@@ -0,0 +1,66 @@
+import json
+from itertools import islice
+from typing import Any, Iterable, Iterator, List
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+# 스트리밍 응답 형식 : JSON 배열, 한 줄에 하나의 JSON(NDJSON)
+STREAM_JSON = "json"
+STREAM_NDJSON = "ndjson"
+
+
+def to_json(data) -> str:
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False)
+
+
+def to_ndjson(data) -> str:
+    return to_json(data) + "\n"
+
+
+def chunked_iterator(iterable: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    """
+    iterable 을 chunk_size 개씩 나눈 리스트를 차례로 반환합니다.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_json_array(chunks: Iterable[List[Any]]) -> Iterator[str]:
+    yield "["
+    separator = ""
+    for chunk in chunks:
+        if chunk:
+            yield separator + ",".join(to_json(row) for row in chunk)
+            separator = ","
+    yield "]"
+
+
+def stream_ndjson(chunks: Iterable[List[Any]]) -> Iterator[str]:
+    for chunk in chunks:
+        yield "".join(to_ndjson(row) for row in chunk)
+
+
+def get_streaming_response(
+    chunks: Iterable[List[Any]], stream_format: str
+) -> StreamingHttpResponse:
+    """
+    chunk 단위로 직렬화된 행들을 JSON 배열 또는 NDJSON 으로 스트리밍합니다.
+
+    응답이 시작된 후에 조회하므로, 도중에 오류가 발생하면 응답이 중간에 끊깁니다.
+    """
+
+    if stream_format == STREAM_NDJSON:
+        return StreamingHttpResponse(
+            stream_ndjson(chunks), content_type=NDJSON_CONTENT_TYPE
+        )
+
+    return StreamingHttpResponse(
+        stream_json_array(chunks), content_type="application/json"
+    )
@@ -1,3 +1,1861 @@
-from django.test import TestCase
+import argparse
+import asyncio
+import contextvars
+import io
+import json
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from apps.system.common_code.serializers import (
+    SystemCommonCodeDetailSerializer,
+    SystemCommonCodeMasterSerializer,
+)
+from apps.system.models import (
+    SystemCommonCodeDetail,
+    SystemCommonCodeMaster,
+    SystemMenu,
+)
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import (
+    DatabaseError,
+    NotSupportedError,
+    OperationalError,
+    connection,
+    connections,
+    transaction,
+)
+from django.db.models import Avg, Count, Max, Min, Sum
+from django.http import HttpResponse
+from django.test import (
+    AsyncClient,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.test.utils import CaptureQueriesContext
+from django.urls import NoReverseMatch
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.reverse import reverse as drf_reverse
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework.viewsets import ModelViewSet
+
+from core.models import FanOutQuerySet, IdempotencyKey
+from core.models.patched_sql_compiler import (
+    _DB_TABLES_MAPPING,
+    PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME,
+    PatchSQL,
+    handle_app_ready,
+    is_collecting_tables,
+    is_using_connection_tables,
+    orig_as_sql_in_compiler,
+    patch_sql,
+    patched_execute_sql_in_compiler,
+    query_route_stats,
+    scan_db_tables,
+    use_connection_tables,
+)
+from core.counts import CountPaginator, get_count
+from core.management.commands.benchmark_patch_sql import Command, LoopPatchSQL
+from core.idempotency import (
+    DatabaseIdempotencyStore,
+    get_request_body,
+    run_idempotent,
+)
+from core.middleware import ReplicaPinningMiddleware, RequestCaptureMiddleware
+from core.prefetch import prefetch_foreign_keys
+from core.mixins import CoreMixin
+from core.pagination import KeysetPagination
+from core.read_plan import FALLBACK, get_read_plan
+from core.related_plan import RelatedPlan, get_related_plan
+from core.replicas import (
+    ReplicaSelector,
+    begin_request,
+    end_request,
+    has_written,
+    replica_selector,
+)
+from core.reverse import reverse
+from core.routers import Router
+from core.sqlite import apply_pragmas, attach_databases, get_attached_databases
+from core.schema_snapshot import (
+    SCHEMA_SNAPSHOT_VERSION,
+    dump_schema_snapshot,
+    load_schema_snapshot,
+)
+from core.utils import LRUCache
+from core.views import batch_async
+from runner import replay
+
+
+class MultiJoinTestMixin:
+    models = [SystemCommonCodeMaster, SystemCommonCodeDetail]
+
+    def setUp(self):
+        # SQLite 의 main 스키마를 DB명으로 사용하여 ATTACH 없이 DB명을 붙인 쿼리를 수행합니다.
+        quote_name = connection.ops.quote_name
+        mapping = {
+            quote_name(model_cls._meta.db_table): "{}.{}".format(
+                quote_name("main"), quote_name(model_cls._meta.db_table)
+            )
+            for model_cls in self.models
+        }
+        patcher = mock.patch.dict(_DB_TABLES_MAPPING, mapping, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(patch_sql.reset)
+        patch_sql.reset()
+
+        master = SystemCommonCodeMaster.objects.create(
+            common_cd_key="SYS/USE_YN",
+            system_div_cd="SYS",
+            common_cd="USE_YN",
+            common_cd_nm='"SYSTEM_COMMON_CODE_MASTER"',
+        )
+        for order, common_dtl_cd in enumerate(["Y", "N"], start=1):
+            SystemCommonCodeDetail.objects.create(
+                common_dtl_cd_key=f"SYS/USE_YN/{common_dtl_cd}",
+                common_dtl_cd=common_dtl_cd,
+                common_dtl_cd_nm=common_dtl_cd,
+                order=order,
+                common_cd_key=master,
+            )
+
+
+# 쿼리 라우팅 없이 DB명 치환만 비교합니다.
+@override_settings(DB_MULTI_JOIN=False)
+class MultiJoinModeEquivalenceTests(MultiJoinTestMixin, TestCase):
+    """
+    DB_MULTI_JOIN_MODE 의 regex/compiler 모드가 같은 결과를 반환하는지 확인합니다.
+    """
+
+    def run_in_each_mode(self, func):
+        results = {}
+        for mode in ("regex", "compiler"):
+            with override_settings(DB_MULTI_JOIN_MODE=mode):
+                results[mode] = func()
+        return results
+
+    def test_select_with_join(self):
+        def func():
+            queryset = SystemCommonCodeDetail.objects.select_related(
+                "common_cd_key"
+            ).filter(common_cd_key__common_cd_nm='"SYSTEM_COMMON_CODE_MASTER"')
+            return str(queryset.query), [
+                (row.pk, row.common_cd_key.common_cd_nm) for row in queryset
+            ]
+
+        results = self.run_in_each_mode(func)
+
+        self.assertEqual(results["regex"][1], results["compiler"][1])
+        self.assertEqual(len(results["compiler"][1]), 2)
+        self.assertIn('"main"."SYSTEM_COMMON_CODE_DETAIL"', results["compiler"][0])
+        self.assertIn('"main"."SYSTEM_COMMON_CODE_MASTER"', results["compiler"][0])
+
+    def test_aggregate(self):
+        def func():
+            return SystemCommonCodeMaster.objects.annotate(
+                detail_count=Count("systemcommoncodedetail")
+            ).aggregate(total=Count("pk"))
+
+        results = self.run_in_each_mode(func)
+
+        self.assertEqual(results["regex"], results["compiler"])
+
+    def test_insert_update_delete(self):
+        def func():
+            with CaptureQueriesContext(connection) as context:
+                master = SystemCommonCodeMaster.objects.create(
+                    system_div_cd="SYS", common_cd="DIV", common_cd_nm="구분"
+                )
+                SystemCommonCodeMaster.objects.filter(pk=master.pk).update(
+                    common_cd_nm="시스템구분"
+                )
+                common_cd_nm = SystemCommonCodeMaster.objects.get(
+                    pk=master.pk
+                ).common_cd_nm
+                deleted, _ = SystemCommonCodeMaster.objects.filter(
+                    pk=master.pk
+                ).delete()
+
+            is_qualified = all(
+                '"main"."SYSTEM_COMMON_CODE_MASTER"' in query["sql"]
+                for query in context.captured_queries
+            )
+            return common_cd_nm, deleted, is_qualified
+
+        results = self.run_in_each_mode(func)
+
+        self.assertEqual(results["regex"], ("시스템구분", 1, True))
+        self.assertEqual(results["regex"], results["compiler"])
+
+    @override_settings(DB_MULTI_JOIN_MODE="compiler")
+    def test_column_named_like_table_in_compiler_mode(self):
+        # 컬럼명(COMMON_CD)과 같은 이름의 테이블이 다른 DB 에 있는 경우
+        quote_name = connection.ops.quote_name
+        _DB_TABLES_MAPPING[quote_name("COMMON_CD")] = "{}.{}".format(
+            quote_name("main"), quote_name("COMMON_CD")
+        )
+        patch_sql.reset()
+
+        with CaptureQueriesContext(connection) as context:
+            queryset = SystemCommonCodeDetail.objects.select_related(
+                "common_cd_key"
+            ).filter(common_cd_key__common_cd="USE_YN")
+            self.assertEqual(
+                sorted(row.common_cd_key.common_cd for row in queryset),
+                ["USE_YN", "USE_YN"],
+            )
+            self.assertEqual(
+                SystemCommonCodeMaster.objects.filter(common_cd="USE_YN").update(
+                    common_cd_nm="사용여부"
+                ),
+                1,
+            )
+            self.assertEqual(
+                SystemCommonCodeMaster.objects.filter(common_cd="USE_YN").count(), 1
+            )
+
+        for query in context.captured_queries:
+            self.assertNotIn('"main"."COMMON_CD"', query["sql"])
+            self.assertIn('"main"."SYSTEM_COMMON_CODE_MASTER"', query["sql"])
+
+
+@override_settings(DB_MULTI_JOIN=True)
+class QueryRouteTests(MultiJoinTestMixin, TestCase):
+    """
+    하나의 db alias 만 참조하는 쿼리는 DB명 치환 없이 수행되는지 확인합니다.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        # Detail 테이블만 다른 db alias 에 속한 것으로 지정합니다.
+        patcher = mock.patch.dict(
+            PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME,
+            {
+                SystemCommonCodeMaster._meta.db_table: "default",
+                SystemCommonCodeDetail._meta.db_table: "other",
+            },
+            clear=True,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def capture(self, func):
+        before = query_route_stats.info()
+        with CaptureQueriesContext(connection) as context:
+            func()
+        after = query_route_stats.info()
+        routes = {route: after[route] - before[route] for route in after}
+        return context.captured_queries[-1]["sql"], routes
+
+    def capture_compiled_once(self, func):
+        with mock.patch(
+            "core.models.patched_sql_compiler.orig_as_sql_in_compiler",
+            wraps=orig_as_sql_in_compiler,
+        ) as as_sql:
+            sql, routes = self.capture(func)
+
+        self.assertEqual(as_sql.call_count, 1)
+        return sql, routes
+
+    def test_single_alias_query_is_routed(self):
+        sql, routes = self.capture_compiled_once(
+            lambda: list(SystemCommonCodeMaster.objects.filter(system_div_cd="SYS"))
+        )
+
+        self.assertEqual(routes, {"single": 1, "multi": 0})
+        self.assertNotIn('"main".', sql)
+        self.assertIn('"SYSTEM_COMMON_CODE_MASTER"', sql)
+
+    def test_multi_alias_query_is_rewritten(self):
+        sql, routes = self.capture_compiled_once(
+            lambda: list(
+                SystemCommonCodeMaster.objects.filter(
+                    systemcommoncodedetail__common_dtl_cd="Y"
+                )
+            )
+        )
+
+        self.assertEqual(routes, {"single": 0, "multi": 1})
+        self.assertIn('"main"."SYSTEM_COMMON_CODE_DETAIL"', sql)
+
+        # select_related 로 JOIN 할 table 도 컴파일 전에 조사합니다.
+        sql, routes = self.capture_compiled_once(
+            lambda: list(SystemCommonCodeDetail.objects.select_related())
+        )
+
+        self.assertEqual(routes, {"single": 0, "multi": 1})
+        self.assertIn('"main"."SYSTEM_COMMON_CODE_MASTER"', sql)
+
+    def test_subquery_of_other_alias_is_rewritten(self):
+        details = SystemCommonCodeDetail.objects.filter(common_dtl_cd="Y")
+        queryset = SystemCommonCodeMaster.objects.filter(
+            pk__in=details.values("common_cd_key")
+        )
+
+        sql, routes = self.capture(lambda: self.assertEqual(len(queryset), 1))
+
+        self.assertEqual(routes, {"single": 0, "multi": 1})
+        self.assertIn('"main"."SYSTEM_COMMON_CODE_MASTER"', sql)
+        self.assertIn('"main"."SYSTEM_COMMON_CODE_DETAIL"', sql)
+
+    def test_read_your_writes_in_atomic_request(self):
+        # Detail 테이블은 "other" db alias 에 속하지만, 트랜잭션 중에는 connection 을 전환하지 않습니다.
+        @transaction.atomic
+        def view(request):
+            SystemCommonCodeDetail.objects.db_manager("default").create(
+                common_dtl_cd_key="SYS/USE_YN/U",
+                common_dtl_cd="U",
+                common_dtl_cd_nm="U",
+                order=3,
+                common_cd_key_id="SYS/USE_YN",
+            )
+            return HttpResponse(
+                SystemCommonCodeDetail.objects.filter(common_dtl_cd="U").count()
+            )
+
+        response = None
+
+        def func():
+            nonlocal response
+            response = view(RequestFactory().post("/"))
+
+        sql, routes = self.capture(func)
+
+        self.assertEqual(response.content, b"1")
+        self.assertEqual(routes, {"single": 0, "multi": 2})
+
+    def test_fan_out_mode_query_is_not_routed(self):
+        def func():
+            with use_connection_tables():
+                self.assertFalse(is_collecting_tables())
+                list(
+                    SystemCommonCodeMaster.objects.filter(
+                        systemcommoncodedetail__common_dtl_cd="Y"
+                    )
+                )
+
+        sql, routes = self.capture(func)
+
+        self.assertEqual(routes, {"single": 0, "multi": 0})
+        self.assertNotIn('"main".', sql)
+
+
+class PartitionedFanOutQuerySet(FanOutQuerySet):
+    """
+    테스트 DB 는 하나이므로, system_div_cd 로 나눈 데이터를 각 db alias 의 조회 결과로 사용합니다.
+    """
+
+    def run(self, func):
+        with use_connection_tables():
+            return {
+                db_alias: func(self.queryset.filter(system_div_cd=db_alias))
+                for db_alias in self.db_aliases
+            }
+
+
+class FanOutQuerySetTests(TestCase):
+    def setUp(self):
+        for system_div_cd, orders in (("A", [1, 3, 5]), ("B", [2, 4])):
+            for order in orders:
+                SystemCommonCodeMaster.objects.create(
+                    system_div_cd=system_div_cd,
+                    common_cd=f"CD{order}",
+                    common_cd_nm=f"CD{order}",
+                    order=order,
+                )
+
+        self.queryset = PartitionedFanOutQuerySet(
+            SystemCommonCodeMaster.objects.all(), ["A", "B"]
+        )
+
+    def test_ordered_merge_across_aliases(self):
+        self.assertEqual(
+            [row.order for row in self.queryset.order_by("order")], [1, 2, 3, 4, 5]
+        )
+        self.assertEqual(
+            [row.order for row in self.queryset.order_by("-order")], [5, 4, 3, 2, 1]
+        )
+
+    def test_count_and_aggregate_are_merged(self):
+        self.assertEqual(self.queryset.count(), 5)
+        self.assertEqual(self.queryset.filter(order__gt=2).count(), 3)
+        self.assertEqual(
+            self.queryset.aggregate(
+                count=Count("pk"),
+                total=Sum("order"),
+                min_order=Min("order"),
+                max_order=Max("order"),
+            ),
+            {"count": 5, "total": 15, "min_order": 1, "max_order": 5},
+        )
+        self.assertEqual(
+            self.queryset.filter(order__gt=5).aggregate(
+                count=Count("pk"), total=Sum("order")
+            ),
+            {"count": 0, "total": None},
+        )
+
+        with self.assertRaises(NotSupportedError):
+            self.queryset.aggregate(average=Avg("order"))
+
+    def test_page(self):
+        queryset = self.queryset.order_by("order")
+
+        page = queryset.page(2, 2)
+        self.assertEqual(page["count"], 5)
+        self.assertEqual([row.order for row in page["results"]], [3, 4])
+
+        self.assertEqual([row.order for row in queryset.page(3, 2)["results"]], [5])
+
+    def test_run_uses_fan_out_mode_in_each_thread(self):
+        queryset = FanOutQuerySet(SystemCommonCodeMaster.objects.all(), ["default"])
+
+        result = queryset.run(
+            lambda queryset: (is_using_connection_tables(), queryset.db)
+        )
+
+        self.assertEqual(result, {"default": (True, "default")})
+        self.assertFalse(is_using_connection_tables())
+
+
+class LRUCacheTests(SimpleTestCase):
+    def test_least_recently_used_key_is_evicted(self):
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(
+            cache.info(),
+            {"hits": 3, "misses": 1, "evictions": 1, "size": 2, "maxsize": 2},
+        )
+
+        cache.reset()
+        self.assertEqual(
+            cache.info(),
+            {"hits": 0, "misses": 0, "evictions": 0, "size": 0, "maxsize": 2},
+        )
+
+    def test_zero_size_cache_does_not_count_misses(self):
+        cache = LRUCache(0)
+        cache.set("a", 1)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.info()["misses"], 0)
+        self.assertEqual(cache.info()["size"], 0)
+
+    def test_patch_sql_reset_clears_cached_rewrites(self):
+        mapping = {'"A"': '"db1"."A"'}
+        patch = PatchSQL(mapping, cache_size=1)
+        self.assertEqual(patch('SELECT * FROM "A"'), 'SELECT * FROM "db1"."A"')
+
+        mapping['"A"'] = '"db2"."A"'
+        self.assertEqual(patch('SELECT * FROM "A"'), 'SELECT * FROM "db1"."A"')
+
+        patch.reset()
+        self.assertEqual(patch('SELECT * FROM "A"'), 'SELECT * FROM "db2"."A"')
+
+    def test_patch_sql_matches_per_table_rewrite(self):
+        mapping = {f'"TABLE_{i}"': f'"db"."TABLE_{i}"' for i in range(3)}
+        patch = PatchSQL(mapping, cache_size=0)
+        loop_patch = LoopPatchSQL(mapping)
+
+        for sql in (
+            Command.make_sql(connection.ops.quote_name, 3),
+            'SELECT "table_0"."ID" FROM "table_0"',
+            # 리터럴 안의 " 가 뒤의 테이블명과 짝지어지지 않아야 합니다.
+            'SELECT \'a"b\' AS "X", "TABLE_1"."ID" FROM "TABLE_1"',
+            'SELECT "TABLE_0"."ID" FROM "TABLE_0" WHERE "TABLE_0"."NM" = \'it\'\'s "\''
+            ' AND "TABLE_2"."ID" = "TABLE_0"."ID"',
+        ):
+            with self.subTest(sql=sql):
+                self.assertEqual(patch(sql), loop_patch(sql))
+
+        # 문자열 리터럴 안은 치환하지 않습니다.
+        self.assertEqual(
+            patch('SELECT \'"TABLE_0"\' FROM "TABLE_0"'),
+            'SELECT \'"TABLE_0"\' FROM "db"."TABLE_0"',
+        )
+
+
+class SchemaSnapshotTests(SimpleTestCase):
+    db_alias_by_table_name = {"SYSTEM_COMMON_CODE_MASTER": "default"}
+    db_tables_mapping = {
+        '"SYSTEM_COMMON_CODE_MASTER"': '"main"."SYSTEM_COMMON_CODE_MASTER"'
+    }
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = Path(tmp_dir.name) / "db_schema_snapshot.json"
+
+        # 스냅샷 로드 결과 출력을 숨깁니다.
+        stderr_patcher = mock.patch("sys.stderr", new_callable=io.StringIO)
+        stderr_patcher.start()
+        self.addCleanup(stderr_patcher.stop)
+
+    def dump(self, **overrides):
+        dump_schema_snapshot(
+            self.path, self.db_alias_by_table_name, self.db_tables_mapping
+        )
+        if overrides:
+            snapshot = json.loads(self.path.read_text(encoding="utf-8"))
+            snapshot.update(overrides)
+            self.path.write_text(json.dumps(snapshot), encoding="utf-8")
+
+    def test_round_trip(self):
+        self.dump()
+
+        self.assertEqual(
+            load_schema_snapshot(self.path),
+            (self.db_alias_by_table_name, self.db_tables_mapping),
+        )
+
+    def test_missing_stale_or_old_version_snapshot_is_ignored(self):
+        self.assertIsNone(load_schema_snapshot(self.path))
+
+        self.dump(fingerprint="stale")
+        self.assertIsNone(load_schema_snapshot(self.path))
+
+        self.dump(version=SCHEMA_SNAPSHOT_VERSION - 1)
+        self.assertIsNone(load_schema_snapshot(self.path))
+
+        self.path.write_text("{", encoding="utf-8")
+        self.assertIsNone(load_schema_snapshot(self.path))
+
+    def run_handle_app_ready(self):
+        scanned = ({"SCANNED": "default"}, {'"SCANNED"': '"main"."SCANNED"'})
+        with mock.patch.dict(_DB_TABLES_MAPPING, clear=True), mock.patch.dict(
+            PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME, clear=True
+        ), mock.patch(
+            "core.models.patched_sql_compiler.scan_db_tables", return_value=scanned
+        ) as scan_db_tables, override_settings(
+            DB_SCHEMA_SNAPSHOT_PATH=str(self.path)
+        ):
+            handle_app_ready()
+            result = dict(PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME), dict(_DB_TABLES_MAPPING)
+
+        patch_sql.reset()
+        return scan_db_tables.called, result
+
+    def test_app_ready_uses_valid_snapshot(self):
+        self.dump()
+
+        scanned, result = self.run_handle_app_ready()
+
+        self.assertFalse(scanned)
+        self.assertEqual(result, (self.db_alias_by_table_name, self.db_tables_mapping))
+
+    def test_app_ready_falls_back_to_introspection(self):
+        for overrides in ({"fingerprint": "stale"}, {"version": 0}):
+            with self.subTest(**overrides):
+                self.dump(**overrides)
+
+                scanned, result = self.run_handle_app_ready()
+
+                self.assertTrue(scanned)
+                self.assertEqual(result[1], {'"SCANNED"': '"main"."SCANNED"'})
+
+
+class SQLiteProfileTests(SimpleTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.db_names = {"other": str(Path(tmp_dir.name) / "other.sqlite3")}
+
+        # 테스트 DB 와 별도의 파일 DB connection 을 생성합니다.
+        self.connection = connections["default"].__class__(
+            dict(
+                connection.settings_dict, NAME=str(Path(tmp_dir.name) / "main.sqlite3")
+            ),
+            alias="sqlite_profile",
+        )
+        self.addCleanup(self.connection.close)
+
+    def get_attach_count(self, func):
+        with CaptureQueriesContext(self.connection) as context:
+            func()
+        return sum(
+            query["sql"].startswith("ATTACH DATABASE")
+            for query in context.captured_queries
+        )
+
+    def test_attach_runs_once_per_connection(self):
+        def attach():
+            attach_databases(self.connection, self.db_names)
+
+        self.connection.ensure_connection()
+
+        self.assertEqual(self.get_attach_count(attach), 1)
+        self.assertEqual(self.get_attach_count(attach), 0)
+        with self.connection.cursor() as cursor:
+            self.assertIn("other", get_attached_databases(cursor))
+
+        # 새로운 connection 에서는 다시 ATTACH 합니다.
+        self.connection.close()
+        self.connection.ensure_connection()
+        self.assertEqual(self.get_attach_count(attach), 1)
+
+    @override_settings(
+        SQLITE_PRAGMAS={
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": "1234",
+            "mmap_size": "",
+        }
+    )
+    def test_pragmas_are_applied_to_attached_databases(self):
+        attach_databases(self.connection, self.db_names)
+        apply_pragmas(self.connection)
+
+        with self.connection.cursor() as cursor:
+            for schema_name in ("main", "other"):
+                cursor.execute(f'PRAGMA "{schema_name}".journal_mode')
+                self.assertEqual(cursor.fetchone()[0], "wal")
+                cursor.execute(f'PRAGMA "{schema_name}".synchronous')
+                self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 1234)
+
+    @override_settings(SQLITE_PRAGMAS={"journal_mode": "WAL; DROP TABLE x"})
+    def test_invalid_pragma_value_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            apply_pragmas(self.connection)
+
+
+class ScanDbTablesTests(SimpleTestCase):
+    @override_settings(PRIMARY_DB_ALIASES=["default"], DB_INTROSPECTION_TIMEOUT=0.2)
+    def test_timeout_does_not_wait_for_hanging_scan(self):
+        released = threading.Event()
+        self.addCleanup(released.set)
+
+        def hanging_scan_db_alias(db_alias, *args):
+            released.wait()
+            return {}, {}
+
+        started_at = time.perf_counter()
+        with mock.patch(
+            "core.models.patched_sql_compiler.scan_db_alias", hanging_scan_db_alias
+        ), self.assertRaisesMessage(ImproperlyConfigured, "default"):
+            scan_db_tables()
+
+        self.assertLess(time.perf_counter() - started_at, 2)
+
+
+class ReplayTests(SimpleTestCase):
+    def test_percentile(self):
+        values = [float(value) for value in range(10, 0, -1)]
+
+        self.assertIsNone(replay.percentile([], 50))
+        self.assertEqual(replay.percentile(values, 0), 1.0)
+        self.assertEqual(replay.percentile(values, 50), 5.0)
+        self.assertEqual(replay.percentile(values, 95), 10.0)
+        self.assertEqual(replay.percentile([3.0], 99), 3.0)
+
+    def compare(self, base_endpoints, new_endpoints, threshold=0.1):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+
+        paths = []
+        for name, endpoints in (("base", base_endpoints), ("new", new_endpoints)):
+            path = Path(tmp_dir.name) / f"{name}.json"
+            path.write_text(json.dumps({"endpoints": endpoints}), encoding="utf-8")
+            paths.append(str(path))
+
+        args = argparse.Namespace(
+            base=paths[0], new=paths[1], metric="p95", threshold=threshold
+        )
+        with mock.patch("sys.stdout", new_callable=io.StringIO), mock.patch(
+            "sys.stderr", new_callable=io.StringIO
+        ):
+            return replay.compare(args)
+
+    def stats(self, p95, queries=3):
+        return {"p50": 1.0, "p95": p95, "p99": p95, "queries": queries}
+
+    def test_compare(self):
+        base = {"GET /a": self.stats(10.0)}
+
+        self.assertEqual(self.compare(base, {"GET /a": self.stats(10.5)}), 0)
+        # p95 가 threshold 보다 느려진 경우
+        self.assertEqual(self.compare(base, {"GET /a": self.stats(11.5)}), 1)
+        # 쿼리 수가 늘어난 경우
+        self.assertEqual(self.compare(base, {"GET /a": self.stats(10.0, 4)}), 1)
+        # 추가/삭제된 endpoint 는 regression 이 아닙니다.
+        self.assertEqual(self.compare(base, {"GET /b": self.stats(100.0)}), 0)
+
+    def test_warmup_is_excluded_from_throughput(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        output = Path(tmp_dir.name) / "report.json"
+
+        def send(base_url, record, headers, timeout):
+            if record["name"] == "warmup":
+                time.sleep(0.5)
+            return record["name"], 200, 1.0, None
+
+        records = [{"name": "warmup"}, {"name": "a"}, {"name": "a"}]
+        args = argparse.Namespace(
+            file="",
+            repeat=1,
+            header=[],
+            concurrency=1,
+            base_url="",
+            timeout=1.0,
+            warmup=1,
+            output=str(output),
+        )
+        with mock.patch.object(
+            replay, "load_requests", return_value=records
+        ), mock.patch.object(replay, "send", send), mock.patch(
+            "sys.stdout", new_callable=io.StringIO
+        ):
+            replay.run(args)
+
+        report = json.loads(output.read_text(encoding="utf-8"))
+        self.assertEqual(report["total"]["count"], 2)
+        self.assertEqual(list(report["endpoints"]), ["a"])
+        self.assertLess(report["elapsed_seconds"], 0.5)
+
+    def test_send_uses_new_idempotency_key(self):
+        record = {"method": "POST", "path": "/a/", "headers": {"Idempotency-Key": "k"}}
+
+        with mock.patch("urllib.request.urlopen") as urlopen:
+            urlopen.return_value.__enter__.return_value.headers = {}
+            replay.send("http://testserver", record, {}, 1.0)
+            replay.send("http://testserver", record, {}, 1.0)
+
+        keys = [
+            call.args[0].get_header("Idempotency-key")
+            for call in urlopen.call_args_list
+        ]
+        self.assertNotIn("k", keys)
+        self.assertEqual(len(set(keys)), 2)
+
+    def test_capture_does_not_record_idempotency_key(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        path = Path(tmp_dir.name) / "captured.jsonl"
+
+        with override_settings(REQUEST_CAPTURE_PATH=str(path)):
+            middleware = RequestCaptureMiddleware(lambda request: HttpResponse())
+            middleware(
+                RequestFactory().post(
+                    "/a/", HTTP_IDEMPOTENCY_KEY="k", HTTP_X_CURRENT_MENU="menu"
+                )
+            )
+
+        record = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(record["headers"], {"X-Current-Menu": "menu"})
+
+
+@override_settings(
+    DATABASE_REPLICAS={"default": [("default_replica1", 1), ("default_replica2", 3)]},
+    REPLICA_DB_ALIASES=["default_replica1", "default_replica2"],
+    DATABASE_REPLICA_HEALTH_CHECK_INTERVAL=10,
+)
+class ReplicaSelectorTests(SimpleTestCase):
+    def setUp(self):
+        # 다른 테스트에서 발생한 쓰기로 primary DB 에 고정되지 않도록 상태를 초기화합니다.
+        self.addCleanup(end_request, begin_request(primary_pinned=False))
+        self.selector = ReplicaSelector()
+
+    def select(self):
+        with mock.patch(
+            "core.replicas.random.choices",
+            side_effect=lambda population, weights: [population[-1]],
+        ) as choices:
+            db_alias = self.selector.select("default")
+        return db_alias, choices.call_args
+
+    def test_weighted_selection(self):
+        db_alias, call_args = self.select()
+
+        self.assertEqual(db_alias, "default_replica2")
+        self.assertEqual(
+            call_args,
+            mock.call(("default_replica1", "default_replica2"), weights=(1, 3)),
+        )
+        self.assertEqual(self.selector.select("other"), "other")
+
+    def test_unhealthy_replica_is_skipped_until_interval_passes(self):
+        now = time.monotonic()
+        with mock.patch("core.replicas.time.monotonic", return_value=now):
+            self.selector.mark_unhealthy("default_replica2")
+            # primary db alias 는 제외하지 않습니다.
+            self.selector.mark_unhealthy("default")
+
+            db_alias, call_args = self.select()
+            self.assertEqual(db_alias, "default_replica1")
+            self.assertEqual(call_args, mock.call(("default_replica1",), weights=(1,)))
+
+            self.selector.mark_unhealthy("default_replica1")
+            self.assertEqual(self.selector.select("default"), "default")
+
+        with mock.patch("core.replicas.time.monotonic", return_value=now + 10):
+            self.assertEqual(self.select()[0], "default_replica2")
+
+    def test_operational_error_marks_replica_unhealthy(self):
+        self.addCleanup(replica_selector.reset)
+        compiler = mock.Mock(connection=mock.Mock(alias="default_replica2"))
+
+        with mock.patch(
+            "core.models.patched_sql_compiler.orig_execute_sql_in_compiler",
+            side_effect=OperationalError,
+        ), self.assertRaises(OperationalError):
+            patched_execute_sql_in_compiler(compiler)
+
+        self.assertFalse(replica_selector.is_healthy("default_replica2"))
+        self.assertTrue(replica_selector.is_healthy("default_replica1"))
+
+
+@override_settings(
+    DATABASE_REPLICAS={"default": [("default_replica1", 1)]},
+    DATABASE_REPLICA_PIN_SECONDS=5,
+)
+class ReplicaPinningMiddlewareTests(TestCase):
+    def setUp(self):
+        self.addCleanup(end_request, begin_request(primary_pinned=False))
+        router = Router()
+
+        def get_response(request):
+            # 쓰기 없이 db alias 만 조회하는 경우는 primary DB 에 고정하지 않습니다.
+            router.db_for_write(SystemCommonCodeMaster)
+            if request.method == "POST":
+                SystemCommonCodeMaster.objects.create(
+                    system_div_cd="SYS",
+                    common_cd=f"CD{time.monotonic_ns()}",
+                    common_cd_nm="CD",
+                )
+            return HttpResponse(router.db_for_read(SystemCommonCodeMaster))
+
+        self.middleware = ReplicaPinningMiddleware(get_response)
+        self.factory = RequestFactory()
+
+    def request(self, method="get", pinned_until=None):
+        request = getattr(self.factory, method)("/")
+        if pinned_until is not None:
+            request.COOKIES[settings.DATABASE_REPLICA_PIN_COOKIE_NAME] = str(
+                pinned_until
+            )
+        return self.middleware(request)
+
+    def test_read_after_write_is_pinned_to_primary(self):
+        self.assertEqual(self.request().content, b"default_replica1")
+
+        # 쓰기가 발생한 요청은 이후의 조회도 primary DB 에서 수행하고, 고정 만료시각을 쿠키로 전달합니다.
+        response = self.request("post")
+        self.assertEqual(response.content, b"default")
+        pinned_until = float(
+            response.cookies[settings.DATABASE_REPLICA_PIN_COOKIE_NAME].value
+        )
+
+        self.assertEqual(self.request(pinned_until=pinned_until).content, b"default")
+        self.assertEqual(
+            self.request(pinned_until=time.time() - 1).content, b"default_replica1"
+        )
+
+        # 요청이 끝나면 고정 상태는 초기화됩니다.
+        self.assertFalse(has_written())
+
+    def test_write_outside_request_is_not_recorded(self):
+        def write():
+            SystemCommonCodeMaster.objects.create(
+                system_div_cd="SYS", common_cd="CMD", common_cd_nm="CMD"
+            )
+            return has_written()
+
+        # management command 등 요청 밖의 쓰기는 이후의 조회를 primary DB 에 고정하지 않습니다.
+        self.assertFalse(contextvars.Context().run(write))
+
+
+class PrefetchForeignKeysTests(TestCase):
+    def setUp(self):
+        for common_cd in ["USE_YN", "DIV"]:
+            master = SystemCommonCodeMaster.objects.create(
+                common_cd_key=f"SYS/{common_cd}",
+                system_div_cd="SYS",
+                common_cd=common_cd,
+                common_cd_nm=common_cd,
+            )
+            for common_dtl_cd in ["Y", "N"]:
+                SystemCommonCodeDetail.objects.create(
+                    common_dtl_cd_key=f"SYS/{common_cd}/{common_dtl_cd}",
+                    common_dtl_cd=common_dtl_cd,
+                    common_dtl_cd_nm=common_dtl_cd,
+                    common_cd_key=master,
+                )
+
+    def test_foreign_keys_are_fetched_in_chunks(self):
+        details = list(SystemCommonCodeDetail.objects.all())
+
+        # 2개의 FK 값을 1개씩 나누어 조회합니다.
+        with self.assertNumQueries(2):
+            prefetch_foreign_keys(details, ["common_cd_key"], chunk_size=1)
+
+        with self.assertNumQueries(0):
+            common_cd_keys = {detail.common_cd_key.pk for detail in details}
+
+        self.assertEqual(common_cd_keys, {"SYS/USE_YN", "SYS/DIV"})
+
+
+class BatchTestMixin:
+    url = "/core/batch/"
+    master_url = "/system/common_code/system_common_code_master/"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="batch", password="batch", name="batch", email="batch@test.com"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post_masters(self, *common_cds):
+        return [
+            {
+                "url": self.master_url,
+                "method": "POST",
+                "data": {
+                    "system_div_cd": "SYS",
+                    "common_cd": common_cd,
+                    "common_cd_nm": common_cd,
+                },
+            }
+            for common_cd in common_cds
+        ]
+
+
+class BatchTests(BatchTestMixin, TestCase):
+    def test_sub_requests_are_dispatched_with_batch_user(self):
+        response = self.client.post(
+            self.url, self.post_masters("USE_YN", "DIV"), format="json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["status_code"] for row in response.data], [201, 201])
+        self.assertEqual(
+            set(
+                SystemCommonCodeMaster.objects.values_list("insert_user_id", flat=True)
+            ),
+            {"batch"},
+        )
+
+    def test_consecutive_writes_are_saved_in_bulk(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                self.url, self.post_masters("USE_YN", "DIV", "YN"), format="json"
+            )
+
+        inserts = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith("INSERT")
+        ]
+        self.assertEqual([row["status_code"] for row in response.data], [201, 201, 201])
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            [row["data"]["common_cd"] for row in response.data],
+            ["USE_YN", "DIV", "YN"],
+        )
+        self.assertTrue(SystemCommonCodeMaster.objects.filter(pk="SYS/DIV").exists())
+
+        batch_options = [
+            {
+                "url": f"{self.master_url}SYS/{common_cd}/",
+                "method": "PUT",
+                "data": {
+                    "system_div_cd": "SYS",
+                    "common_cd": common_cd,
+                    "common_cd_nm": f"{common_cd} 수정",
+                },
+            }
+            for common_cd in ["USE_YN", "DIV"]
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, batch_options, format="json")
+
+        updates = [
+            query
+            for query in context.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual([row["status_code"] for row in response.data], [200, 200])
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            SystemCommonCodeMaster.objects.get(pk="SYS/DIV").common_cd_nm, "DIV 수정"
+        )
+
+    def test_invalid_bulk_write_falls_back_to_each_request(self):
+        batch_options = self.post_masters("USE_YN", "DIV")
+        del batch_options[1]["data"]["common_cd_nm"]
+
+        response = self.client.post(self.url, batch_options, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([row["status_code"] for row in response.data], [201, 400])
+        self.assertFalse(SystemCommonCodeMaster.objects.exists())
+
+    def test_stream_writes_results_and_summary_as_ndjson(self):
+        batch_options = self.post_masters("USE_YN") + [
+            {"url": "/not-found/", "method": "POST", "data": {}}
+        ]
+
+        response = self.client.post(
+            f"{self.url}?stream=1", batch_options, format="json"
+        )
+        lines = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).decode().splitlines()
+        ]
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual([line.get("status_code") for line in lines[:-1]], [201, 404])
+        self.assertEqual(
+            lines[-1]["summary"],
+            {"status_code": 404, "committed": False, "count": 2, "total": 2},
+        )
+        self.assertFalse(SystemCommonCodeMaster.objects.exists())
+
+    def test_stream_with_idempotency_key_is_rejected(self):
+        response = self.client.post(
+            f"{self.url}?stream=1",
+            self.post_masters("USE_YN"),
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="key-1",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.streaming)
+        self.assertFalse(SystemCommonCodeMaster.objects.exists())
+
+    def test_failed_sub_request_rolls_back_batch(self):
+        batch_options = self.post_masters("USE_YN") + [
+            {"url": "/not-found/", "method": "POST", "data": {}}
+        ]
+
+        response = self.client.post(self.url, batch_options, format="json")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(SystemCommonCodeMaster.objects.exists())
+
+
+# 조회성 요청은 별도 스레드의 connection 에서 수행되므로, 데이터를 커밋하여 확인합니다.
+class BatchReadTests(BatchTestMixin, TransactionTestCase):
+    def test_read_sub_requests_are_returned_in_order(self):
+        SystemCommonCodeMaster.objects.create(
+            system_div_cd="SYS", common_cd="USE_YN", common_cd_nm="USE_YN"
+        )
+        batch_options = [
+            {"url": f"{self.master_url}meta/", "method": "GET"},
+            {"url": f"{self.master_url}SYS/USE_YN/", "method": "GET"},
+            {"url": "/not-found/", "method": "GET"},
+        ]
+
+        response = self.client.post(self.url, batch_options, format="json")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual([row["status_code"] for row in response.data], [200, 200, 404])
+        self.assertIn("meta", response.data[0]["data"])
+        self.assertEqual(response.data[1]["data"]["common_cd"], "USE_YN")
+        self.assertTrue(all("elapsed_ms" in row for row in response.data))
+
+    @override_settings(QUERY_COUNT_HEADER=True)
+    def test_query_count_header_includes_parallel_sub_requests(self):
+        SystemCommonCodeMaster.objects.create(
+            system_div_cd="SYS", common_cd="USE_YN", common_cd_nm="USE_YN"
+        )
+        urls = [f"{self.master_url}SYS/USE_YN/", f"{self.master_url}?page_size=1"]
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(
+            self.url, [{"url": url, "method": "GET"} for url in urls], format="json"
+        )
+        expected = sum(int(client.get(url)["X-Query-Count"]) for url in urls)
+
+        # 조회 스레드의 connection 생성 시 쿼리(ATTACH/PRAGMA)도 포함됩니다.
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(expected, 0)
+        self.assertGreaterEqual(int(response["X-Query-Count"]), expected)
+
+
+class AsyncBatchTests(BatchTestMixin, TransactionTestCase):
+    url = "/core/batch/async/"
+
+    def setUp(self):
+        super().setUp()
+        self.async_client.force_login(self.user)
+        SystemCommonCodeMaster.objects.create(
+            system_div_cd="SYS", common_cd="USE_YN", common_cd_nm="USE_YN"
+        )
+
+    async def test_read_sub_requests_run_concurrently(self):
+        batch_options = [
+            {"url": f"{self.master_url}SYS/USE_YN/", "method": "GET"},
+            {"url": f"{self.master_url}meta/", "method": "GET"},
+        ]
+
+        response = await self.async_client.post(
+            self.url, batch_options, content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([row["status_code"] for row in data], [200, 200])
+        self.assertEqual(data[0]["data"]["common_cd"], "USE_YN")
+
+    async def test_writes_are_committed_in_one_transaction(self):
+        response = await self.async_client.post(
+            self.url,
+            self.post_masters("A", "B"),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["status_code"] for row in response.json()], [201, 201])
+
+    async def test_csrf_exempt_keeps_async_view(self):
+        self.assertTrue(asyncio.iscoroutinefunction(batch_async))
+
+        # CsrfViewMiddleware 에서 거부되지 않고 async View 로 수행됩니다.
+        response = await AsyncClient(enforce_csrf_checks=True).post(
+            self.url, [], content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+
+class IdempotencyKeyTests(TestCase):
+    url = "/system/common_code/system_common_code_master/"
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username="idem", password="idem", name="idem", email="idem@test.com"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def post(self, common_cd_nm, key="key-1"):
+        return self.client.post(
+            self.url,
+            {
+                "system_div_cd": "SYS",
+                "common_cd": "USE_YN",
+                "common_cd_nm": common_cd_nm,
+            },
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_returns_stored_response(self):
+        response = self.post("사용여부")
+        replayed = self.post("사용여부")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(replayed.status_code, 201)
+        self.assertEqual(replayed["Idempotent-Replayed"], "true")
+        self.assertEqual(json.loads(replayed.content), response.data)
+        self.assertEqual(SystemCommonCodeMaster.objects.count(), 1)
+
+    def test_key_reused_for_other_request_is_rejected(self):
+        self.post("사용여부")
+
+        response = self.post("다른 요청")
+
+        self.assertEqual(response.status_code, 422)
+
+    def test_failed_request_is_not_stored(self):
+        self.assertEqual(self.post("").status_code, 400)
+        self.assertEqual(self.post("사용여부").status_code, 201)
+
+    @override_settings(IDEMPOTENCY_WAIT_TIMEOUT=0)
+    def test_expired_lease_of_crashed_request_is_taken_over(self):
+        # 처리 중에 프로세스가 종료된 요청과 같이, key 를 처리 중 상태로 남깁니다.
+        with mock.patch.object(
+            DatabaseIdempotencyStore, "complete", side_effect=RuntimeError
+        ), mock.patch.object(DatabaseIdempotencyStore, "release"), self.assertRaises(
+            RuntimeError
+        ):
+            self.post("사용여부")
+        lease = IdempotencyKey.objects.get(pk="key-1").expired_at
+        self.assertLess(
+            lease,
+            timezone.now() + timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS + 1),
+        )
+
+        # 점유 시간 동안은 처리 중으로 응답합니다.
+        self.assertEqual(self.post("사용여부").status_code, 409)
+
+        IdempotencyKey.objects.filter(pk="key-1").update(
+            expired_at=timezone.now() - timedelta(seconds=1)
+        )
+        response = self.post("사용여부")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertGreater(
+            IdempotencyKey.objects.get(pk="key-1").expired_at,
+            timezone.now()
+            + timedelta(seconds=settings.IDEMPOTENCY_KEY_EXPIRE_SECONDS - 60),
+        )
+        self.assertEqual(self.post("사용여부")["Idempotent-Replayed"], "true")
+
+    @override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=1024)
+    def test_large_multipart_request(self):
+        def post(content):
+            return self.client.post(
+                self.url,
+                {
+                    "system_div_cd": "SYS",
+                    "common_cd": "USE_YN",
+                    "common_cd_nm": "사용여부",
+                    "attachment": SimpleUploadedFile("a.txt", content),
+                },
+                format="multipart",
+                HTTP_IDEMPOTENCY_KEY="key-1",
+            )
+
+        response = post(b"x" * 4096)
+        replayed = post(b"x" * 4096)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(replayed["Idempotent-Replayed"], "true")
+        # 파일 내용이 다르면 다른 요청입니다.
+        self.assertEqual(post(b"y" * 4096).status_code, 422)
+
+    def test_multipart_put_body_is_parsed_once(self):
+        request = RequestFactory().put(
+            "/",
+            encode_multipart(
+                BOUNDARY, {"name": "a", "file": SimpleUploadedFile("a.txt", b"x")}
+            ),
+            content_type=MULTIPART_CONTENT,
+        )
+
+        body = get_request_body(request)
+
+        self.assertEqual(request.POST["name"], "a")
+        self.assertEqual(request.FILES["file"].read(), b"x")
+        self.assertEqual(len(body), 32)
+
+    def test_key_is_released_when_commit_fails(self):
+        store = mock.Mock()
+        store.acquire.return_value = None
+
+        @contextmanager
+        def atomic():
+            yield
+            # 블록이 정상적으로 끝난 뒤, 커밋에 실패합니다.
+            raise DatabaseError("commit failed")
+
+        request = RequestFactory().post("/", HTTP_IDEMPOTENCY_KEY="key-1")
+        with mock.patch(
+            "core.idempotency.get_idempotency_store", return_value=store
+        ), mock.patch("core.idempotency.transaction.atomic", atomic), self.assertRaises(
+            DatabaseError
+        ):
+            run_idempotent(request, lambda: b"", lambda: HttpResponse(status=201))
+
+        store.complete.assert_called_once()
+        store.release.assert_called_once_with("key-1")
+
+
+class CursorPaginationTests(TestCase):
+    url = "/system/common_code/system_common_code_master/"
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username="cursor", password="cursor", name="cursor", email="c@test.com"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+        for index, common_content1 in enumerate(["B", None, "A", None, "C"]):
+            SystemCommonCodeMaster.objects.create(
+                system_div_cd="SYS",
+                common_cd=f"CD{index}",
+                common_cd_nm=f"CD{index}",
+                common_content1=common_content1,
+            )
+
+    def scroll(self, query):
+        common_cds, cursor = [], ""
+        while cursor is not None:
+            response = self.client.get(
+                self.url, {**query, "cursor": cursor, "page_size": 2}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["count"], 5)
+            common_cds += [row["common_cd"] for row in response.data["results"]]
+            cursor = response.data["next"]
+        return common_cds
+
+    def test_pages_follow_ordering_with_pk_tie_breaker(self):
+        # 내림차순에서 NULL 은 가장 뒤에 위치하며, 같은 값은 기본키 순서로 정렬됩니다.
+        self.assertEqual(
+            self.scroll({"ordering": "-common_content1"}),
+            ["CD4", "CD0", "CD2", "CD1", "CD3"],
+        )
+        self.assertEqual(self.scroll({}), ["CD0", "CD1", "CD2", "CD3", "CD4"])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url, {"cursor": "invalid"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_fk_ordering_follows_related_model_ordering(self):
+        # 기본키 순서와 Meta.ordering(system_div_cd, ...) 순서가 반대인 공통코드
+        for common_cd_key, system_div_cd in (("1", "B"), ("2", "A")):
+            master = SystemCommonCodeMaster.objects.create(
+                common_cd_key=common_cd_key,
+                system_div_cd=system_div_cd,
+                common_cd="CD",
+                common_cd_nm="CD",
+            )
+            for order in (1, 2):
+                SystemCommonCodeDetail.objects.create(
+                    common_dtl_cd_key=f"{common_cd_key}/{order}",
+                    common_cd_key=master,
+                    common_dtl_cd=str(order),
+                    common_dtl_cd_nm=str(order),
+                    order=order,
+                )
+
+        # Meta.ordering 의 common_cd_key 는 공통코드의 Meta.ordering 으로 정렬합니다.
+        expected = list(SystemCommonCodeDetail.objects.values_list("pk", flat=True))
+        self.assertEqual(expected, ["2/1", "2/2", "1/1", "1/2"])
+
+        for queryset in (
+            SystemCommonCodeDetail.objects.all(),
+            SystemCommonCodeDetail.objects.only("common_dtl_cd"),
+            SystemCommonCodeDetail.objects.values_list("pk"),
+        ):
+            with self.subTest(queryset=queryset.query):
+                pks, cursor = [], ""
+                while cursor is not None:
+                    paginator = KeysetPagination()
+                    request = Request(
+                        APIRequestFactory().get(
+                            "/", {"cursor": cursor, "page_size": 1, "count": "false"}
+                        )
+                    )
+                    with self.assertNumQueries(1):
+                        page = paginator.paginate_queryset(queryset, request)
+                    pks += [
+                        row[0] if isinstance(row, tuple) else row.pk for row in page
+                    ]
+                    cursor = paginator.next_cursor
+                self.assertEqual(pks, expected)
+
+
+class CountCacheTests(TestCase):
+    url = "/system/common_code/system_common_code_master/"
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username="count", password="count", name="count", email="count@test.com"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+        for common_cd in ("A", "B"):
+            SystemCommonCodeMaster.objects.create(
+                system_div_cd="SYS", common_cd=common_cd, common_cd_nm=common_cd
+            )
+
+    def get_count(self, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, params or {})
+        count_queries = [
+            query for query in context.captured_queries if "COUNT(" in query["sql"]
+        ]
+        return (
+            response.data["count"],
+            response.data["count_estimated"],
+            len(count_queries),
+        )
+
+    def test_count_is_cached_until_table_is_written(self):
+        self.assertEqual(self.get_count(), (2, False, 1))
+        self.assertEqual(self.get_count(), (2, False, 0))
+        # 정렬만 다른 요청은 같은 count 를 사용합니다.
+        self.assertEqual(self.get_count({"ordering": "-common_cd"}), (2, False, 0))
+
+        SystemCommonCodeMaster.objects.create(
+            system_div_cd="SYS", common_cd="C", common_cd_nm="C"
+        )
+
+        self.assertEqual(self.get_count(), (3, False, 1))
+
+    def test_count_is_invalidated_only_by_written_queries(self):
+        self.assertEqual(self.get_count(), (2, False, 1))
+
+        # 쓰기 없이 db alias 만 조회하는 경우는 count 를 무효화하지 않습니다.
+        Router().db_for_write(SystemCommonCodeMaster)
+        self.assertEqual(self.get_count(), (2, False, 0))
+
+        # signal 이 발생하지 않는 QuerySet.update 도 무효화합니다.
+        SystemCommonCodeMaster.objects.filter(common_cd="A").update(common_cd_nm="a")
+        self.assertEqual(self.get_count(), (2, False, 1))
+
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            SystemCommonCodeMaster.objects.filter(common_cd="A").delete()
+            self.assertEqual(self.get_count(), (1, False, 1))
+            # 커밋 전에 캐싱된 count 는 커밋 시에 무효화됩니다.
+            self.assertEqual(self.get_count(), (1, False, 0))
+
+        self.assertEqual(self.get_count(), (1, False, 1))
+
+    def test_empty_result_query_is_counted_as_zero(self):
+        queryset = SystemCommonCodeMaster.objects.filter(pk__in=[])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_count(queryset), (0, False))
+
+        paginator = CountPaginator(queryset, 10)
+        self.assertEqual(paginator.count, 0)
+        self.assertEqual(list(paginator.page(1)), [])
+
+    @override_settings(COUNT_ESTIMATE_THRESHOLD=1)
+    def test_count_is_estimated_from_table_statistics(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        self.assertEqual(self.get_count(), (2, True, 0))
+
+
+@override_settings(LIST_STREAM_CHUNK_SIZE=2)
+class StreamListTests(TestCase):
+    url = "/system/common_code/system_common_code_master/"
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="stream", password="stream", name="stream", email="s@test.com"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+        for common_cd in ("A", "B", "C"):
+            SystemCommonCodeMaster.objects.create(
+                system_div_cd="SYS", common_cd=common_cd, common_cd_nm=common_cd
+            )
+
+    def test_stream_rows_as_json_array_and_ndjson(self):
+        results = self.client.get(self.url).data["results"]
+
+        response = self.client.get(self.url, {"stream": "json"})
+        self.assertTrue(response.streaming)
+        self.assertEqual(json.loads(b"".join(response.streaming_content)), results)
+
+        response = self.client.get(self.url, {"stream": "ndjson"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], results)
+
+    @override_settings(QUERY_COUNT_HEADER=True)
+    def test_streamed_queries_are_counted(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(self.url, {"stream": "ndjson"})
+        with self.assertLogs("core.middleware", "INFO") as logs:
+            b"".join(response.streaming_content)
+            response.close()
+
+        # 헤더에는 응답 시작 전까지의 쿼리 수를, 로그에는 응답을 생성하며 수행한 쿼리까지 기록합니다.
+        self.assertEqual(len(logs.records), 1)
+        self.assertGreater(logs.records[0].args[1], int(response["X-Query-Count"]))
+
+
+class ReadPlanTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            username="plan", password="plan", name="plan", email="plan@test.com"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+        master = SystemCommonCodeMaster.objects.create(
+            system_div_cd="SYS", common_cd="USE_YN", common_cd_nm="USE_YN"
+        )
+        for order, common_dtl_cd in enumerate(("Y", "N"), start=1):
+            SystemCommonCodeDetail.objects.create(
+                common_dtl_cd_key=f"SYS/USE_YN/{common_dtl_cd}",
+                common_cd_key=master,
+                common_dtl_cd=common_dtl_cd,
+                common_dtl_cd_nm=common_dtl_cd,
+                order=order,
+            )
+
+        upper_menu = SystemMenu.objects.create(
+            menu_cd_key="SYS/TOP",
+            system_div_cd="SYS",
+            menu_cd="TOP",
+            menu_nm="TOP",
+            program_yn="N",
+            order=1,
+        )
+        SystemMenu.objects.create(
+            menu_cd_key="SYS/SUB",
+            system_div_cd="SYS",
+            menu_cd="SUB",
+            menu_nm="SUB",
+            program_yn="Y",
+            order=1,
+            upper_menu_cd_key=upper_menu,
+        )
+
+    def test_compiled_plan_matches_drf_serializer(self):
+        for url in (
+            "/system/common_code/system_common_code_master/",
+            "/system/common_code/system_common_code_detail/?common_cd_key=SYS/USE_YN",
+            "/system/common_menu/system_menu/",
+        ):
+            with self.subTest(url=url):
+                with override_settings(SERIALIZER_COMPILED_READ=False):
+                    expected = self.client.get(url).json()
+                response = self.client.get(url)
+
+                self.assertEqual(response.json(), expected)
+                self.assertTrue(expected["results"])
+
+    def test_columnar_layouts(self):
+        for url, params in (
+            (
+                "/system/common_code/system_common_code_detail/",
+                {"common_cd_key": "SYS/USE_YN"},
+            ),
+            ("/system/common_menu/system_menu/", {}),
+        ):
+            for compiled_read in (True, False):
+                with self.subTest(url=url, compiled_read=compiled_read):
+                    with override_settings(SERIALIZER_COMPILED_READ=compiled_read):
+                        expected = self.client.get(url, params).json()
+                        rows = self.client.get(url, {**params, "layout": "rows"}).json()
+                        columns = self.client.get(
+                            url, params, HTTP_ACCEPT="application/json; layout=columns"
+                        ).json()
+
+                    self.assertEqual(rows["count"], expected["count"])
+                    self.assertEqual(
+                        [dict(zip(rows["columns"], row)) for row in rows["results"]],
+                        expected["results"],
+                    )
+                    self.assertEqual(columns["columns"], rows["columns"])
+                    self.assertEqual(
+                        [list(row) for row in zip(*columns["results"])], rows["results"]
+                    )
+
+        response = self.client.get(url, {"layout": "records"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_sparse_fieldsets(self):
+        url = "/system/common_code/system_common_code_detail/"
+        params = {
+            "common_cd_key": "SYS/USE_YN",
+            "fields": "common_dtl_cd,common_cd_key",
+        }
+
+        for compiled_read in (True, False):
+            with self.subTest(compiled_read=compiled_read):
+                with override_settings(SERIALIZER_COMPILED_READ=compiled_read):
+                    expected = self.client.get(url, {"common_cd_key": "SYS/USE_YN"})
+                    with CaptureQueriesContext(connection) as queries:
+                        response = self.client.get(url, params)
+
+                self.assertEqual(
+                    response.json()["results"],
+                    [
+                        {
+                            key: row[key]
+                            for key in ("permalink", "common_dtl_cd", "common_cd_key")
+                        }
+                        for row in expected.json()["results"]
+                    ],
+                )
+                # 요청하지 않은 컬럼(REMARK)은 조회하지 않습니다.
+                select = [
+                    q["sql"].split(" FROM ")[0]
+                    for q in queries
+                    if "SYSTEM_COMMON_CODE_DETAIL" in q["sql"]
+                    and "COUNT(" not in q["sql"]
+                ]
+                self.assertTrue(select)
+                self.assertFalse([sql for sql in select if "REMARK" in sql])
+
+                with override_settings(SERIALIZER_COMPILED_READ=compiled_read):
+                    page = self.client.get(
+                        url, {**params, "cursor": "", "page_size": 1}
+                    )
+                    next_page = self.client.get(
+                        url, {**params, "cursor": page.data["next"], "page_size": 1}
+                    )
+                self.assertEqual(
+                    page.data["results"] + next_page.data["results"],
+                    response.json()["results"],
+                )
+
+        response = self.client.get(url, {**params, "fields": "common_dtl_cd,unknown"})
+        self.assertEqual(response.status_code, 400)
+
+        detail = self.client.get(
+            f"{url}SYS/USE_YN/Y/", {"fields": "common_dtl_cd_nm"}
+        ).json()
+        self.assertEqual(set(detail), {"permalink", "common_dtl_cd_nm"})
+
+    def test_dict_representation_is_flattened_like_serializer(self):
+        class PairField(serializers.CharField):
+            def to_representation(self, value):
+                return {"value": value, "length": len(value)}
+
+        class PairSerializer(SystemCommonCodeDetailSerializer):
+            pair = PairField(source="common_dtl_cd_nm", read_only=True)
+            content = serializers.JSONField(source="common_content1", read_only=True)
+
+        SystemCommonCodeDetail.objects.filter(common_dtl_cd="Y").update(
+            common_content1="Y"
+        )
+        request = Request(APIRequestFactory().get("/"))
+        queryset = SystemCommonCodeDetail.objects.all()
+
+        serializer = PairSerializer(context={"request": request})
+        plan = get_read_plan(serializer)
+        self.assertIn((FALLBACK, "pair", None), plan.steps)
+        self.assertIn((FALLBACK, "content", None), plan.steps)
+
+        expected = [serializer.to_representation(instance) for instance in queryset]
+        self.assertEqual(
+            plan.to_representations(plan.prepare(queryset), serializer), expected
+        )
+        self.assertEqual(expected[0]["pair__length"], 1)
+
+    @override_settings(SERIALIZER_COMPILED_READ=False)
+    def test_sparse_fieldsets_with_select_related_all(self):
+        view = type(
+            "SelectRelatedViewSet",
+            (CoreMixin, ModelViewSet),
+            dict(
+                queryset=SystemCommonCodeDetail.objects.select_related(),
+                serializer_class=SystemCommonCodeDetailSerializer,
+            ),
+        ).as_view({"get": "list"})
+
+        request = APIRequestFactory().get("/", {"fields": "common_dtl_cd"})
+        force_authenticate(request, get_user_model().objects.get(username="plan"))
+        with CaptureQueriesContext(connection) as queries:
+            response = view(request)
+            response.render()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(row["common_dtl_cd"] for row in response.data["results"]),
+            ["N", "Y"],
+        )
+        # 요청하지 않은 컬럼(REMARK)은 조회하지 않으며, JOIN 하는 FK 컬럼은 함께 조회합니다. (행마다 FK 조회 방지)
+        select = [
+            q["sql"].split(" FROM ")[0]
+            for q in queries
+            if "SYSTEM_COMMON_CODE_DETAIL" in q["sql"] and "COUNT(" not in q["sql"]
+        ]
+        self.assertEqual(len(select), 1)
+        self.assertNotIn('"SYSTEM_COMMON_CODE_DETAIL"."REMARK"', select[0])
+        self.assertIn('"SYSTEM_COMMON_CODE_DETAIL"."COMMON_CD_KEY"', select[0])
+
+    def test_sparse_fieldset_plans_are_bounded(self):
+        url = "/system/common_code/system_common_code_detail/"
+        read_plans = LRUCache(2)
+
+        with mock.patch("core.read_plan._read_plans", read_plans):
+            for fields in (
+                "common_dtl_cd",
+                "common_dtl_cd_nm",
+                "order",
+                "common_dtl_cd,order",
+                "common_dtl_cd",
+            ):
+                response = self.client.get(
+                    url, {"common_cd_key": "SYS/USE_YN", "fields": fields}
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    set(response.json()["results"][0]),
+                    {"permalink", *fields.split(",")},
+                )
+
+        self.assertEqual(read_plans.info()["size"], 2)
+        self.assertEqual(read_plans.info()["evictions"], 3)
+
+
+class ReverseTests(TestCase):
+    def assertSameURL(self, *args, **kwargs):
+        try:
+            expected = drf_reverse(*args, **kwargs)
+        except NoReverseMatch:
+            with self.assertRaises(NoReverseMatch):
+                reverse(*args, **kwargs)
+        else:
+            self.assertEqual(reverse(*args, **kwargs), expected)
+
+    def test_same_url_as_drf_reverse(self):
+        factory = APIRequestFactory()
+        requests = (
+            None,
+            factory.get("/"),
+            factory.get("/", {"format": "json"}),
+            factory.get("/", secure=True, HTTP_HOST="example.com:8443"),
+        )
+        for view_name in (
+            "systemcommoncodemaster-detail",
+            "systemcommoncodedetail-detail",
+            "systemmenu-detail",
+        ):
+            for pk in ("SYS/USE_YN", "시스템/코드", "A B?#%", "a.b", "", 1):
+                for request in requests:
+                    with self.subTest(view_name=view_name, pk=pk, request=request):
+                        self.assertSameURL(
+                            view_name, kwargs={"pk": pk}, request=request
+                        )
+
+        self.assertSameURL("systemmenu-detail", kwargs={"pk": "SYS/TOP"}, format="json")
+        self.assertSameURL("systemmenu-list", request=factory.get("/"))
+
+        # 인자가 하나인 detail URL 은 rest_framework 의 reverse 를 호출하지 않습니다.
+        with mock.patch("core.reverse.drf_reverse", side_effect=AssertionError):
+            reverse("systemmenu-detail", kwargs={"pk": "SYS/TOP"}, request=requests[1])
+
+
+class DetailWithMasterSerializer(SystemCommonCodeDetailSerializer):
+    common_cd_nm = serializers.CharField(
+        source="common_cd_key.common_cd_nm", read_only=True
+    )
+
+
+class MasterWithDetailsSerializer(SystemCommonCodeMasterSerializer):
+    details = DetailWithMasterSerializer(
+        source="systemcommoncodedetail_set", many=True, read_only=True
+    )
+
+
+class RelatedPlanTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="related", password="related", name="related", email="r@test.com"
+        )
+        for common_cd in ("A", "B", "C"):
+            master = SystemCommonCodeMaster.objects.create(
+                system_div_cd="SYS", common_cd=common_cd, common_cd_nm=common_cd
+            )
+            for common_dtl_cd in ("Y", "N"):
+                SystemCommonCodeDetail.objects.create(
+                    common_dtl_cd_key=f"SYS/{common_cd}/{common_dtl_cd}",
+                    common_cd_key=master,
+                    common_dtl_cd=common_dtl_cd,
+                    common_dtl_cd_nm=common_dtl_cd,
+                    order=1,
+                )
+
+    def test_plan_from_serializer_fields(self):
+        # FK 의 기본키로 URL 만 생성하면 JOIN 하지 않습니다.
+        self.assertEqual(
+            get_related_plan(SystemCommonCodeDetailSerializer), RelatedPlan()
+        )
+        self.assertEqual(
+            get_related_plan(DetailWithMasterSerializer).select_related,
+            ("common_cd_key",),
+        )
+        self.assertEqual(
+            get_related_plan(DetailWithMasterSerializer, ["common_dtl_cd"]),
+            RelatedPlan(),
+        )
+        self.assertEqual(
+            get_related_plan(MasterWithDetailsSerializer).prefetch_related,
+            ("systemcommoncodedetail_set", "systemcommoncodedetail_set__common_cd_key"),
+        )
+
+    def test_plans_are_keyed_by_relation_fields(self):
+        related_plans = LRUCache(10)
+
+        with mock.patch("core.related_plan._related_plans", related_plans):
+            for field_names in (
+                ["common_dtl_cd", "common_cd_nm"],
+                ["common_cd_nm", "order", "common_cd_nm"],
+                ["common_cd_nm", "unknown"],
+            ):
+                self.assertEqual(
+                    get_related_plan(DetailWithMasterSerializer, field_names),
+                    RelatedPlan(select_related=("common_cd_key",)),
+                )
+            self.assertEqual(related_plans.info()["size"], 1)
+
+            # serializer 에 없는 필드를 요청하는 400 응답은 캐시를 늘리지 않습니다.
+            client = APIClient()
+            client.force_authenticate(self.user)
+            url = "/system/common_code/system_common_code_detail/"
+            for unknown in ("a", "b", "c"):
+                response = client.get(
+                    url,
+                    {"common_cd_key": "SYS/A", "fields": f"common_dtl_cd,{unknown}"},
+                )
+                self.assertEqual(response.status_code, 400)
+            self.assertEqual(related_plans.info()["size"], 2)
+
+    @override_settings(DB_MULTI_JOIN=False)
+    def test_cross_db_foreign_keys_are_prefetched(self):
+        class CrossDBSerializer(DetailWithMasterSerializer):
+            pass
+
+        mapping = {
+            SystemCommonCodeDetail._meta.db_table: "default",
+            SystemCommonCodeMaster._meta.db_table: "other",
+        }
+        with mock.patch.dict(PRE_SCANNED_DB_ALIAS_BY_TABLE_NAME, mapping):
+            plan = get_related_plan(CrossDBSerializer)
+
+        self.assertEqual(plan, RelatedPlan(cross_db_prefetch=("common_cd_key",)))
+
+    def test_list_query_count_does_not_depend_on_page_size(self):
+        for serializer_class in (
+            DetailWithMasterSerializer,
+            MasterWithDetailsSerializer,
+        ):
+            model = serializer_class.Meta.model
+            view = type(
+                "RelatedPlanViewSet",
+                (CoreMixin, ModelViewSet),
+                dict(queryset=model.objects.all(), serializer_class=serializer_class),
+            ).as_view({"get": "list"})
+
+            query_counts = []
+            for page_size in (1, 3):
+                request = APIRequestFactory().get(
+                    "/", {"cursor": "", "page_size": page_size, "count": "false"}
+                )
+                force_authenticate(request, self.user)
+                with CaptureQueriesContext(connection) as queries:
+                    response = view(request)
+                    response.render()
+
+                self.assertEqual(len(response.data["results"]), page_size)
+                query_counts.append(len(queries))
+
+            with self.subTest(serializer_class=serializer_class.__name__):
+                self.assertEqual(query_counts[0], query_counts[1])
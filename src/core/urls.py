@@ -6,4 +6,5 @@ app_name = "core"
 
 urlpatterns = [
     path("batch/", views.batch, name="batch"),
+    path("batch/async/", views.batch_async, name="batch_async"),
 ]
@@ -1,5 +1,13 @@
-from django.db import  models
+import asyncio
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Any, Dict, Hashable
+
+from django.db import models
 from django.http import HttpRequest
+from django.views.decorators import csrf
+
 
 def get_client_ip(request: HttpRequest) -> str:
     x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
@@ -9,9 +17,95 @@ def get_client_ip(request: HttpRequest) -> str:
         ip = request.META.get("REMOTE_ADDR")
     return ip
 
+
 def add_meta_attr_to_model(attr):
     """
     모델의 Meta 옵션에 커스텀 속성을 추가합니다.
     """
     if attr not in models.options.DEFAULT_NAMES:
-        models.options.DEFAULT_NAMES += (attr,)
\ No newline at end of file
+        models.options.DEFAULT_NAMES += (attr,)
+
+
+def csrf_exempt(view_func):
+    """
+    View 를 CSRF 검사에서 제외합니다. (django.views.decorators.csrf.csrf_exempt)
+
+    Django 3.2 의 csrf_exempt 는 async View 를 동기 함수로 감싸 async View 로 인식되지 않으므로,
+    async View 는 async 함수로 감쌉니다.
+    """
+    if not asyncio.iscoroutinefunction(view_func):
+        return csrf.csrf_exempt(view_func)
+
+    async def wrapped_view(*args, **kwargs):
+        return await view_func(*args, **kwargs)
+
+    wrapped_view.csrf_exempt = True
+    return wraps(view_func)(wrapped_view)
+
+
+class LRUCache:
+    """
+    크기가 제한된 LRU 캐시입니다. hit/miss/eviction 횟수를 집계합니다.
+
+    maxsize 가 0 이하이면 캐싱하지 않습니다.
+    """
+
+    _missing = object()
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        # 캐싱하지 않으면 hit/miss 를 집계하지 않습니다.
+        if not self.enabled:
+            return default
+
+        with self._lock:
+            value = self._data.get(key, self._missing)
+            if value is self._missing:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def reset(self):
+        """
+        캐싱된 값과 hit/miss/eviction 횟수를 모두 초기화합니다.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
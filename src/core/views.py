@@ -2,19 +2,24 @@ import json
 import traceback
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
-
-from core.utils import get_client_ip
-from django.core.handlers.wsgi import WSGIRequest
+from typing import Any, Dict, Iterator, List, Optional
+
+from asgiref.sync import sync_to_async
+from core.batch import BatchExecutor, get_async_batch_executor
+from core.idempotency import IDEMPOTENCY_KEY_HEADER, run_idempotent
+from core.replicas import begin_request, end_request
+from core.streaming import NDJSON_CONTENT_TYPE, to_ndjson
+from core.utils import csrf_exempt
 from django.db import transaction
-from django.middleware.csrf import get_token as csrf_get_token
-from django.test.client import ClientHandler, conditional_content_removal
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import APIException, ParseError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
 from rest_framework.response import Response
-from rest_framework.test import APIClient
-from rest_framework.views import exception_handler
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.views import APIView, exception_handler
 
 
 class Method(str, Enum):
@@ -38,30 +43,8 @@ class BatchOption:
     data: Optional[Dict[str, Any]] = None
 
 
-class APIClientHandler(ClientHandler):
-    """
-    A HTTP Handler that can be used for testing purposes. Use the WSGI
-    interface to compose requests, but return the raw HttpResponse object with
-    the originating WSGIRequest attached to its ``wsgi_request`` attribute.
-    """
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(enforce_csrf_checks=False, *args, **kwargs)
-
-    def __call__(self, environ):
-        if self._middleware_chain is None:
-            self.load_middleware()
-
-        request = WSGIRequest(environ)
-        request._batch_request = (
-            True  # custom attribute. it is using in CoreMixin.dispatch.
-        )
-        request._dont_enforce_csrf_checks = not self.enforce_csrf_checks
-        response = self.get_response(request)
-        conditional_content_removal(request, response)
-        response.wsgi_request = request
-
-        return response
+# 트랜잭션 없이 동시에 수행하는 조회성 요청
+READ_METHODS = (Method.GET, Method.OPTIONS, Method.HEAD)
 
 
 class Rollback(Exception):
@@ -74,37 +57,162 @@ class Rollback(Exception):
 def batch(request):
     """
     다수의 요청을 하나의 트랜잭션으로 처리합니다.
+
+    모든 요청이 조회성 요청(GET/OPTIONS/HEAD)이면 트랜잭션 없이 동시에 처리합니다.
+    쓰기 요청은 ?stream=1 로 요청하면 결과를 NDJSON 으로 스트리밍합니다. (Idempotency-Key 와 함께 사용할 수 없습니다.)
     """
 
     batch_option_list: List[BatchOption] = [
         BatchOption(**kwargs) for kwargs in request.data
     ]
 
-    response_list = []
-    status_code = status.HTTP_200_OK
+    executor = BatchExecutor(request)
+
+    if batch_option_list and all(
+        batch_option.method in READ_METHODS for batch_option in batch_option_list
+    ):
+        return batch_read(executor, batch_option_list)
+
+    # 스트리밍 모드 : 각 하위 요청의 결과를 완료되는 대로 NDJSON 한 줄씩 응답합니다.
+    if request.query_params.get("stream") in ("1", "true"):
+        # 스트리밍 응답은 저장할 수 없으므로, 재시도 시 batch 가 다시 수행되지 않도록 거부합니다.
+        if request.headers.get(IDEMPOTENCY_KEY_HEADER):
+            raise ParseError(
+                f"stream 과 {IDEMPOTENCY_KEY_HEADER} 는 함께 사용할 수 없습니다."
+            )
+        return StreamingHttpResponse(
+            stream_batch(executor, batch_option_list),
+            content_type=NDJSON_CONTENT_TYPE,
+        )
 
+    return batch_write(request, executor, batch_option_list)
+
+
+# batch 와 같이 CSRF 검사를 하지 않습니다.
+@csrf_exempt
+async def batch_async(request: HttpRequest):
+    """
+    ASGI 배포용 batch 입니다. 요청/응답 형식은 batch 와 같습니다.
+
+    조회성 요청들은 각각 async task 로 BATCH_ASYNC_MAX_WORKERS 크기의 스레드 풀에서 동시에 수행하며,
+    각 task 는 자신의 DB connection 을 사용합니다.
+    쓰기 요청은 batch 와 같이 하나의 트랜잭션에서 순서대로 처리합니다. (스트리밍 모드는 지원하지 않습니다.)
+    """
+
+    if request.method != Method.POST:
+        return JsonResponse(
+            {"error": [{"message": f'Method "{request.method}" not allowed.'}]},
+            status=status.HTTP_405_METHOD_NOT_ALLOWED,
+        )
+
+    # DRF 는 async View 를 지원하지 않으므로, 파싱/인증은 동기로 수행합니다. (스레드 전환 비용은 요청당 약 0.1ms)
     try:
-        with transaction.atomic():
-            client = APIClient()
-            client.handler = APIClientHandler()
-
-            content_type = request.headers.get("Content-Type")
-
-            headers = {
-                "Content-Type": content_type,
-                "X-Forwarded-For": get_client_ip(request),
-                "X-CSRFToken": csrf_get_token(request),
-                "Referer": request.META.get("HTTP_REFERER"),
-                "User-Agent": request.META.get("HTTP_USER_AGENT"),
-                "X-Current-Menu": request.headers.get("X-Current-Menu"),
-            }
-            headers = {k: v for k, v in headers.items() if v is not None}
+        drf_request = await sync_to_async(initialize_batch_request)(request)
+    except APIException as e:
+        return JsonResponse({"error": [{"message": e.detail}]}, status=e.status_code)
 
-            authorization = request.headers.get("Authorization")
-            if authorization:
-                client.credentials(HTTP_AUTHORIZATION=authorization)
+    batch_option_list: List[BatchOption] = [
+        BatchOption(**kwargs) for kwargs in drf_request.data
+    ]
+
+    executor = BatchExecutor(drf_request)
+
+    if batch_option_list and all(
+        batch_option.method in READ_METHODS for batch_option in batch_option_list
+    ):
+        # 다른 서버로의 요청은 수행하지 않습니다.
+        if any(
+            not batch_option.url.startswith("/") for batch_option in batch_option_list
+        ):
+            return JsonResponse([], safe=False, status=status.HTTP_400_BAD_REQUEST)
+
+        response_list = await executor.run_concurrently(
+            [
+                (
+                    Method(batch_option.method).value,
+                    batch_option.url,
+                    batch_option.data,
+                )
+                for batch_option in batch_option_list
+            ],
+            get_async_batch_executor(),
+        )
+
+        return JsonResponse(
+            response_list,
+            safe=False,
+            status=get_batch_read_status_code(response_list),
+            encoder=JSONEncoder,
+        )
+
+    def run_batch_write():
+        # middleware 의 요청 단위 상태와 별개로, 쓰기 batch 안에서만 primary DB 고정/쓰기 여부를 유지합니다.
+        tokens = begin_request(primary_pinned=True)
+        try:
+            return batch_write(drf_request, executor, batch_option_list)
+        finally:
+            end_request(tokens)
+
+    response = await sync_to_async(run_batch_write)()
+    if isinstance(response, Response):
+        response = JsonResponse(
+            response.data,
+            safe=False,
+            status=response.status_code,
+            encoder=JSONEncoder,
+        )
+    return response
+
+
+def initialize_batch_request(request: HttpRequest) -> Request:
+    """
+    DRF 기본 설정(parser/authentication)으로 요청을 파싱하고 인증합니다.
+    """
+
+    view = APIView()
+    drf_request = view.initialize_request(request)
+    view.request = drf_request
+    view.perform_authentication(drf_request)
+
+    # 파싱 오류(ParseError)가 동기 구간에서 발생하도록 미리 파싱합니다.
+    drf_request.data
+    return drf_request
 
-            # 뷰 내에서 다른 View를 호출합니다.
+
+def batch_write(
+    request: Request, executor: BatchExecutor, batch_option_list: List[BatchOption]
+):
+    """
+    쓰기 요청들을 하나의 트랜잭션으로 처리합니다.
+    """
+
+    def run_batch():
+        result = {}
+        response_list = list(iter_batch(executor, batch_option_list, result))
+
+        return Response(response_list, status=result["status_code"])
+
+    # Idempotency-Key 헤더가 있으면 재시도 시 저장된 응답을 반환합니다.
+    return run_idempotent(
+        request._request,
+        lambda: json.dumps(request.data, cls=JSONEncoder, sort_keys=True).encode(),
+        run_batch,
+    )
+
+
+def iter_batch(
+    executor: BatchExecutor, batch_option_list: List[BatchOption], result: dict
+) -> Iterator[dict]:
+    """
+    쓰기 요청들을 하나의 트랜잭션으로 처리하며, 각 하위 요청의 결과를 순서대로 반환합니다.
+
+    실패한 하위 요청이 있으면 롤백하며, 최종 상태 코드는 result["status_code"] 에 기록합니다.
+    """
+
+    status_code = status.HTTP_200_OK
+
+    try:
+        with transaction.atomic():
             for batch_option in batch_option_list:
                 # 조회성 요청(GET/OPTIONS/HEAD)은 거부합니다.
                 if batch_option.method not in (
@@ -118,30 +226,102 @@ def batch(request):
                 if not batch_option.url.startswith("/"):
                     raise Rollback(status.HTTP_400_BAD_REQUEST)
 
-                handler = getattr(client, batch_option.method.lower())
-                response = handler(
-                    batch_option.url,
-                    json.dumps(batch_option.data),
-                    content_type=content_type,
-                    **headers
-                )
-
-                response_list.append(
-                    {
-                        "status_code": response.status_code,
-                        "data": response.data,
-                    }
-                )
-
-                if response.status_code >= status.HTTP_400_BAD_REQUEST:
-                    raise Rollback(response.status_code)
+            # 뷰 내에서 다른 View를 직접 호출합니다.
+            # 같은 ViewSet 에 연속된 쓰기 요청은 bulk 로 저장됩니다.
+            for response in executor.run_writes(
+                [
+                    (
+                        Method(batch_option.method).value,
+                        batch_option.url,
+                        batch_option.data,
+                    )
+                    for batch_option in batch_option_list
+                ]
+            ):
+                yield response
+
+                if response["status_code"] >= status.HTTP_400_BAD_REQUEST:
+                    raise Rollback(response["status_code"])
     except Rollback as e:
         status_code = e.status_code
     except Exception:
         status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
         traceback.print_stack()
 
-    return Response(response_list, status=status_code)
+    result["status_code"] = status_code
+
+
+def stream_batch(
+    executor: BatchExecutor, batch_option_list: List[BatchOption]
+) -> Iterator[str]:
+    """
+    각 하위 요청의 결과를 NDJSON 한 줄씩 생성하고, 마지막 줄에 커밋/롤백 결과를 요약합니다.
+
+    결과를 모아두지 않으므로 대량의 batch 도 일정한 메모리로 처리합니다.
+    응답이 시작된 후에 수행되므로 HTTP 상태 코드는 항상 200 이며, 실제 결과는 요약 줄로 확인합니다.
+    응답 도중 연결이 끊기면 롤백됩니다.
+    """
+
+    # middleware 가 끝난 후에 수행되므로, 요청 단위 상태를 직접 설정합니다. (쓰기 batch : primary DB 사용)
+    tokens = begin_request(primary_pinned=True)
+    try:
+        result = {}
+        count = 0
+        for response in iter_batch(executor, batch_option_list, result):
+            count += 1
+            yield to_ndjson(response)
+
+        yield to_ndjson(
+            {
+                "summary": {
+                    "status_code": result["status_code"],
+                    "committed": result["status_code"] < status.HTTP_400_BAD_REQUEST,
+                    "count": count,
+                    "total": len(batch_option_list),
+                }
+            }
+        )
+    finally:
+        end_request(tokens)
+
+
+def batch_read(executor: BatchExecutor, batch_option_list: List[BatchOption]):
+    """
+    조회성 요청들을 트랜잭션 없이 동시에 처리하고, 요청 순서대로 결과를 반환합니다.
+
+    실패한 요청이 있으면 첫 번째 실패한 요청의 상태 코드로 응답합니다.
+    """
+
+    # 다른 서버로의 요청은 수행하지 않습니다.
+    if any(not batch_option.url.startswith("/") for batch_option in batch_option_list):
+        return Response([], status=status.HTTP_400_BAD_REQUEST)
+
+    response_list = executor.run_parallel(
+        [
+            (
+                Method(batch_option.method).value,
+                batch_option.url,
+                batch_option.data,
+            )
+            for batch_option in batch_option_list
+        ]
+    )
+
+    return Response(response_list, status=get_batch_read_status_code(response_list))
+
+
+def get_batch_read_status_code(response_list: List[dict]) -> int:
+    """
+    첫 번째 실패한 요청의 상태 코드를 반환합니다. 모두 성공했으면 200 을 반환합니다.
+    """
+    return next(
+        (
+            response["status_code"]
+            for response in response_list
+            if response["status_code"] >= status.HTTP_400_BAD_REQUEST
+        ),
+        status.HTTP_200_OK,
+    )
 
 
 def custom_exception_handler(exc, context):